@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the session processing hot paths.
+
+Usage: benchmark.py <benchmark> [session.jsonl ...] [--repeat N]
+
+Without session files, the JSONL files under examples/projects are used
+when present; otherwise a synthetic session is generated.
+
+Benchmarks:
+    prefilter   iter_session with and without the raw-line INVISIBLE prefilter
+    codec       JSON decoding with the stdlib and the accelerated backend
+    transform   per-tick transform() cost as session history grows
+    process     per-line process_line() against batched process_lines()
+    memory      bytes per replayed block, slotted vs __dict__-backed events
+    markdown    per-tick markdown cost while following a session live
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import dataclasses
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+# Add the project root to sys.path for imports when running directly
+script_dir = Path(__file__).parent.resolve()
+project_root = script_dir.parent
+sys.path.insert(0, str(project_root))
+
+from claude_session_player import json_codec
+from claude_session_player import events as events_module
+from claude_session_player.consumer import ScreenStateConsumer, format_block, replay_session
+from claude_session_player.events import ProcessingContext
+from claude_session_player.processor import process_line, process_lines
+from claude_session_player.watcher.transformer import transform
+from claude_session_player.parser import iter_session
+
+EXAMPLES_ROOT = project_root / "examples" / "projects"
+
+
+# ---------------------------------------------------------------------------
+# Inputs
+# ---------------------------------------------------------------------------
+
+
+def synthetic_session(path: Path, turns: int = 500) -> Path:
+    """Write a synthetic session with a realistic mix of line types."""
+    with path.open("w", encoding="utf-8") as f:
+
+        def emit(obj: dict) -> None:
+            f.write(json.dumps(obj, separators=(",", ":")) + "\n")
+
+        for i in range(turns):
+            emit({"type": "file-history-snapshot", "messageId": f"m{i}",
+                  "snapshot": {"trackedFileBackups": {f"src/f{j}.py": {"version": j} for j in range(100)}}})
+            emit({"type": "user", "uuid": f"u{i}", "message": {"role": "user", "content": f"Question {i}"}})
+            emit({"type": "assistant", "uuid": f"a{i}", "requestId": f"r{i}",
+                  "message": {"role": "assistant", "content": [{"type": "text", "text": "Answer " * 40}]}})
+            emit({"type": "assistant", "uuid": f"t{i}", "requestId": f"r{i}",
+                  "message": {"role": "assistant", "content": [
+                      {"type": "tool_use", "id": f"tu{i}", "name": "Bash", "input": {"command": "ls"}}]}})
+            emit({"type": "progress", "parentToolUseID": f"tu{i}",
+                  "data": {"type": "bash_progress", "output": "line\n" * 5}})
+            emit({"type": "user", "uuid": f"r{i}", "message": {"role": "user", "content": [
+                {"type": "tool_result", "tool_use_id": f"tu{i}", "content": "out\n" * 50}]}})
+            for j in range(5):
+                emit({"type": "assistant", "isSidechain": True, "uuid": f"s{i}-{j}",
+                      "message": {"role": "assistant", "content": [{"type": "text", "text": "sub " * 500}]}})
+            emit({"type": "system", "subtype": "turn_duration", "durationMs": 1000 + i})
+        emit({"type": "summary", "summary": "Synthetic session", "leafUuid": f"a{turns - 1}"})
+    return path
+
+
+def session_files(paths: list[str]) -> list[Path]:
+    """Resolve benchmark inputs (explicit paths, examples, or synthetic)."""
+    if paths:
+        return [Path(p) for p in paths]
+    examples = sorted(EXAMPLES_ROOT.glob("*/*.jsonl")) if EXAMPLES_ROOT.exists() else []
+    if examples:
+        return examples
+    tmp_dir = Path(tempfile.mkdtemp(prefix="csp-bench-"))
+    return [synthetic_session(tmp_dir / "synthetic.jsonl")]
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    """Return the fastest wall-clock time of ``repeat`` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+
+def bench_prefilter(files: list[Path], repeat: int) -> None:
+    """Compare decoding every line against skipping INVISIBLE lines undecoded."""
+    total_lines = sum(1 for p in files for _ in iter_session(p))
+    kept_lines = sum(1 for p in files for _ in iter_session(p, skip_invisible=True))
+
+    for p in files:
+        if replay_session(iter_session(p)) != replay_session(iter_session(p, skip_invisible=True)):
+            raise SystemExit(f"Output mismatch with prefilter: {p}")
+
+    full = best_of(repeat, lambda: [sum(1 for _ in iter_session(p)) for p in files])
+    filtered = best_of(
+        repeat, lambda: [sum(1 for _ in iter_session(p, skip_invisible=True)) for p in files]
+    )
+    print(f"files: {len(files)}  lines: {total_lines}  decoded with prefilter: {kept_lines}")
+    print(f"iter_session:                     {full * 1000:8.1f} ms")
+    print(f"iter_session(skip_invisible=True): {filtered * 1000:8.1f} ms  ({full / filtered:.2f}x)")
+
+
+def bench_codec(files: list[Path], repeat: int) -> None:
+    """Compare decoding every line with each JSON codec backend."""
+    raw_lines = [line for p in files for line in p.read_bytes().splitlines() if line.strip()]
+    stdlib = best_of(repeat, lambda: [json_codec._stdlib_loads(line) for line in raw_lines])
+    print(f"lines: {len(raw_lines)}  active backend: {json_codec.BACKEND}")
+    print(f"json:   {stdlib * 1000:8.1f} ms")
+    if json_codec.orjson is not None:
+        fast = best_of(repeat, lambda: [json_codec._orjson_loads(line) for line in raw_lines])
+        print(f"orjson: {fast * 1000:8.1f} ms  ({stdlib / fast:.2f}x)")
+
+
+def _tool_call_lines(i: int) -> list[dict]:
+    """Return a tool_use line and its tool_result line."""
+    return [
+        {"type": "assistant", "requestId": f"r{i}", "message": {"role": "assistant", "content": [
+            {"type": "tool_use", "id": f"tu{i}", "name": "Bash", "input": {"command": "ls"}}]}},
+        {"type": "user", "message": {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": f"tu{i}", "content": "out"}]}},
+    ]
+
+
+def bench_transform(files: list[Path], repeat: int) -> None:
+    """Measure one watcher tick (a tool call + result) against history size.
+
+    Session files are not used: history is a context with N tool calls.
+    """
+    tick = _tool_call_lines(-1)
+    print(
+        f"{'tool calls':>10}  {'deepcopy':>10}  {'copy()':>10}  {'owned':>10}"
+        f"  {'state':>10}   (us per tick, state file bytes)"
+    )
+    for history in (100, 1_000, 10_000, 50_000):
+        _, context = transform(
+            [line for i in range(history) for line in _tool_call_lines(i)],
+            ProcessingContext(),
+            owned=True,
+        )
+        runs = max(repeat, 5) * 10
+
+        def deepcopy_tick() -> None:
+            transform(tick, copy.deepcopy(context), owned=True)
+
+        def copy_tick() -> None:
+            transform(tick, context)
+
+        def owned_tick() -> None:
+            transform(tick, context, owned=True)
+
+        timings = [
+            best_of(runs, fn) * 1e6 for fn in (deepcopy_tick, copy_tick, owned_tick)
+        ]
+        state_size = len(json.dumps(context.to_dict(), indent=2))
+        print(f"{history:>10}  " + "  ".join(f"{t:>10.1f}" for t in timings) + f"  {state_size:>10}")
+
+
+def bench_process(files: list[Path], repeat: int) -> None:
+    """Compare processing lines one call at a time against one batch call."""
+    sessions = [list(iter_session(p)) for p in files]
+    total_lines = sum(len(lines) for lines in sessions)
+
+    def per_line() -> None:
+        for lines in sessions:
+            context = ProcessingContext()
+            events = []
+            for line in lines:
+                events.extend(process_line(context, line))
+
+    def batched() -> None:
+        for lines in sessions:
+            process_lines(ProcessingContext(), lines)
+
+    single = best_of(repeat, per_line)
+    batch = best_of(repeat, batched)
+    print(f"files: {len(files)}  lines: {total_lines}")
+    print(f"process_line:  {total_lines / single:>12,.0f} lines/s")
+    print(f"process_lines: {total_lines / batch:>12,.0f} lines/s  ({single / batch:.2f}x)")
+
+
+def _dict_backed(cls: type) -> type:
+    """Return a plain (``__dict__``-backed) dataclass with the fields of cls."""
+    namespace = {"__annotations__": {f.name: f.type for f in dataclasses.fields(cls)}}
+    return dataclasses.dataclass(type(cls.__name__, (), namespace))
+
+
+def _rebuild(obj: object, classes: dict[type, type]) -> object:
+    """Deep-rebuild dataclass instances as classes[type(obj)], sharing leaf values."""
+    if dataclasses.is_dataclass(obj):
+        cls = classes[type(obj)]
+        return cls(**{
+            f.name: _rebuild(getattr(obj, f.name), classes) for f in dataclasses.fields(obj)
+        })
+    if isinstance(obj, list):
+        return [_rebuild(item, classes) for item in obj]
+    return obj
+
+
+def _traced_bytes(fn: Callable[[], object]) -> tuple[int, object]:
+    """Return the bytes allocated by fn() that are still held by its result."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        return tracemalloc.get_traced_memory()[0] - before, result
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory(files: list[Path], repeat: int) -> None:
+    """Report the memory held per block after replaying each session.
+
+    "total" is everything the replayed ScreenStateConsumer retains, text
+    included. The other columns rebuild its blocks with __dict__-backed
+    clones of the event dataclasses and with the slotted classes; text and
+    other leaf values are shared, so they isolate per-object overhead.
+    """
+    event_classes = [
+        cls for cls in vars(events_module).values()
+        if isinstance(cls, type) and dataclasses.is_dataclass(cls)
+        and cls.__module__ == events_module.__name__
+        and cls is not events_module.ProcessingContext
+    ]
+    slotted = {cls: cls for cls in event_classes}
+    dict_backed = {cls: _dict_backed(cls) for cls in event_classes}
+
+    print(f"{'session':<40} {'blocks':>7}  {'total':>8}  {'__dict__':>9}  {'slots':>7}"
+          "   (bytes per block)")
+    for p in files:
+
+        def replay() -> ScreenStateConsumer:
+            consumer = ScreenStateConsumer()
+            process_lines(ProcessingContext(), iter_session(p), consumer.handle)
+            return consumer
+
+        total, consumer = _traced_bytes(replay)
+        blocks = consumer.blocks
+        if not blocks:
+            continue
+        plain, _ = _traced_bytes(lambda: _rebuild(blocks, dict_backed))
+        slots, _ = _traced_bytes(lambda: _rebuild(blocks, slotted))
+        n = len(blocks)
+        print(f"{p.stem[:40]:<40} {n:>7}  {total / n:>8.0f}  {plain / n:>9.0f}  {slots / n:>7.0f}")
+
+
+def bench_markdown(files: list[Path], repeat: int) -> None:
+    """Compare per-tick markdown output as a session is followed event by event.
+
+    "full" formats every block on every tick (the uncached baseline),
+    "to_markdown" reuses memoized blocks, "update" returns the changed tail.
+    """
+    for p in files:
+        events = process_lines(ProcessingContext(), iter_session(p))
+
+        def follow(render: Callable[[ScreenStateConsumer], object]) -> None:
+            consumer = ScreenStateConsumer()
+            for event in events:
+                consumer.handle(event)
+                render(consumer)
+
+        def full(consumer: ScreenStateConsumer) -> str:
+            return "\n".join(format_block(block) for block in consumer.blocks)
+
+        timings = [
+            best_of(repeat, lambda fn=fn: follow(fn))
+            for fn in (full, ScreenStateConsumer.to_markdown, ScreenStateConsumer.markdown_update)
+        ]
+        ticks = len(events)
+        print(f"{p.stem[:40]}: {ticks} events, us per tick")
+        for name, t in zip(("full", "to_markdown", "update"), timings):
+            print(f"  {name:<12} {t / ticks * 1e6:10.1f}")
+
+
+BENCHMARKS: dict[str, Callable[[list[Path], int], None]] = {
+    "prefilter": bench_prefilter,
+    "codec": bench_codec,
+    "transform": bench_transform,
+    "process": bench_process,
+    "memory": bench_memory,
+    "markdown": bench_markdown,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Session processing micro-benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("files", nargs="*", help="Session JSONL files")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](session_files(args.files), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,26 @@ The script:
 1. Processes all existing lines in the JSONL file
 2. Writes initial markdown to the output file
 3. Watches for new lines being appended to the JSONL file
-4. On each change, re-renders the full markdown and updates the output file
+4. On each change, appends new blocks to the output file, or patches its
+   tail when a recent block was updated
+
+Appends extend the output file in place. Tail patches and full rewrites
+go through a temp file and an atomic rename, so readers never see a torn
+file: a patch copies the unchanged prefix from the current file and
+writes the new tail after it, without re-rendering the whole session.
+The first write, a ClearAll, an update to a block further back than
+``MAX_PATCH_BYTES`` and an output file changed by someone else are full
+rewrites. The output file keeps its permissions; a new one gets the
+usual umask-based mode.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 # Add the project root to sys.path for imports when running directly
@@ -22,9 +34,9 @@ script_dir = Path(__file__).parent.resolve()
 project_root = script_dir.parent
 sys.path.insert(0, str(project_root))
 
-from claude_session_player.consumer import ScreenStateConsumer
+from claude_session_player.consumer import MarkdownUpdate, ScreenStateConsumer
 from claude_session_player.events import ProcessingContext
-from claude_session_player.processor import process_line
+from claude_session_player.processor import process_lines
 from claude_session_player.watcher.file_watcher import IncrementalReader
 
 from watchfiles import awatch
@@ -36,33 +48,139 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Largest tail (in bytes) patched onto the current file; further back is a
+# full rewrite
+MAX_PATCH_BYTES = 64 * 1024
+
+# Chunk size for copying the unchanged prefix of the file when patching
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class MarkdownFileWriter:
+    """Keeps a markdown file in sync with a ScreenStateConsumer.
+
+    Each ``sync()`` writes only what changed since the previous one, using
+    the consumer's ``markdown_update()``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        consumer: ScreenStateConsumer,
+        max_patch_bytes: int = MAX_PATCH_BYTES,
+    ) -> None:
+        self.path = path
+        self.consumer = consumer
+        self.max_patch_bytes = max_patch_bytes
+        # Size of the file as last written by us; None forces a rewrite
+        self._size: int | None = None
+
+    def sync(self) -> str:
+        """Bring the file up to date with the consumer.
+
+        Returns:
+            How the file was written: "append", "patch", "rewrite", or
+            "unchanged".
+        """
+        update = self.consumer.markdown_update()
+        if self._size is None or update.byte_offset == 0 or self._disk_size() != self._size:
+            return self._rewrite()
+        data = update.text.encode("utf-8")
+        if update.byte_offset == self._size:
+            if not data:
+                return "unchanged"
+            with self.path.open("ab") as f:
+                f.write(data)
+            mode = "append"
+        elif self._size - update.byte_offset <= self.max_patch_bytes:
+            self._patch(update, data)
+            mode = "patch"
+        else:
+            return self._rewrite()
+        self._size = update.byte_offset + len(data)
+        return mode
+
+    def _disk_size(self) -> int | None:
+        """Return the current size of the file, or None if it is missing."""
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return None
+
+    def _patch(self, update: MarkdownUpdate, data: bytes) -> None:
+        """Atomically replace the file from the update's byte offset onward."""
+        self._replace(data, keep_bytes=update.byte_offset)
+
+    def _rewrite(self) -> str:
+        """Atomically replace the file with the full markdown."""
+        data = self.consumer.to_markdown().encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._replace(data)
+        self._size = len(data)
+        return "rewrite"
+
+    def _replace(self, data: bytes, keep_bytes: int = 0) -> None:
+        """Replace the file with its first keep_bytes bytes followed by data.
+
+        Writes a temp file with the current file's mode (or the umask-based
+        default for a new file) and renames it over the file.
+        """
+        try:
+            mode = self.path.stat().st_mode & 0o7777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.path.parent,
+            prefix=f".{self.path.name}.",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if keep_bytes:
+                    with self.path.open("rb") as current:
+                        remaining = keep_bytes
+                        while remaining:
+                            chunk = current.read(min(remaining, _COPY_CHUNK_SIZE))
+                            if not chunk:
+                                break
+                            f.write(chunk)
+                            remaining -= len(chunk)
+                f.write(data)
+                os.fchmod(f.fileno(), mode)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+
 class SessionWatcher:
     """Watches a JSONL session file and renders to markdown on changes."""
 
     def __init__(self, input_path: Path, output_path: Path) -> None:
         self.input_path = input_path
         self.output_path = output_path
-        self.reader = IncrementalReader(path=input_path)
+        self.reader = IncrementalReader(path=input_path, skip_invisible=True)
         self.context = ProcessingContext()
         self.consumer = ScreenStateConsumer()
+        self.writer = MarkdownFileWriter(output_path, self.consumer)
         self._stop_event = asyncio.Event()
 
     def _process_lines(self, lines: list[dict]) -> None:
         """Process a list of JSONL lines through the event pipeline."""
-        for line in lines:
-            events = process_line(self.context, line)
-            for event in events:
-                self.consumer.handle(event)
+        process_lines(self.context, lines, self.consumer.handle)
 
     def _write_markdown(self) -> None:
-        """Write the current markdown state to the output file."""
-        markdown = self.consumer.to_markdown()
-        self.output_path.write_text(markdown, encoding="utf-8")
+        """Write the changes to the markdown state to the output file."""
+        mode = self.writer.sync()
         logger.info(
             "wrote_markdown",
             extra={
                 "output_path": str(self.output_path),
                 "block_count": len(self.consumer.blocks),
+                "mode": mode,
             },
         )
 
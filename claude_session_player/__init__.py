@@ -10,6 +10,7 @@ from claude_session_player.events import (
     ClearAll,
     DurationContent,
     Event,
+    PatchBlock,
     ProcessingContext,
     Question,
     QuestionContent,
@@ -20,8 +21,14 @@ from claude_session_player.events import (
     UpdateBlock,
     UserContent,
 )
-from claude_session_player.parser import LineType, classify_line, read_session
-from claude_session_player.processor import process_line
+from claude_session_player.parser import LineType, classify_line, iter_session, read_session
+from claude_session_player.processor import (
+    DeltaEncoder,
+    coalesce_updates,
+    fold_updates,
+    process_line,
+    process_lines,
+)
 
 __version__ = "0.1.0"
 
@@ -41,16 +48,22 @@ __all__ = [
     "SystemContent",
     "AddBlock",
     "UpdateBlock",
+    "PatchBlock",
     "ClearAll",
     "Event",
     "ProcessingContext",
     # Processor module
     "process_line",
+    "process_lines",
+    "coalesce_updates",
+    "fold_updates",
+    "DeltaEncoder",
     # Consumer module
     "ScreenStateConsumer",
     "replay_session",
     # Parser module
     "read_session",
+    "iter_session",
     "classify_line",
     "LineType",
 ]
@@ -0,0 +1,324 @@
+"""Compact versioned binary encoding for events and processing state.
+
+Values are encoded in their ``to_dict()`` form, so decoding and calling
+``from_dict()`` round-trips exactly like JSON does. Compared with JSON the
+encoding is smaller: integers are varints, floats are 8-byte doubles, and
+dict keys and common string values (content types, tool names) are stored
+as one-byte references into a fixed string table.
+
+A record is ``HEADER`` (a marker byte and ``VERSION``) followed by one
+value. ``dumps``/``loads`` handle single records. For streams, ``frame``
+prefixes a record with its length; ``FrameDecoder`` and ``iter_frames``
+decode frames incrementally and leave a truncated trailing frame
+undecoded.
+
+The string table is part of the format: changing it requires bumping
+``VERSION``.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+from .events import Block, Event, ProcessingContext, event_from_dict
+
+VERSION = 1
+HEADER = bytes((0xC5, VERSION))
+
+# Value tags
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3  # zigzag varint
+_FLOAT = 4  # little-endian double
+_STR = 5  # varint byte length + UTF-8
+_REF = 6  # varint index into _STRINGS
+_LIST = 7  # varint count + values
+_DICT = 8  # varint count + (key, value) pairs
+
+# Strings stored by reference: dict keys of the to_dict() forms, type
+# discriminators and common tool names. Append-only within a VERSION.
+_STRINGS: tuple[str, ...] = (
+    # Keys
+    "type", "text", "id", "content", "request_id", "block", "block_id",
+    "tool_name", "tool_use_id", "label", "result", "is_error", "progress_text",
+    "duration_ms", "questions", "question", "header", "options", "multi_select",
+    "description", "answers",
+    "tool_use_id_to_block_id", "current_request_id", "tool_contents",
+    "question_contents", "resolved_tool_use_ids",
+    "file_position", "line_number", "processing_context", "last_modified",
+    # Type discriminators
+    "user", "assistant", "tool_call", "thinking", "duration", "system",
+    "add_block", "update_block", "clear_all",
+    # Tool names
+    "Bash", "Read", "Write", "Edit", "MultiEdit", "Glob", "Grep", "Task",
+    "WebFetch", "WebSearch", "TodoWrite", "NotebookEdit", "AskUserQuestion",
+)
+_STRING_INDEX = {s: i for i, s in enumerate(_STRINGS)}
+
+_DOUBLE = struct.Struct("<d")
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+
+def _write_varint(out: bytearray, n: int) -> None:
+    """Append a non-negative integer as a LEB128 varint."""
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _write_key(out: bytearray, key: str) -> None:
+    """Append a dict key: even varint = table index, odd = literal length."""
+    index = _STRING_INDEX.get(key)
+    if index is not None:
+        _write_varint(out, index << 1)
+    else:
+        data = key.encode("utf-8", "surrogatepass")
+        _write_varint(out, (len(data) << 1) | 1)
+        out += data
+
+
+def _encode(obj: Any, out: bytearray) -> None:
+    """Append the encoding of a JSON-compatible value."""
+    kind = type(obj)
+    if kind is str:
+        index = _STRING_INDEX.get(obj)
+        if index is not None:
+            out.append(_REF)
+            _write_varint(out, index)
+        else:
+            data = obj.encode("utf-8", "surrogatepass")
+            out.append(_STR)
+            _write_varint(out, len(data))
+            out += data
+    elif obj is None:
+        out.append(_NONE)
+    elif kind is bool:
+        out.append(_TRUE if obj else _FALSE)
+    elif kind is int:
+        out.append(_INT)
+        _write_varint(out, (obj << 1) if obj >= 0 else ((-obj << 1) - 1))
+    elif kind is dict:
+        out.append(_DICT)
+        _write_varint(out, len(obj))
+        for key, value in obj.items():
+            if type(key) is not str:
+                raise TypeError(f"dict keys must be str, not {type(key).__name__}")
+            _write_key(out, key)
+            _encode(value, out)
+    elif kind is list:
+        out.append(_LIST)
+        _write_varint(out, len(obj))
+        for item in obj:
+            _encode(item, out)
+    elif kind is float:
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(obj)
+    else:
+        raise TypeError(f"Type is not binary serializable: {kind.__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode a JSON-compatible value as a single record.
+
+    Raises:
+        TypeError: If obj contains values JSON cannot represent as-is
+            (tuples, sets, non-str dict keys, arbitrary objects).
+    """
+    out = bytearray(HEADER)
+    _encode(obj, out)
+    return bytes(out)
+
+
+def frame(obj: Any) -> bytes:
+    """Encode a value as a length-prefixed record for streaming."""
+    record = dumps(obj)
+    out = bytearray()
+    _write_varint(out, len(record))
+    out += record
+    return bytes(out)
+
+
+# ---------------------------------------------------------------------------
+# Decoding
+# ---------------------------------------------------------------------------
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Read a varint at pos, returning (value, new_pos)."""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _decode(data: bytes, pos: int) -> tuple[Any, int]:
+    """Decode the value at pos, returning (value, new_pos)."""
+    tag = data[pos]
+    pos += 1
+    if tag == _REF:
+        index, pos = _read_varint(data, pos)
+        return _STRINGS[index], pos
+    if tag == _STR:
+        length, pos = _read_varint(data, pos)
+        end = pos + length
+        if end > len(data):
+            raise IndexError("string past end of record")
+        return data[pos:end].decode("utf-8", "surrogatepass"), end
+    if tag == _NONE:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _INT:
+        n, pos = _read_varint(data, pos)
+        return (n >> 1) if not n & 1 else -((n + 1) >> 1), pos
+    if tag == _DICT:
+        count, pos = _read_varint(data, pos)
+        result = {}
+        for _ in range(count):
+            key, pos = _read_varint(data, pos)
+            if key & 1:
+                end = pos + (key >> 1)
+                if end > len(data):
+                    raise IndexError("key past end of record")
+                name = data[pos:end].decode("utf-8", "surrogatepass")
+                pos = end
+            else:
+                name = _STRINGS[key >> 1]
+            result[name], pos = _decode(data, pos)
+        return result, pos
+    if tag == _LIST:
+        count, pos = _read_varint(data, pos)
+        items = []
+        for _ in range(count):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return items, pos
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(data, pos)[0], pos + _DOUBLE.size
+    raise ValueError(f"unknown tag {tag}")
+
+
+def loads(data: bytes) -> Any:
+    """Decode a single record.
+
+    Raises:
+        ValueError: If the header or version does not match, or the record
+            is truncated or malformed.
+    """
+    if data[:1] != HEADER[:1]:
+        raise ValueError("not a binary record")
+    if data[1:2] != HEADER[1:]:
+        raise ValueError(f"unsupported binary record version: {data[1:2].hex() or 'missing'}")
+    try:
+        obj, pos = _decode(data, len(HEADER))
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"malformed binary record: {e}") from e
+    if pos != len(data):
+        raise ValueError("trailing data after binary record")
+    return obj
+
+
+class FrameDecoder:
+    """Incremental decoder for a stream of ``frame()`` records.
+
+    Feed it bytes as they arrive; complete records are decoded and
+    returned, and a partial trailing frame is kept for the next call.
+    """
+
+    def __init__(self) -> None:
+        self._pending = b""
+
+    @property
+    def pending(self) -> int:
+        """Return the number of buffered bytes of an incomplete frame."""
+        return len(self._pending)
+
+    def feed(self, data: bytes) -> list[Any]:
+        """Add bytes and return the values of all newly completed frames.
+
+        Raises:
+            ValueError: If a complete frame fails to decode.
+        """
+        buf = self._pending + data if self._pending else bytes(data)
+        values = []
+        pos = 0
+        while pos < len(buf):
+            try:
+                length, start = _read_varint(buf, pos)
+            except IndexError:
+                break  # length prefix itself is incomplete
+            end = start + length
+            if end > len(buf):
+                break
+            values.append(loads(buf[start:end]))
+            pos = end
+        self._pending = buf[pos:]
+        return values
+
+
+def iter_frames(f: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yield the values of the frames in a binary stream.
+
+    A truncated trailing frame (e.g. an interrupted append) is ignored.
+
+    Raises:
+        ValueError: If a complete frame fails to decode.
+    """
+    decoder = FrameDecoder()
+    while chunk := f.read(chunk_size):
+        yield from decoder.feed(chunk)
+
+
+# ---------------------------------------------------------------------------
+# Typed helpers
+# ---------------------------------------------------------------------------
+
+
+def encode_event(event: Event) -> bytes:
+    """Encode an event as a record."""
+    return dumps(event.to_dict())
+
+
+def decode_event(data: bytes) -> Event:
+    """Decode an event record.
+
+    Raises:
+        ValueError: If the record is malformed.
+        KeyError: If the record is not an event.
+    """
+    return event_from_dict(loads(data))
+
+
+def encode_block(block: Block) -> bytes:
+    """Encode a block as a record."""
+    return dumps(block.to_dict())
+
+
+def decode_block(data: bytes) -> Block:
+    """Decode a block record."""
+    return Block.from_dict(loads(data))
+
+
+def encode_context(context: ProcessingContext) -> bytes:
+    """Encode a processing context as a record."""
+    return dumps(context.to_dict())
+
+
+def decode_context(data: bytes) -> ProcessingContext:
+    """Decode a processing context record."""
+    return ProcessingContext.from_dict(loads(data))
@@ -15,7 +15,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from .consumer import replay_session
-from .parser import read_session
+from .parser import iter_session
 
 if TYPE_CHECKING:
     from .watcher.search_db import SearchDatabase
@@ -82,6 +82,33 @@ def _get_db_size(state_dir: Path) -> int:
     return 0
 
 
+def _replay_file(path: str) -> str:
+    """Render a whole session, reading only what affects the final screen.
+
+    Starts after the last compaction boundary and skips invisible lines
+    without decoding them.
+    """
+    return replay_session(iter_session(path, from_last_compaction=True, skip_invisible=True))
+
+
+def _replay_at_line(path: str, line: int, state_dir: Path) -> str:
+    """Render a session as it looked right after its Nth (1-based) line.
+
+    Uses the file's LineIndex to seek straight to the last compaction
+    boundary before the line and stop reading at the line's end.
+
+    Raises:
+        ValueError: If the line is out of range.
+    """
+    from .line_index import LineIndex
+
+    index = LineIndex.open(path, index_dir=state_dir / "line_index")
+    if not 1 <= line <= index.line_count:
+        raise ValueError(f"Line {line} out of range (session has {index.line_count} lines)")
+    start, end = index.replay_bounds(line - 1)
+    return replay_session(iter_session(path, offset=start, end=end, skip_invisible=True))
+
+
 # ---------------------------------------------------------------------------
 # Index Command Implementations
 # ---------------------------------------------------------------------------
@@ -305,6 +332,18 @@ def _create_parser() -> argparse.ArgumentParser:
         type=str,
         help="Path to session JSONL file",
     )
+    replay_parser.add_argument(
+        "--line",
+        type=int,
+        default=None,
+        help="Render the session as it looked after this line (1-based, blank lines not counted)",
+    )
+    replay_parser.add_argument(
+        "--state-dir",
+        type=Path,
+        default=None,
+        help=f"State directory for line index sidecars (default: {DEFAULT_STATE_DIR})",
+    )
 
     # Index command group
     index_parser = subparsers.add_parser(
@@ -464,8 +503,7 @@ def main() -> None:
             if not Path(path).exists():
                 print(f"Error: File not found: {path}", file=sys.stderr)
                 sys.exit(1)
-            lines = read_session(path)
-            print(replay_session(lines))
+            print(_replay_file(path))
             return
 
     parser = _create_parser()
@@ -480,8 +518,14 @@ def main() -> None:
         if not Path(path).exists():
             print(f"Error: File not found: {path}", file=sys.stderr)
             sys.exit(1)
-        lines = read_session(path)
-        print(replay_session(lines))
+        if args.line is not None:
+            try:
+                print(_replay_at_line(path, args.line, args.state_dir or DEFAULT_STATE_DIR))
+            except ValueError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+        else:
+            print(_replay_file(path))
     elif args.command == "index":
         sys.exit(_handle_index_command(args))
     else:
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+from dataclasses import dataclass
+
 from .events import (
     AddBlock,
     AssistantContent,
     Block,
+    BlockContent,
     ClearAll,
     DurationContent,
     Event,
+    PatchBlock,
     ProcessingContext,
     QuestionContent,
     SystemContent,
@@ -20,18 +25,44 @@ from .events import (
 from .formatter import format_duration
 
 
+@dataclass(slots=True)
+class MarkdownUpdate:
+    """Change to the markdown document since the previous update.
+
+    The new document is the previous one cut at ``offset`` with ``text``
+    appended. ``offset`` equal to the previous length is a pure append;
+    ``offset`` 0 replaces the whole document.
+    """
+
+    offset: int  # in characters
+    byte_offset: int  # same position in the UTF-8 encoded document
+    text: str
+
+
 class ScreenStateConsumer:
     """Builds full conversation state from events.
 
     This consumer accumulates blocks from events, providing backwards
     compatibility with the existing CLI and replay-session.sh.
 
+    Formatted markdown is memoized per block and recomputed only for blocks
+    that were added or updated since, so ``to_markdown()`` formats just the
+    changed blocks and ``markdown_update()`` returns just the changed tail.
+
     Implements the Consumer protocol from protocol.py for use with EventEmitter.
     """
 
     def __init__(self) -> None:
         self.blocks: list[Block] = []
         self._block_index: dict[str, int] = {}  # block_id → index in blocks
+        self._block_versions: dict[str, int] = {}  # block_id → updates applied
+        # Per block: (block the markdown was formatted from, markdown)
+        self._formatted: list[tuple[Block, str] | None] = []
+        # markdown_update() state: first block changed since the last call,
+        # (char, byte) start of each block's segment and end of the document
+        self._dirty_from = 0
+        self._segment_starts: list[tuple[int, int]] = []
+        self._document_end: tuple[int, int] = (0, 0)
 
     async def on_event(self, event: Event) -> None:
         """Process a single event (async protocol method).
@@ -40,34 +71,69 @@ class ScreenStateConsumer:
         Internally delegates to the synchronous handle() method.
 
         Args:
-            event: An AddBlock, UpdateBlock, or ClearAll event.
+            event: An AddBlock, UpdateBlock, PatchBlock, or ClearAll event.
         """
         self.handle(event)
 
+    async def on_events(self, events: list[Event]) -> None:
+        """Process a batch of events (optional batch protocol method).
+
+        Args:
+            events: The events to process, in order.
+        """
+        for event in events:
+            self.handle(event)
+
     def handle(self, event: Event) -> None:
         """Process a single event (synchronous method).
 
         This method provides backward compatibility with existing code.
 
         Args:
-            event: An AddBlock, UpdateBlock, or ClearAll event.
+            event: An AddBlock, UpdateBlock, PatchBlock, or ClearAll event.
+
+        Raises:
+            ValueError: If a PatchBlock does not match the block's version.
         """
         if isinstance(event, AddBlock):
             self._block_index[event.block.id] = len(self.blocks)
+            self._block_versions[event.block.id] = 0
             self.blocks.append(event.block)
+            self._formatted.append(None)
         elif isinstance(event, UpdateBlock):
-            index = self._block_index[event.block_id]
-            # Create new Block with updated content (immutable update)
-            old_block = self.blocks[index]
-            self.blocks[index] = Block(
-                id=old_block.id,
-                type=old_block.type,
-                content=event.content,
-                request_id=old_block.request_id,
-            )
+            self._replace_content(event.block_id, event.content)
+        elif isinstance(event, PatchBlock):
+            version = self._block_versions[event.block_id]
+            if event.base_version != version:
+                raise ValueError(
+                    f"PatchBlock for {event.block_id} expects version "
+                    f"{event.base_version}, block is at {version}"
+                )
+            old_content = self.blocks[self._block_index[event.block_id]].content
+            self._replace_content(event.block_id, event.apply(old_content))
         elif isinstance(event, ClearAll):
             self.blocks.clear()
             self._block_index.clear()
+            self._block_versions.clear()
+            self._formatted.clear()
+            self._dirty_from = 0
+            self._segment_starts.clear()
+            self._document_end = (0, 0)
+
+    def _replace_content(self, block_id: str, content: BlockContent) -> None:
+        """Replace a block's content and bump its version."""
+        index = self._block_index[block_id]
+        # Create new Block with updated content (immutable update)
+        old_block = self.blocks[index]
+        self.blocks[index] = Block(
+            id=old_block.id,
+            type=old_block.type,
+            content=content,
+            request_id=old_block.request_id,
+        )
+        self._block_versions[block_id] += 1
+        self._formatted[index] = None
+        self._dirty_from = min(self._dirty_from, index)
 
     def render_block(self, block: Block) -> str:
         """Render a block to its markdown string representation.
@@ -96,8 +162,8 @@ class ScreenStateConsumer:
         parts: list[str] = []
         prev_request_id: str | None = None
 
-        for block in self.blocks:
-            formatted = format_block(block)
+        for i, block in enumerate(self.blocks):
+            formatted = self._format(i)
             if not formatted:
                 continue
 
@@ -115,6 +181,63 @@ class ScreenStateConsumer:
 
         return "\n".join(parts)
 
+    def markdown_update(self) -> MarkdownUpdate:
+        """Return the change to the markdown since the previous call.
+
+        The first call (and the first call after a ClearAll) returns the
+        whole document at offset 0. Afterwards only the segments from the
+        first added or updated block onward are formatted and returned, so
+        following a live session costs O(changed blocks) per tick.
+
+        Returns:
+            The update that turns the previously returned document into
+            ``to_markdown()``.
+        """
+        start = self._dirty_from
+        starts = self._segment_starts
+        char, byte = starts[start] if start < len(starts) else self._document_end
+        del starts[start:]
+
+        # Separator context: the last non-empty block before the change
+        prev_index = start - 1
+        while prev_index >= 0 and not self._format(prev_index):
+            prev_index -= 1
+        has_prev = prev_index >= 0
+        prev_request_id = self.blocks[prev_index].request_id if has_prev else None
+
+        offset, byte_offset = char, byte
+        pieces: list[str] = []
+        for i in range(start, len(self.blocks)):
+            starts.append((char, byte))
+            formatted = self._format(i)
+            if not formatted:
+                continue
+            current_rid = self.blocks[i].request_id
+            if not has_prev:
+                segment = formatted
+            elif prev_request_id and current_rid and prev_request_id == current_rid:
+                segment = "\n" + formatted
+            else:
+                segment = "\n\n" + formatted
+            pieces.append(segment)
+            char += len(segment)
+            byte += len(segment.encode("utf-8"))
+            has_prev = True
+            prev_request_id = current_rid
+
+        self._document_end = (char, byte)
+        self._dirty_from = len(self.blocks)
+        return MarkdownUpdate(offset=offset, byte_offset=byte_offset, text="".join(pieces))
+
+    def _format(self, index: int) -> str:
+        """Return the markdown of the block at index, formatting it if needed."""
+        block = self.blocks[index]
+        entry = self._formatted[index]
+        if entry is None or entry[0] is not block:
+            entry = (block, format_block(block))
+            self._formatted[index] = entry
+        return entry[1]
+
 
 def format_block(block: Block) -> str:
     """Format a single block as markdown.
@@ -238,22 +361,20 @@ def format_question(content: QuestionContent) -> str:
     return "\n\n".join(parts)
 
 
-def replay_session(lines: list[dict]) -> str:
+def replay_session(lines: Iterable[dict]) -> str:
     """Convenience function for replaying a full session.
 
+    Lines are consumed one at a time, so passing a lazy iterator such as
+    ``iter_session(path)`` keeps only the live block set in memory.
+
     Args:
-        lines: List of parsed JSONL line dicts.
+        lines: Iterable of parsed JSONL line dicts (list or generator).
 
     Returns:
         Markdown string of the entire session.
     """
-    from .processor import process_line
+    from .processor import process_lines
 
-    context = ProcessingContext()
     consumer = ScreenStateConsumer()
-
-    for line in lines:
-        for event in process_line(context, line):
-            consumer.handle(event)
-
+    process_lines(ProcessingContext(), lines, consumer.handle)
     return consumer.to_markdown()
@@ -2,20 +2,129 @@
 
 This module provides the EventEmitter class that dispatches events to
 consumers via asyncio.create_task() for concurrent, fire-and-forget processing.
+
+With a ``queue_size``, the emitter instead gives each consumer a bounded
+queue drained by a single worker task, so each consumer sees events in
+order and a slow consumer applies backpressure according to the
+``overflow`` policy:
+
+- ``"block"``: ``emit()`` waits until the consumer's queue has room.
+- ``"drop_oldest"``: the oldest queued event is discarded. A consumer
+  that loses an AddBlock will also miss the block's later updates.
+- ``"coalesce"``: an UpdateBlock replaces a queued, not yet delivered
+  UpdateBlock of the same block (UpdateBlock carries the full content, so
+  the final state is unchanged); when there is nothing to coalesce,
+  ``emit()`` waits as with ``"block"``.
+
+``queue_metrics()`` reports each queue's depth, lag and counters.
+
+Consumers implementing the optional ``BatchConsumer`` protocol receive
+batches through a single ``on_events()`` call: everything passed to
+``emit_batch()`` and, in queued mode, everything queued by the time the
+worker picks up work.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import deque
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from .events import AddBlock, ClearAll, PatchBlock, UpdateBlock
+from .protocol import BatchConsumer
+
 if TYPE_CHECKING:
     from .events import Event
     from .protocol import Consumer
 
 logger = logging.getLogger(__name__)
 
+OVERFLOW_POLICIES = ("block", "drop_oldest", "coalesce")
+
+
+@dataclass(slots=True)
+class QueueMetrics:
+    """Point-in-time metrics of one consumer's queue.
+
+    Attributes:
+        consumer_type: Class name of the consumer.
+        depth: Events queued and not yet handed to the consumer.
+        lag: Seconds since the oldest undelivered event (queued or being
+            processed) was emitted; 0.0 when the consumer is idle.
+        delivered: Events the consumer has finished processing.
+        dropped: Events discarded by the ``"drop_oldest"`` policy.
+        coalesced: Updates replaced by the ``"coalesce"`` policy.
+    """
+
+    consumer_type: str
+    depth: int
+    lag: float
+    delivered: int
+    dropped: int
+    coalesced: int
+
+
+class _ConsumerQueue:
+    """Bounded event queue and worker state for one consumer."""
+
+    def __init__(self, consumer: Consumer, maxsize: int) -> None:
+        self.consumer = consumer
+        self.batched = isinstance(consumer, BatchConsumer)
+        self.maxsize = maxsize
+        self.events: deque[tuple[float, Event]] = deque()
+        self.changed = asyncio.Condition()
+        self.worker: asyncio.Task | None = None
+        # Set once the consumer is unsubscribed or the emitter closed;
+        # waiting emits return and new events are discarded
+        self.closed = False
+        # Emit time of the event being processed, None when idle
+        self.in_flight_since: float | None = None
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def coalesce(self, event: UpdateBlock) -> bool:
+        """Replace a queued update of the same block with event, in place.
+
+        Scans back from the newest queued event and stops at a ClearAll or
+        any other event for the same block, so the replaced update only
+        jumps ahead of events for other blocks.
+
+        Returns:
+            True if a queued update was replaced.
+        """
+        for index in range(len(self.events) - 1, -1, -1):
+            queued = self.events[index][1]
+            if isinstance(queued, ClearAll):
+                return False
+            if isinstance(queued, UpdateBlock):
+                if queued.block_id == event.block_id:
+                    self.events[index] = (self.events[index][0], event)
+                    self.coalesced += 1
+                    return True
+            elif isinstance(queued, PatchBlock) and queued.block_id == event.block_id:
+                return False
+            elif isinstance(queued, AddBlock) and queued.block.id == event.block_id:
+                return False
+        return False
+
+    def metrics(self, now: float) -> QueueMetrics:
+        """Return the current metrics of this queue."""
+        oldest = self.in_flight_since
+        if oldest is None and self.events:
+            oldest = self.events[0][0]
+        return QueueMetrics(
+            consumer_type=type(self.consumer).__name__,
+            depth=len(self.events),
+            lag=now - oldest if oldest is not None else 0.0,
+            delivered=self.delivered,
+            dropped=self.dropped,
+            coalesced=self.coalesced,
+        )
+
 
 class EventEmitter:
     """Dispatches events to multiple consumers concurrently.
@@ -32,11 +141,34 @@ class EventEmitter:
 
         # Events are dispatched to all consumers concurrently
         await emitter.emit(AddBlock(block=some_block))
+
+    With ``queue_size`` set, each consumer gets an ordered, bounded queue
+    instead (see the module docstring for the overflow policies).
     """
 
-    def __init__(self) -> None:
-        """Initialize the event emitter with an empty subscriber list."""
+    def __init__(self, queue_size: int | None = None, overflow: str = "block") -> None:
+        """Initialize the event emitter with an empty subscriber list.
+
+        Args:
+            queue_size: Maximum events queued per consumer. None (the
+                default) dispatches each event as its own task.
+            overflow: What ``emit()`` does when a consumer's queue is full:
+                "block", "drop_oldest" or "coalesce".
+
+        Raises:
+            ValueError: If queue_size is not positive or overflow is unknown.
+        """
+        if queue_size is not None and queue_size < 1:
+            raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}; expected one of {', '.join(OVERFLOW_POLICIES)}"
+            )
         self._consumers: list[Consumer] = []
+        self._queue_size = queue_size
+        self._overflow = overflow
+        # Parallel to _consumers when queue_size is set
+        self._queues: list[_ConsumerQueue] = []
 
     def subscribe(self, consumer: Consumer) -> None:
         """Subscribe a consumer to receive events.
@@ -45,6 +177,8 @@ class EventEmitter:
             consumer: A consumer implementing the Consumer protocol.
         """
         self._consumers.append(consumer)
+        if self._queue_size is not None:
+            self._queues.append(_ConsumerQueue(consumer, self._queue_size))
         logger.debug(
             "consumer_subscribed",
             extra={
@@ -56,13 +190,29 @@ class EventEmitter:
     def unsubscribe(self, consumer: Consumer) -> None:
         """Unsubscribe a consumer from receiving events.
 
+        In queued mode the consumer's worker is cancelled, its pending
+        events are discarded and emits waiting for room in its queue return.
+
         Args:
             consumer: The consumer to remove.
 
         Raises:
             ValueError: If the consumer is not subscribed.
         """
-        self._consumers.remove(consumer)
+        index = self._consumers.index(consumer)
+        del self._consumers[index]
+        if self._queues:
+            queue = self._queues.pop(index)
+            queue.closed = True
+            if queue.worker is not None:
+                queue.worker.cancel()
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass  # no loop, so no emit can be waiting
+            else:
+                task = loop.create_task(self._wake_waiters(queue))
+                task.add_done_callback(self._handle_task_completion)
         logger.debug(
             "consumer_unsubscribed",
             extra={
@@ -76,6 +226,38 @@ class EventEmitter:
         """Return the number of subscribed consumers."""
         return len(self._consumers)
 
+    def queue_metrics(self) -> list[QueueMetrics]:
+        """Return the metrics of each consumer's queue, in subscription order.
+
+        Empty unless the emitter was created with a queue_size.
+        """
+        now = time.monotonic()
+        return [queue.metrics(now) for queue in self._queues]
+
+    async def join(self) -> None:
+        """Wait until every queued event has been processed."""
+        for queue in list(self._queues):
+            async with queue.changed:
+                await queue.changed.wait_for(
+                    lambda q=queue: not q.events and q.in_flight_since is None
+                )
+
+    async def close(self) -> None:
+        """Cancel the consumer workers, discarding any queued events.
+
+        Emits waiting for room in a queue return, and later emits are
+        discarded.
+        """
+        workers = [q.worker for q in self._queues if q.worker is not None]
+        for queue in self._queues:
+            queue.worker = None
+            queue.events.clear()
+            queue.in_flight_since = None
+            await self._wake_waiters(queue)
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
     async def emit(self, event: Event) -> None:
         """Dispatch an event to all subscribed consumers.
 
@@ -83,6 +265,10 @@ class EventEmitter:
         execution. This method returns immediately without waiting for
         consumers to finish processing.
 
+        In queued mode the event is appended to each consumer's queue
+        instead; with the "block" and "coalesce" policies this waits while
+        a consumer's queue is full.
+
         Args:
             event: The event to dispatch to all consumers.
         """
@@ -97,6 +283,11 @@ class EventEmitter:
             },
         )
 
+        if self._queue_size is not None:
+            for queue in list(self._queues):
+                await self._enqueue(queue, event)
+            return
+
         for consumer in self._consumers:
             task = asyncio.create_task(
                 self._dispatch_to_consumer(consumer, event),
@@ -105,6 +296,102 @@ class EventEmitter:
             # Fire-and-forget: we don't await the task
             task.add_done_callback(self._handle_task_completion)
 
+    async def emit_batch(self, events: list[Event]) -> None:
+        """Dispatch a batch of events to all subscribed consumers.
+
+        Each consumer gets one task for the whole batch: BatchConsumers
+        receive it in a single ``on_events()`` call, other consumers get
+        ``on_event()`` for each event in order. In queued mode the events
+        are queued one by one as with ``emit()``.
+
+        Args:
+            events: The events to dispatch, in order.
+        """
+        if not events:
+            return
+
+        logger.debug(
+            "batch_dispatch_started",
+            extra={
+                "event_count": len(events),
+                "consumer_count": len(self._consumers),
+            },
+        )
+
+        if self._queue_size is not None:
+            for queue in list(self._queues):
+                for event in events:
+                    await self._enqueue(queue, event)
+            return
+
+        for consumer in self._consumers:
+            task = asyncio.create_task(
+                self._dispatch_batch_to_consumer(consumer, events),
+                name=f"dispatch_batch_to_{type(consumer).__name__}",
+            )
+            task.add_done_callback(self._handle_task_completion)
+
+    async def _enqueue(self, queue: _ConsumerQueue, event: Event) -> None:
+        """Append an event to a consumer's queue, applying the overflow policy."""
+        if queue.closed:
+            return
+        if queue.worker is None:
+            queue.worker = asyncio.create_task(
+                self._run_worker(queue),
+                name=f"worker_{type(queue.consumer).__name__}",
+            )
+            queue.worker.add_done_callback(self._handle_task_completion)
+        async with queue.changed:
+            now = time.monotonic()
+            if len(queue.events) >= queue.maxsize:
+                if self._overflow == "drop_oldest":
+                    queue.events.popleft()
+                    queue.dropped += 1
+                elif (
+                    self._overflow == "coalesce"
+                    and isinstance(event, UpdateBlock)
+                    and queue.coalesce(event)
+                ):
+                    queue.changed.notify_all()
+                    return
+                else:
+                    await queue.changed.wait_for(
+                        lambda: queue.closed or len(queue.events) < queue.maxsize
+                    )
+                    if queue.closed:
+                        return
+                    now = time.monotonic()
+            queue.events.append((now, event))
+            queue.changed.notify_all()
+
+    @staticmethod
+    async def _wake_waiters(queue: _ConsumerQueue) -> None:
+        """Mark a queue closed and wake everything waiting on it."""
+        async with queue.changed:
+            queue.closed = True
+            queue.changed.notify_all()
+
+    async def _run_worker(self, queue: _ConsumerQueue) -> None:
+        """Deliver a consumer's queued events one at a time, in order."""
+        while True:
+            async with queue.changed:
+                await queue.changed.wait_for(lambda: bool(queue.events))
+                queue.in_flight_since = queue.events[0][0]
+                if queue.batched:
+                    events = [event for _, event in queue.events]
+                    queue.events.clear()
+                else:
+                    events = [queue.events.popleft()[1]]
+                queue.changed.notify_all()
+            if queue.batched:
+                await self._dispatch_batch_to_consumer(queue.consumer, events)
+            else:
+                await self._dispatch_to_consumer(queue.consumer, events[0])
+            async with queue.changed:
+                queue.in_flight_since = None
+                queue.delivered += len(events)
+                queue.changed.notify_all()
+
     async def _dispatch_to_consumer(self, consumer: Consumer, event: Event) -> None:
         """Dispatch a single event to a single consumer.
 
@@ -135,6 +422,37 @@ class EventEmitter:
                 },
             )
 
+    async def _dispatch_batch_to_consumer(self, consumer: Consumer, events: list[Event]) -> None:
+        """Dispatch a batch of events to a single consumer.
+
+        Args:
+            consumer: The consumer to dispatch to.
+            events: The events to dispatch, in order.
+        """
+        if not isinstance(consumer, BatchConsumer):
+            for event in events:
+                await self._dispatch_to_consumer(consumer, event)
+            return
+
+        consumer_type = type(consumer).__name__
+        try:
+            await consumer.on_events(events)
+            logger.debug(
+                "batch_dispatch_completed",
+                extra={
+                    "event_count": len(events),
+                    "consumer_type": consumer_type,
+                },
+            )
+        except Exception:
+            logger.exception(
+                "batch_dispatch_failed",
+                extra={
+                    "event_count": len(events),
+                    "consumer_type": consumer_type,
+                },
+            )
+
     def _handle_task_completion(self, task: asyncio.Task) -> None:
         """Handle task completion for logging purposes.
 
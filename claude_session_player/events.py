@@ -4,8 +4,12 @@ This module defines the core event model for the event-driven renderer:
 - Block: A renderable block with explicit identity
 - BlockType: Enum of block types
 - BlockContent: Type-specific content dataclasses
-- Event: AddBlock, UpdateBlock, ClearAll
+- Event: AddBlock, UpdateBlock, PatchBlock, ClearAll
 - ProcessingContext: Minimal state needed during processing
+
+Blocks, contents and events are slotted dataclasses: consumers and
+renderers keep many of them alive, and slots drop the per-instance
+``__dict__``.
 """
 
 from __future__ import annotations
@@ -30,7 +34,7 @@ class BlockType(Enum):
 # --- BlockContent types ---
 
 
-@dataclass
+@dataclass(slots=True)
 class UserContent:
     """Content for user input blocks."""
 
@@ -49,7 +53,7 @@ class UserContent:
         return cls(text=data["text"])
 
 
-@dataclass
+@dataclass(slots=True)
 class AssistantContent:
     """Content for assistant response blocks."""
 
@@ -68,7 +72,7 @@ class AssistantContent:
         return cls(text=data["text"])
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallContent:
     """Content for tool call blocks."""
 
@@ -104,7 +108,7 @@ class ToolCallContent:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ThinkingContent:
     """Content for thinking indicator blocks."""
 
@@ -118,7 +122,7 @@ class ThinkingContent:
         return cls()
 
 
-@dataclass
+@dataclass(slots=True)
 class DurationContent:
     """Content for turn duration blocks."""
 
@@ -137,7 +141,7 @@ class DurationContent:
         return cls(duration_ms=data["duration_ms"])
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemContent:
     """Content for system output blocks."""
 
@@ -156,7 +160,7 @@ class SystemContent:
         return cls(text=data["text"])
 
 
-@dataclass
+@dataclass(slots=True)
 class QuestionOption:
     """A single option for a question."""
 
@@ -179,7 +183,7 @@ class QuestionOption:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Question:
     """A single question with options."""
 
@@ -208,7 +212,7 @@ class Question:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class QuestionContent:
     """Content for AskUserQuestion tool blocks."""
 
@@ -276,7 +280,7 @@ def content_from_dict(data: dict) -> BlockContent:
 # --- Block ---
 
 
-@dataclass
+@dataclass(slots=True)
 class Block:
     """A renderable block with explicit identity."""
 
@@ -308,52 +312,217 @@ class Block:
 # --- Event types ---
 
 
-@dataclass
+@dataclass(slots=True)
 class AddBlock:
     """Append a new block to the conversation."""
 
     block: Block
 
+    def to_dict(self) -> dict:
+        """Serialize to dictionary."""
+        return {
+            "type": "add_block",
+            "block": self.block.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> AddBlock:
+        """Deserialize from dictionary."""
+        return cls(block=Block.from_dict(data["block"]))
 
-@dataclass
+
+@dataclass(slots=True)
 class UpdateBlock:
     """Update an existing block's content."""
 
     block_id: str
     content: BlockContent
 
+    def to_dict(self) -> dict:
+        """Serialize to dictionary."""
+        return {
+            "type": "update_block",
+            "block_id": self.block_id,
+            "content": self.content.to_dict(),
+        }
 
-@dataclass
+    @classmethod
+    def from_dict(cls, data: dict) -> UpdateBlock:
+        """Deserialize from dictionary."""
+        return cls(
+            block_id=data["block_id"],
+            content=content_from_dict(data["content"]),
+        )
+
+
+@dataclass(slots=True)
+class PatchBlock:
+    """Update some fields of an existing block's content (delta UpdateBlock).
+
+    A block's version is the number of updates (UpdateBlock or PatchBlock)
+    applied to it since its AddBlock. A patch applies only to the version
+    it was made against; the block then moves to the next version.
+    """
+
+    block_id: str
+    changes: dict  # content field → new value, in to_dict() form
+    base_version: int
+
+    def to_dict(self) -> dict:
+        """Serialize to dictionary."""
+        return {
+            "type": "patch_block",
+            "block_id": self.block_id,
+            "changes": self.changes,
+            "base_version": self.base_version,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> PatchBlock:
+        """Deserialize from dictionary."""
+        return cls(
+            block_id=data["block_id"],
+            changes=data["changes"],
+            base_version=data["base_version"],
+        )
+
+    def apply(self, content: BlockContent) -> BlockContent:
+        """Return content with the changed fields replaced."""
+        data = content.to_dict()
+        data.update(self.changes)
+        return content_from_dict(data)
+
+
+@dataclass(slots=True)
 class ClearAll:
     """Clear all blocks (compaction boundary)."""
 
-    pass
+    def to_dict(self) -> dict:
+        """Serialize to dictionary."""
+        return {"type": "clear_all"}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ClearAll:
+        """Deserialize from dictionary."""
+        return cls()
 
 
 # Union type for all event types
-Event = Union[AddBlock, UpdateBlock, ClearAll]
+Event = Union[AddBlock, UpdateBlock, PatchBlock, ClearAll]
+
+
+def content_changes(old: BlockContent, new: BlockContent) -> dict | None:
+    """Return the to_dict() fields that differ between two contents.
+
+    Returns:
+        Field → new value for every changed field, or None if the contents
+        are of different types (a patch cannot express the change).
+    """
+    old_data = old.to_dict()
+    new_data = new.to_dict()
+    if old_data["type"] != new_data["type"]:
+        return None
+    return {key: value for key, value in new_data.items() if old_data.get(key) != value}
+
+
+def event_from_dict(data: dict) -> Event:
+    """Deserialize an Event from dictionary using type discriminator.
+
+    Args:
+        data: Dictionary with "type" field indicating event type.
+
+    Returns:
+        The appropriate Event instance.
+
+    Raises:
+        KeyError: If "type" field is missing or unknown.
+    """
+    type_map = {
+        "add_block": AddBlock.from_dict,
+        "update_block": UpdateBlock.from_dict,
+        "patch_block": PatchBlock.from_dict,
+        "clear_all": ClearAll.from_dict,
+    }
+    return type_map[data["type"]](data)
 
 
 # --- ProcessingContext ---
 
+# Resolved tool calls kept around for late updates (e.g. progress lines
+# written after the result); older ones are forgotten.
+MAX_RESOLVED_TOOL_CALLS = 256
+
 
 @dataclass
 class ProcessingContext:
-    """Minimal state needed during processing."""
+    """Minimal state needed during processing.
+
+    Holds all per-session processor state, so independent sessions can be
+    processed concurrently. ``tool_contents`` and ``question_contents`` keep
+    the latest content of each open tool call / question so that results
+    and progress updates can emit complete UpdateBlocks.
+
+    Tool calls that received their result are listed in
+    ``resolved_tool_use_ids`` (oldest first). Only the most recent
+    ``MAX_RESOLVED_TOOL_CALLS`` of them are kept, so the context size is
+    bounded by the number of open tool calls rather than session length.
+    """
 
     tool_use_id_to_block_id: dict[str, str] = field(default_factory=dict)
     current_request_id: str | None = None
+    tool_contents: dict[str, ToolCallContent] = field(default_factory=dict)
+    question_contents: dict[str, QuestionContent] = field(default_factory=dict)
+    resolved_tool_use_ids: list[str] = field(default_factory=list)
 
     def clear(self) -> None:
         """Reset all context state."""
         self.tool_use_id_to_block_id.clear()
         self.current_request_id = None
+        self.tool_contents.clear()
+        self.question_contents.clear()
+        self.resolved_tool_use_ids.clear()
+
+    def mark_resolved(
+        self, tool_use_id: str, max_resolved: int = MAX_RESOLVED_TOOL_CALLS
+    ) -> None:
+        """Record that a tool call got its result, pruning the oldest resolved ones.
+
+        Args:
+            tool_use_id: The resolved tool call.
+            max_resolved: Number of resolved tool calls to keep.
+        """
+        resolved = self.resolved_tool_use_ids
+        if tool_use_id in resolved:
+            resolved.remove(tool_use_id)
+        resolved.append(tool_use_id)
+        while len(resolved) > max_resolved:
+            pruned = resolved.pop(0)
+            self.tool_use_id_to_block_id.pop(pruned, None)
+            self.tool_contents.pop(pruned, None)
+            self.question_contents.pop(pruned, None)
+
+    def copy(self) -> ProcessingContext:
+        """Return an independent copy of the context.
+
+        Only the mappings are copied: content objects are never mutated in
+        place (the processor replaces them), so they can be shared.
+        """
+        return ProcessingContext(
+            tool_use_id_to_block_id=dict(self.tool_use_id_to_block_id),
+            current_request_id=self.current_request_id,
+            tool_contents=dict(self.tool_contents),
+            question_contents=dict(self.question_contents),
+            resolved_tool_use_ids=list(self.resolved_tool_use_ids),
+        )
 
     def to_dict(self) -> dict:
         """Serialize to dictionary."""
         return {
             "tool_use_id_to_block_id": self.tool_use_id_to_block_id,
             "current_request_id": self.current_request_id,
+            "tool_contents": {k: v.to_dict() for k, v in self.tool_contents.items()},
+            "question_contents": {k: v.to_dict() for k, v in self.question_contents.items()},
+            "resolved_tool_use_ids": self.resolved_tool_use_ids,
         }
 
     @classmethod
@@ -362,4 +531,13 @@ class ProcessingContext:
         return cls(
             tool_use_id_to_block_id=data.get("tool_use_id_to_block_id", {}),
             current_request_id=data.get("current_request_id"),
+            tool_contents={
+                k: ToolCallContent.from_dict(v)
+                for k, v in data.get("tool_contents", {}).items()
+            },
+            question_contents={
+                k: QuestionContent.from_dict(v)
+                for k, v in data.get("question_contents", {}).items()
+            },
+            resolved_tool_use_ids=list(data.get("resolved_tool_use_ids", [])),
         )
@@ -0,0 +1,64 @@
+"""JSON codec shared by the session reading and streaming hot paths.
+
+``loads(data)`` decodes bytes or str (raising ValueError on invalid JSON
+or UTF-8) and ``dumps(obj)`` encodes to bytes. They use orjson when it is
+installed and fall back to the stdlib ``json`` module otherwise; ``BACKEND``
+names the active one. Both backends decode to the same Python objects and
+encode to the same bytes: compact separators, UTF-8, non-ASCII characters
+unescaped. (The only differences are float exponents, e.g. ``1e16`` vs
+``1e+16``, non-finite floats and integers beyond 64 bits, none of which
+appear in session files or player events.)
+
+Install the accelerated backend with ``pip install -e ".[fast]"``.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+
+def _stdlib_loads(data: bytes | str) -> Any:
+    """Decode JSON with the stdlib module."""
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    """Encode JSON with the stdlib module, in the orjson output format."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _orjson_loads(data: bytes | str) -> Any:
+    """Decode JSON with orjson.
+
+    Input orjson rejects but the stdlib accepts (NaN, Infinity) is retried
+    with the stdlib, which also produces the error for genuinely malformed
+    input.
+    """
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    """Encode JSON with orjson, falling back to the stdlib for unsupported values."""
+    try:
+        return orjson.dumps(obj)
+    except TypeError:
+        return _stdlib_dumps(obj)
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+    loads = _orjson_loads
+    dumps = _orjson_dumps
+else:  # pragma: no cover - depends on the environment
+    BACKEND = "json"
+    loads = _stdlib_loads
+    dumps = _stdlib_dumps
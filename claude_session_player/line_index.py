@@ -0,0 +1,444 @@
+"""Persistent line-offset index for random access into session JSONL files.
+
+A LineIndex records the byte offset of every non-empty line in a session
+file, the line numbers of ``compact_boundary`` lines and a uuid → line map.
+It is persisted as a sidecar, extended incrementally as the session file
+grows, and rebuilt when the file is truncated or replaced (inode change).
+
+The sidecar is three files: a small header (``.idx``) holding the file
+identity, the indexed size, the compact boundaries and the number of valid
+records, plus append-only ``.offsets`` (little-endian int64 per line) and
+``.uuids`` (one JSON ``[uuid, line]`` record per line) files. Saving appends
+only the records added since the last save and then atomically replaces
+the header, so its cost follows the new lines, not the size of the file;
+records past the counts in the header (from an interrupted save) are
+ignored on load and overwritten by the next save.
+
+Line numbers are 0-based positions among the non-empty lines of the file.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import logging
+import os
+import re
+import sys
+import tempfile
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import json_codec
+from .parser import _COMPACT_BOUNDARY_MARKER, _is_compact_boundary
+
+logger = logging.getLogger(__name__)
+
+# Sidecar header layout: magic line, JSON header line
+_SIDECAR_MAGIC = b"CSPLIDX1\n"
+_SIDECAR_VERSION = 2
+_OFFSETS_SUFFIX = ".offsets"
+_UUIDS_SUFFIX = ".uuids"
+_OFFSET_SIZE = 8
+
+_READ_CHUNK_SIZE = 1024 * 1024
+
+# Where sidecars go when no index directory is given; never next to the
+# session files, which live in the user's ~/.claude tree
+DEFAULT_INDEX_DIR = Path("~/.claude-session-player/line_index").expanduser()
+
+# "uuid" key; occurrences inside strings are escaped (\") and don't match
+_UUID_KEY = b'"uuid":'
+_UUID_RE = re.compile(rb'"uuid":\s*"([^"\\]*)"')
+_JSON_STRING_RE = re.compile(rb'"(?:[^"\\]|\\.)*"')
+
+
+def sidecar_path_for(path: Path, index_dir: Path | None = None) -> Path:
+    """Return the sidecar index path for a session file.
+
+    Args:
+        path: Path to the session JSONL file.
+        index_dir: Directory holding sidecars. Defaults to
+            ``DEFAULT_INDEX_DIR``.
+
+    Returns:
+        Path of the sidecar file.
+    """
+    if index_dir is None:
+        index_dir = DEFAULT_INDEX_DIR
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return index_dir / f"{path.stem}-{digest}.idx"
+
+
+def _is_top_level(raw_line: bytes, start: int, end: int) -> bool:
+    """Return whether raw_line[start:end] lies directly in the outermost object.
+
+    Counts the braces outside strings on the shorter side of the span.
+    """
+    if start <= len(raw_line) - end:
+        before = _JSON_STRING_RE.sub(b"", raw_line[:start])
+        return before.count(b"{") - before.count(b"}") == 1
+    after = _JSON_STRING_RE.sub(b"", raw_line[end:])
+    return after.count(b"}") - after.count(b"{") == 1
+
+
+def _extract_uuid(raw_line: bytes) -> str | None:
+    """Extract the top-level uuid of a raw JSONL line.
+
+    Lines with a single ``"uuid":`` key at the top level are matched on the
+    raw bytes; only ambiguous lines are JSON-decoded.
+    """
+    key_count = raw_line.count(_UUID_KEY)
+    if key_count == 0:
+        return None
+    if key_count == 1:
+        match = _UUID_RE.search(raw_line)
+        if match and _is_top_level(raw_line, match.start(), match.end()):
+            return match.group(1).decode("utf-8", errors="replace")
+    try:
+        obj = json_codec.loads(raw_line)
+    except ValueError:
+        return None
+    uuid = obj.get("uuid") if isinstance(obj, dict) else None
+    return uuid if isinstance(uuid, str) else None
+
+
+@dataclass
+class LineIndex:
+    """Byte offsets of the lines of a session JSONL file.
+
+    Use ``LineIndex.open()`` to load (or build) the index and bring it up to
+    date; call ``refresh()`` later to pick up appended lines.
+
+    Attributes:
+        path: Path to the indexed session file.
+        sidecar_path: Path of the persisted index.
+        device: Device number of the indexed file.
+        inode: Inode number of the indexed file.
+        indexed_size: Byte offset just past the last indexed complete line.
+        offsets: Start offset of each non-empty line.
+        compact_boundaries: Line numbers of compact_boundary lines (ascending).
+        uuid_to_line: Top-level message uuid → line number.
+    """
+
+    path: Path
+    sidecar_path: Path
+    device: int = 0
+    inode: int = 0
+    indexed_size: int = 0
+    offsets: array = field(default_factory=lambda: array("q"), repr=False)
+    compact_boundaries: list[int] = field(default_factory=list, repr=False)
+    uuid_to_line: dict[str, int] = field(default_factory=dict, repr=False)
+    # What the sidecar holds: number of offsets, byte size of the uuid
+    # records, and the uuid entries added since it was written
+    _saved_lines: int = field(default=0, repr=False)
+    _saved_uuid_bytes: int = field(default=0, repr=False)
+    _unsaved_uuids: list[tuple[str, int]] = field(default_factory=list, repr=False)
+
+    @classmethod
+    def open(cls, path: str | Path, index_dir: Path | None = None) -> LineIndex:
+        """Load the sidecar index for a file and bring it up to date.
+
+        Args:
+            path: Path to the session JSONL file.
+            index_dir: Directory holding sidecars; defaults to
+                ``DEFAULT_INDEX_DIR`` (see ``sidecar_path_for``).
+
+        Returns:
+            An up-to-date LineIndex.
+
+        Raises:
+            FileNotFoundError: If the session file does not exist.
+        """
+        path = Path(path)
+        index = cls(path=path, sidecar_path=sidecar_path_for(path, index_dir))
+        index._load()
+        index.refresh()
+        return index
+
+    # -- Queries -------------------------------------------------------------
+
+    @property
+    def line_count(self) -> int:
+        """Return the number of indexed (non-empty, complete) lines."""
+        return len(self.offsets)
+
+    def offset_of(self, line: int) -> int:
+        """Return the byte offset of a line.
+
+        Raises:
+            IndexError: If the line is not indexed.
+        """
+        return self.offsets[line]
+
+    def end_of(self, line: int) -> int:
+        """Return the byte offset just past a line (start of the next one).
+
+        Raises:
+            IndexError: If the line is not indexed.
+        """
+        if line < 0:
+            line += len(self.offsets)
+        if not 0 <= line < len(self.offsets):
+            raise IndexError("line index out of range")
+        if line + 1 < len(self.offsets):
+            return self.offsets[line + 1]
+        return self.indexed_size
+
+    def offset_of_last_lines(self, n: int) -> int:
+        """Return the offset of the nth-to-last line, or 0 if there are <= n lines."""
+        if n <= 0:
+            return self.indexed_size
+        if len(self.offsets) <= n:
+            return 0
+        return self.offsets[-n]
+
+    def offset_of_uuid(self, uuid: str) -> int | None:
+        """Return the byte offset of the line with the given message uuid."""
+        line = self.uuid_to_line.get(uuid)
+        if line is None:
+            return None
+        return self.offsets[line]
+
+    def compaction_offset(self, before_line: int | None = None) -> int:
+        """Return the offset just past the last compact_boundary line.
+
+        Replaying from this offset renders the same screen as replaying from
+        the start of the file, because the boundary clears everything before it.
+
+        Args:
+            before_line: Only consider boundaries at or before this line.
+                Defaults to the whole file.
+
+        Returns:
+            Byte offset to start replay from (0 if there is no boundary).
+        """
+        if before_line is None:
+            pos = len(self.compact_boundaries)
+        else:
+            pos = bisect.bisect_right(self.compact_boundaries, before_line)
+        if pos == 0:
+            return 0
+        return self.end_of(self.compact_boundaries[pos - 1])
+
+    def replay_bounds(self, line: int) -> tuple[int, int]:
+        """Return the (start, end) byte range needed to render the screen at a line.
+
+        Args:
+            line: Line number of the last line to include.
+
+        Returns:
+            Offsets to pass as ``iter_session(path, offset=start, end=end)``.
+
+        Raises:
+            IndexError: If the line is not indexed.
+        """
+        end = self.end_of(line)
+        return self.compaction_offset(before_line=line), end
+
+    # -- Maintenance ---------------------------------------------------------
+
+    def refresh(self) -> bool:
+        """Index lines appended since the last refresh and persist the result.
+
+        The index is rebuilt from scratch if the file was replaced (different
+        device/inode), truncated below the indexed size, or rewritten so that
+        the last indexed byte is no longer a newline.
+
+        Returns:
+            True if the index changed.
+
+        Raises:
+            FileNotFoundError: If the session file does not exist.
+        """
+        st = self.path.stat()
+        changed = False
+        if (st.st_dev, st.st_ino) != (self.device, self.inode) or st.st_size < self.indexed_size:
+            if self.indexed_size or self.offsets:
+                logger.info(f"Rebuilding line index for {self.path} (file replaced or truncated)")
+            self._reset(st.st_dev, st.st_ino)
+            changed = True
+
+        if st.st_size > self.indexed_size:
+            changed = self._scan() or changed
+
+        if changed:
+            self.save()
+        return changed
+
+    def _reset(self, device: int, inode: int) -> None:
+        """Drop all indexed data and rebind to the given file identity."""
+        self.device = device
+        self.inode = inode
+        self.indexed_size = 0
+        self.offsets = array("q")
+        self.compact_boundaries = []
+        self.uuid_to_line = {}
+        self._saved_lines = 0
+        self._saved_uuid_bytes = 0
+        self._unsaved_uuids = []
+
+    def _scan(self) -> bool:
+        """Index complete lines from ``indexed_size`` to EOF.
+
+        Returns:
+            True if any bytes were indexed or the index was reset.
+        """
+        with self.path.open("rb") as f:
+            reset = False
+            if self.indexed_size:
+                f.seek(self.indexed_size - 1)
+                if f.read(1) != b"\n":
+                    # Rewritten in place with the same inode
+                    self._reset(self.device, self.inode)
+                    reset = True
+
+            f.seek(self.indexed_size)
+            pos = self.indexed_size
+            line_start = pos
+            pending: list[bytes] = []  # pieces of the current incomplete line
+            while chunk := f.read(_READ_CHUNK_SIZE):
+                start = 0
+                while (nl := chunk.find(b"\n", start)) != -1:
+                    pending.append(chunk[start:nl])
+                    self._add_line(line_start, b"".join(pending))
+                    pending.clear()
+                    start = nl + 1
+                    line_start = pos + start
+                pending.append(chunk[start:])
+                pos += len(chunk)
+
+        scanned = line_start != self.indexed_size
+        self.indexed_size = line_start
+        return scanned or reset
+
+    def _add_line(self, offset: int, raw_line: bytes) -> None:
+        """Record a complete raw line starting at offset."""
+        if not raw_line.strip():
+            return
+        line = len(self.offsets)
+        self.offsets.append(offset)
+        if _COMPACT_BOUNDARY_MARKER in raw_line and _is_compact_boundary(raw_line):
+            self.compact_boundaries.append(line)
+        uuid = _extract_uuid(raw_line)
+        if uuid and uuid not in self.uuid_to_line:
+            self.uuid_to_line[uuid] = line
+            self._unsaved_uuids.append((uuid, line))
+
+    # -- Persistence ---------------------------------------------------------
+
+    @property
+    def _offsets_path(self) -> Path:
+        """Return the path of the sidecar's offsets file."""
+        return self.sidecar_path.with_name(self.sidecar_path.name + _OFFSETS_SUFFIX)
+
+    @property
+    def _uuids_path(self) -> Path:
+        """Return the path of the sidecar's uuid records file."""
+        return self.sidecar_path.with_name(self.sidecar_path.name + _UUIDS_SUFFIX)
+
+    def save(self) -> None:
+        """Persist the index to its sidecar.
+
+        Appends the offsets and uuids added since the last save, then
+        replaces the header atomically (temp file + rename). Failures are
+        logged and the index stays usable in memory.
+        """
+        offsets = self.offsets[self._saved_lines:]
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        uuid_records = b"".join(
+            json_codec.dumps([uuid, line]) + b"\n" for uuid, line in self._unsaved_uuids
+        )
+
+        temp_path: str | None = None
+        try:
+            self.sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+            _append_at(self._offsets_path, self._saved_lines * _OFFSET_SIZE, offsets.tobytes())
+            _append_at(self._uuids_path, self._saved_uuid_bytes, uuid_records)
+            header = {
+                "version": _SIDECAR_VERSION,
+                "path": str(self.path),
+                "device": self.device,
+                "inode": self.inode,
+                "indexed_size": self.indexed_size,
+                "line_count": len(self.offsets),
+                "uuid_bytes": self._saved_uuid_bytes + len(uuid_records),
+                "compact_boundaries": self.compact_boundaries,
+            }
+            fd, temp_path = tempfile.mkstemp(
+                dir=self.sidecar_path.parent,
+                prefix=".lineidx_",
+                suffix=".tmp",
+            )
+            with os.fdopen(fd, "wb") as f:
+                f.write(_SIDECAR_MAGIC)
+                f.write(json_codec.dumps(header))
+                f.write(b"\n")
+            os.replace(temp_path, self.sidecar_path)
+        except OSError as e:
+            logger.warning(f"Failed to save line index {self.sidecar_path}: {e}")
+            if temp_path is not None and os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return
+        self._saved_lines = len(self.offsets)
+        self._saved_uuid_bytes = header["uuid_bytes"]
+        self._unsaved_uuids = []
+
+    def _load(self) -> None:
+        """Load state from the sidecar, ignoring missing or corrupt sidecars."""
+        try:
+            data = self.sidecar_path.read_bytes()
+        except OSError:
+            return
+
+        try:
+            if not data.startswith(_SIDECAR_MAGIC):
+                raise ValueError("bad magic")
+            header_end = data.index(b"\n", len(_SIDECAR_MAGIC))
+            header = json_codec.loads(data[len(_SIDECAR_MAGIC):header_end])
+            if header["version"] != _SIDECAR_VERSION or header["path"] != str(self.path):
+                raise ValueError("sidecar does not match")
+            offsets = array("q")
+            offsets.frombytes(_read_prefix(self._offsets_path, header["line_count"] * _OFFSET_SIZE))
+            if sys.byteorder == "big":
+                offsets.byteswap()
+            uuid_bytes = header["uuid_bytes"]
+            uuid_to_line = {}
+            for record in _read_prefix(self._uuids_path, uuid_bytes).splitlines():
+                uuid, line = json_codec.loads(record)
+                uuid_to_line[uuid] = line
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring corrupt line index {self.sidecar_path}: {e}")
+            return
+
+        self.device = header["device"]
+        self.inode = header["inode"]
+        self.indexed_size = header["indexed_size"]
+        self.offsets = offsets
+        self.compact_boundaries = list(header["compact_boundaries"])
+        self.uuid_to_line = uuid_to_line
+        self._saved_lines = len(offsets)
+        self._saved_uuid_bytes = uuid_bytes
+        self._unsaved_uuids = []
+
+
+def _append_at(path: Path, size: int, data: bytes) -> None:
+    """Cut a file to size (creating it if missing) and append data."""
+    with open(path, "ab") as f:
+        f.truncate(size)
+        f.write(data)
+
+
+def _read_prefix(path: Path, size: int) -> bytes:
+    """Read the first size bytes of a file.
+
+    Raises:
+        ValueError: If the file is shorter than size.
+    """
+    with open(path, "rb") as f:
+        data = f.read(size)
+    if len(data) != size:
+        raise ValueError(f"{path.name} is truncated")
+    return data
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-import json
 import logging
+import os
 import re
+from collections.abc import Iterator
 from enum import Enum, auto
 from pathlib import Path
 
+from . import json_codec
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -168,32 +171,232 @@ def _classify_assistant(line: dict) -> LineType:
     return _ASSISTANT_BLOCK_MAP.get(block_type, LineType.INVISIBLE)
 
 
+# ---------------------------------------------------------------------------
+# Raw-line prefilter
+# ---------------------------------------------------------------------------
+
+# Quoted JSON tokens of the always-invisible types, as written by the CLI
+_INVISIBLE_TYPE_TOKENS = frozenset(f'"{t}"'.encode() for t in _INVISIBLE_TYPES)
+_SIDECHAIN_TYPE_TOKENS = frozenset({b'"user"', b'"assistant"'})
+
+# A key is certainly top-level when it is preceded only by scalar fields of
+# the outer object, or followed only by scalar fields up to the final brace.
+_JSON_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_SCALAR_FIELD = rb'"[^"\\]*"\s*:\s*(?:' + _JSON_STRING + rb'|[\w.+-]+)'
+_LEADING = rb'\s*\{\s*(?:' + _SCALAR_FIELD + rb'\s*,\s*)*?'
+_TRAILING = rb'(?:\s*,\s*' + _SCALAR_FIELD + rb')*\s*\}\s*\Z'
+
+_TYPE_KEY = b'"type"'
+_TYPE_FIELD = rb'"type"\s*:\s*(' + _JSON_STRING + rb')'
+_LEADING_TYPE_RE = re.compile(_LEADING + _TYPE_FIELD)
+_TRAILING_TYPE_RE = re.compile(_TYPE_FIELD + _TRAILING)
+
+_SIDECHAIN_KEY = b'"isSidechain"'
+_SIDECHAIN_FIELD = rb'"isSidechain"\s*:\s*true\b'
+_LEADING_SIDECHAIN_RE = re.compile(_LEADING + _SIDECHAIN_FIELD)
+_TRAILING_SIDECHAIN_RE = re.compile(_SIDECHAIN_FIELD + _TRAILING)
+
+
+def _match_top_level_field(
+    raw_line: bytes, key: bytes, leading: re.Pattern[bytes], trailing: re.Pattern[bytes]
+) -> re.Match[bytes] | None:
+    """Match a field that is certainly a key of the outermost object.
+
+    Tries the scalar fields at the start of the object, then the last
+    occurrence of ``key`` followed only by scalar fields up to the end.
+    """
+    match = leading.match(raw_line)
+    if match is not None:
+        return match
+    pos = raw_line.rfind(key)
+    if pos <= 0:
+        return None
+    before = pos - 1
+    while before > 0 and raw_line[before] in b" \t":
+        before -= 1
+    if raw_line[before] not in b"{,":
+        return None
+    return trailing.match(raw_line, pos)
+
+
+def _top_level_type_token(raw_line: bytes) -> bytes | None:
+    """Return the quoted top-level ``type`` value if it can be located cheaply."""
+    match = _match_top_level_field(raw_line, _TYPE_KEY, _LEADING_TYPE_RE, _TRAILING_TYPE_RE)
+    return match.group(1) if match is not None else None
+
+
+def peek_line_type(raw_line: bytes) -> str | None:
+    """Return the top-level ``type`` of a raw JSONL line without decoding it.
+
+    Returns None if the type cannot be located among the scalar fields at
+    either end of the object; callers should then fall back to decoding.
+    """
+    token = _top_level_type_token(raw_line)
+    return json_codec.loads(token) if token is not None else None
+
+
+def is_invisible_raw(raw_line: bytes) -> bool:
+    """Check whether a raw JSONL line is certainly classified as INVISIBLE.
+
+    Matches lines whose top-level type is always invisible (summaries, file
+    history snapshots, ...) and sidechain user/assistant messages, without
+    UTF-8 decoding or JSON-parsing the line. Lines are only rejected when
+    the answer is certain; anything else (including truncated lines) returns
+    False and goes through the normal parse + ``classify_line`` path.
+    """
+    if not raw_line.rstrip().endswith(b"}"):
+        return False
+    token = _top_level_type_token(raw_line)
+    if token is None:
+        return False
+    if token in _INVISIBLE_TYPE_TOKENS:
+        return True
+    if token in _SIDECHAIN_TYPE_TOKENS and _SIDECHAIN_KEY in raw_line:
+        return _match_top_level_field(
+            raw_line, _SIDECHAIN_KEY, _LEADING_SIDECHAIN_RE, _TRAILING_SIDECHAIN_RE
+        ) is not None
+    return False
+
+
 # ---------------------------------------------------------------------------
 # JSONL file reader
 # ---------------------------------------------------------------------------
 
+# Raw-bytes marker for compaction boundary lines and the reverse scan chunk size
+_COMPACT_BOUNDARY_MARKER = b'"compact_boundary"'
+_REVERSE_SCAN_CHUNK_SIZE = 64 * 1024
 
-def read_session(path: str | Path) -> list[dict]:
-    """Read a JSONL file and return list of parsed dicts.
 
-    Skips empty lines and lines that fail JSON parsing (logs a warning).
+def find_last_compact_boundary(path: str | Path) -> int:
+    """Return the byte offset just past the last compact_boundary line.
+
+    Everything before a compaction boundary is wiped by the ``ClearAll`` it
+    produces, so replay only needs the lines after the last one. The file is
+    scanned backwards in fixed-size chunks and only lines containing the
+    ``"compact_boundary"`` marker are JSON-decoded (and confirmed with
+    ``classify_line``), so the cost is proportional to the tail of the file.
+
+    Returns:
+        Offset of the first line after the last boundary, or 0 if the file
+        has no compaction boundary.
     """
     path = Path(path)
-    results: list[dict] = []
-    with path.open("r", encoding="utf-8") as f:
+    with path.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        # Pieces of a line that started before the current chunk, newest
+        # first; joined once the line's start is found, so a huge line is
+        # copied once rather than once per chunk
+        carry: list[bytes] = []
+        while pos > 0:
+            read_size = min(_REVERSE_SCAN_CHUNK_SIZE, pos)
+            pos -= read_size
+            f.seek(pos)
+            chunk = f.read(read_size)
+
+            # Unless we reached the start of the file, the bytes before the
+            # first newline belong to a line that continues in earlier chunks
+            if pos > 0:
+                first_nl = chunk.find(b"\n")
+                if first_nl == -1:
+                    carry.append(chunk)
+                    continue
+                start = first_nl + 1
+            else:
+                start = 0
+            carry.append(chunk)
+            carry.reverse()
+            buf = b"".join(carry)
+
+            end = len(buf)
+            while True:
+                hit = buf.rfind(_COMPACT_BOUNDARY_MARKER, start, end)
+                if hit == -1:
+                    break
+                prev_nl = buf.rfind(b"\n", start, hit)
+                line_start = prev_nl + 1 if prev_nl != -1 else start
+                line_end = buf.find(b"\n", hit)
+                if line_end == -1:
+                    # Last line of the file without a trailing newline
+                    line_end = len(buf) - 1
+                if _is_compact_boundary(buf[line_start:line_end + 1]):
+                    return pos + line_end + 1
+                end = line_start
+
+            carry = [buf[:start]]
+    return 0
+
+
+def _is_compact_boundary(raw_line: bytes) -> bool:
+    """Check whether a raw JSONL line is a compact_boundary system message."""
+    try:
+        obj = json_codec.loads(raw_line)
+    except ValueError:
+        return False
+    return isinstance(obj, dict) and classify_line(obj) is LineType.COMPACT_BOUNDARY
+
+
+def iter_session(
+    path: str | Path,
+    *,
+    offset: int = 0,
+    end: int | None = None,
+    from_last_compaction: bool = False,
+    skip_invisible: bool = False,
+) -> Iterator[dict]:
+    """Lazily yield parsed dicts from a JSONL file, one line at a time.
+
+    Only the current line is held in memory, so callers that process lines
+    as they arrive (e.g. ``replay_session``) have a peak memory footprint
+    bounded by their own state rather than by the file size.
+
+    Skips empty lines and lines that fail JSON parsing (logs a warning
+    with the 1-based line number, counted from the first line read).
+
+    Args:
+        path: Path to the JSONL session file.
+        offset: Byte offset of the first line to read (must be a line start).
+        end: Stop before the line starting at or after this byte offset.
+        from_last_compaction: Start right after the last compact_boundary
+            line (see ``find_last_compact_boundary``) instead of at
+            ``offset``. Replaying the result renders the same output as
+            replaying the whole file.
+        skip_invisible: Drop lines that ``is_invisible_raw`` identifies as
+            INVISIBLE before decoding them. They produce no events, so the
+            rendered output is unchanged.
+    """
+    path = Path(path)
+    if from_last_compaction:
+        offset = find_last_compact_boundary(path)
+    with path.open("rb") as f:
+        f.seek(offset)
+        pos = offset
         for line_num, raw_line in enumerate(f, start=1):
-            stripped = raw_line.strip()
-            if not stripped:
+            if end is not None and pos >= end:
+                break
+            pos += len(raw_line)
+            if skip_invisible and is_invisible_raw(raw_line):
+                continue
+            if not raw_line.strip():
                 continue
             try:
-                obj = json.loads(stripped)
-                if isinstance(obj, dict):
-                    results.append(obj)
-                else:
-                    logger.warning("Line %d: expected dict, got %s", line_num, type(obj).__name__)
-            except json.JSONDecodeError as exc:
+                obj = json_codec.loads(raw_line)
+            except ValueError as exc:
                 logger.warning("Line %d: failed to parse JSON: %s", line_num, exc)
-    return results
+                continue
+            if isinstance(obj, dict):
+                yield obj
+            else:
+                logger.warning("Line %d: expected dict, got %s", line_num, type(obj).__name__)
+
+
+def read_session(path: str | Path, *, skip_invisible: bool = False) -> list[dict]:
+    """Read a JSONL file and return list of parsed dicts.
+
+    Skips empty lines and lines that fail JSON parsing (logs a warning).
+    Prefer ``iter_session`` for large files; this materializes every line.
+    With ``skip_invisible``, lines known to be INVISIBLE are dropped undecoded.
+    """
+    return list(iter_session(path, skip_invisible=skip_invisible))
 
 
 # ---------------------------------------------------------------------------
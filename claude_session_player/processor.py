@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
+import sys
 import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
 
 from .events import (
     AddBlock,
     AssistantContent,
     Block,
+    BlockContent,
     BlockType,
     ClearAll,
     DurationContent,
     Event,
+    PatchBlock,
     ProcessingContext,
     Question,
     QuestionContent,
@@ -21,6 +26,7 @@ from .events import (
     ToolCallContent,
     UpdateBlock,
     UserContent,
+    content_changes,
 )
 from .formatter import truncate_result
 from .parser import (
@@ -40,76 +46,211 @@ from .parser import (
 from .tools import abbreviate_tool_input
 
 
-# Module-level cache for tool call content (cleared on compact_boundary)
-# This stores the original ToolCallContent so we can create complete UpdateBlocks
-_tool_content_cache: dict[str, ToolCallContent] = {}
-
-# Module-level cache for question content (cleared on compact_boundary)
-# This stores the original QuestionContent so we can update with answers
-_question_content_cache: dict[str, QuestionContent] = {}
-
-
-def _store_tool_content(tool_use_id: str, content: ToolCallContent) -> None:
+def _store_tool_content(
+    context: ProcessingContext, tool_use_id: str, content: ToolCallContent
+) -> None:
     """Store tool call content for later result/progress updates."""
-    _tool_content_cache[tool_use_id] = content
+    context.tool_contents[tool_use_id] = content
 
 
-def _store_question_content(tool_use_id: str, content: QuestionContent) -> None:
+def _store_question_content(
+    context: ProcessingContext, tool_use_id: str, content: QuestionContent
+) -> None:
     """Store question content for later answer updates."""
-    _question_content_cache[tool_use_id] = content
+    context.question_contents[tool_use_id] = content
 
 
-def _clear_tool_content_cache() -> None:
-    """Clear the tool content cache."""
-    _tool_content_cache.clear()
-    _question_content_cache.clear()
+# Receives each event as it is produced (e.g. ``list.append`` or a
+# consumer's ``handle`` method)
+EventSink = Callable[[Event], object]
 
 
 def process_line(context: ProcessingContext, line: dict) -> list[Event]:
     """Process a single JSONL line and return events.
 
     Args:
-        context: Processing context with state (tool mappings, request ID).
+        context: Processing context with per-session state (tool mappings,
+            open tool/question contents, request ID). Mutated in place.
         line: Parsed JSONL line dict.
 
     Returns:
         List of events (AddBlock, UpdateBlock, or ClearAll).
     """
-    line_type = classify_line(line)
-
-    if line_type is LineType.INVISIBLE:
-        return []
-    if line_type is LineType.USER_INPUT:
-        return _process_user_input(context, line)
-    if line_type is LineType.LOCAL_COMMAND_OUTPUT:
-        return _process_local_command(line)
-    if line_type is LineType.ASSISTANT_TEXT:
-        return _process_assistant_text(context, line)
-    if line_type is LineType.TOOL_USE:
-        return _process_tool_use(context, line)
-    if line_type is LineType.TOOL_RESULT:
-        return _process_tool_result(context, line)
-    if line_type is LineType.THINKING:
-        return _process_thinking(context, line)
-    if line_type is LineType.TURN_DURATION:
-        return _process_turn_duration(context, line)
-    if line_type is LineType.COMPACT_BOUNDARY:
-        return _process_compact_boundary(context)
-    if line_type is LineType.BASH_PROGRESS:
-        return _process_bash_progress(context, line)
-    if line_type is LineType.HOOK_PROGRESS:
-        return _process_hook_progress(context, line)
-    if line_type is LineType.AGENT_PROGRESS:
-        return _process_agent_progress(context, line)
-    if line_type is LineType.QUERY_UPDATE:
-        return _process_query_update(context, line)
-    if line_type is LineType.SEARCH_RESULTS:
-        return _process_search_results(context, line)
-    if line_type is LineType.WAITING_FOR_TASK:
-        return _process_waiting_for_task(context, line)
-
-    # Unknown line type - return empty list
-    return []
+    events: list[Event] = []
+    handler = _LINE_HANDLERS.get(classify_line(line))
+    if handler is not None:
+        handler(context, line, events.append)
+    return events
+
+
+def process_lines(
+    context: ProcessingContext,
+    lines: Iterable[dict],
+    emit: EventSink | None = None,
+) -> list[Event]:
+    """Process a batch of JSONL lines, writing all events to a single sink.
+
+    Equivalent to calling ``process_line`` for each line and concatenating
+    the results, without allocating a list per line. Lines are consumed
+    one at a time, so a lazy iterator can be passed.
+
+    Args:
+        context: Processing context, mutated in place.
+        lines: Parsed JSONL line dicts.
+        emit: Called with each event as it is produced. If None, events
+            are collected into the returned list.
+
+    Returns:
+        The collected events, or an empty list if ``emit`` was given.
+    """
+    events: list[Event] = []
+    if emit is None:
+        emit = events.append
+    handlers = _LINE_HANDLERS
+    for line in lines:
+        handler = handlers.get(classify_line(line))
+        if handler is not None:
+            handler(context, line, emit)
+    return events
+
+
+def coalesce_updates(events: list[Event]) -> list[Event]:
+    """Drop UpdateBlocks superseded by a later update of the same block.
+
+    UpdateBlock carries the block's full content, so within a run of
+    UpdateBlocks (no AddBlock, PatchBlock or ClearAll in between) only the
+    last update of each block matters; e.g. a long bash command's progress lines
+    collapse into a single update. The surviving updates keep their
+    positions relative to each other and are never moved across an
+    AddBlock or ClearAll, so replaying the result yields the same final
+    state as replaying ``events``.
+
+    Args:
+        events: Events of one processing batch, in order.
+
+    Returns:
+        A new list of the events to deliver.
+    """
+    kept: list[Event | None] = []
+    last_update: dict[str, int] = {}  # block_id → index in kept, current run
+    for event in events:
+        if isinstance(event, UpdateBlock):
+            index = last_update.get(event.block_id)
+            if index is not None:
+                kept[index] = None
+            last_update[event.block_id] = len(kept)
+        else:
+            last_update.clear()
+        kept.append(event)
+    return [event for event in kept if event is not None]
+
+
+def fold_updates(events: list[Event]) -> list[Event]:
+    """Collapse each block's changes within a batch into a single event.
+
+    An UpdateBlock for a block added earlier in the batch is folded into
+    that AddBlock, and of the other blocks' UpdateBlocks only the last one
+    is kept (at its own position). Unlike ``coalesce_updates`` this folds
+    across AddBlocks of other blocks; ClearAll and PatchBlock still act as
+    barriers. Replaying the result yields the same final blocks, but with
+    fewer updates applied, so block versions differ: use it only for
+    consumers that do not apply PatchBlocks, e.g. messaging consumers that
+    should post or edit each message once per batch.
+
+    Args:
+        events: Events of one batch, in order.
+
+    Returns:
+        A new list of the events to deliver.
+    """
+    kept: list[Event | None] = []
+    added: dict[str, int] = {}  # block_id → index of its AddBlock in kept
+    last_update: dict[str, int] = {}  # block_id → index of its UpdateBlock in kept
+    for event in events:
+        if isinstance(event, UpdateBlock):
+            index = added.get(event.block_id)
+            if index is not None:
+                block = kept[index].block
+                kept[index] = AddBlock(
+                    block=Block(
+                        id=block.id,
+                        type=block.type,
+                        content=event.content,
+                        request_id=block.request_id,
+                    )
+                )
+                continue
+            index = last_update.get(event.block_id)
+            if index is not None:
+                kept[index] = None
+            last_update[event.block_id] = len(kept)
+        elif isinstance(event, AddBlock):
+            added[event.block.id] = len(kept)
+        else:
+            added.clear()
+            last_update.clear()
+        kept.append(event)
+    return [event for event in kept if event is not None]
+
+
+# Blocks whose version and content a DeltaEncoder remembers
+MAX_DELTA_BLOCKS = 256
+
+
+class DeltaEncoder:
+    """Derives PatchBlock (delta) forms of the UpdateBlocks in an event stream.
+
+    Feed it every event of the stream in order. It tracks the version and
+    current content of the most recently updated blocks; an UpdateBlock for
+    a tracked block gets a PatchBlock carrying only the changed fields.
+    Blocks that were evicted, or first seen through an update, have no
+    known version and keep being sent in full.
+    """
+
+    def __init__(self, max_blocks: int = MAX_DELTA_BLOCKS) -> None:
+        self._blocks: OrderedDict[str, tuple[int, BlockContent]] = OrderedDict()
+        self._max_blocks = max_blocks
+
+    def encode(self, event: Event) -> PatchBlock | None:
+        """Record an event and return its delta form.
+
+        Returns:
+            A PatchBlock equivalent to an UpdateBlock (or the PatchBlock
+            itself), or None if the event has no delta form.
+        """
+        if isinstance(event, AddBlock):
+            self._track(event.block.id, 0, event.block.content)
+            return None
+        if isinstance(event, ClearAll):
+            self._blocks.clear()
+            return None
+
+        entry = self._blocks.pop(event.block_id, None)
+        if entry is None:
+            return None
+        version, content = entry
+        if isinstance(event, PatchBlock):
+            if event.base_version != version:
+                return None  # stream and encoder disagree; stop tracking the block
+            self._track(event.block_id, version + 1, event.apply(content))
+            return event
+
+        self._track(event.block_id, version + 1, event.content)
+        changes = content_changes(content, event.content)
+        if changes is None:
+            return None
+        return PatchBlock(block_id=event.block_id, changes=changes, base_version=version)
+
+    def _track(self, block_id: str, version: int, content: BlockContent) -> None:
+        """Remember a block's version and content, evicting the oldest block."""
+        self._blocks[block_id] = (version, content)
+        if len(self._blocks) > self._max_blocks:
+            self._blocks.popitem(last=False)
+
+
+def _intern(value: str | None) -> str | None:
+    """Intern strings repeated across many blocks (request IDs, tool names)."""
+    return sys.intern(value) if type(value) is str else value
 
 
 def _generate_block_id() -> str:
@@ -122,7 +263,7 @@ def _generate_block_id() -> str:
 # ---------------------------------------------------------------------------
 
 
-def _process_user_input(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_user_input(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process USER_INPUT: create AddBlock(USER)."""
     text = get_user_text(line)
     content = UserContent(text=text)
@@ -133,10 +274,10 @@ def _process_user_input(context: ProcessingContext, line: dict) -> list[Event]:
     )
     # Reset current_request_id on user input
     context.current_request_id = None
-    return [AddBlock(block=block)]
+    emit(AddBlock(block=block))
 
 
-def _process_local_command(line: dict) -> list[Event]:
+def _process_local_command(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process LOCAL_COMMAND_OUTPUT: create AddBlock(SYSTEM)."""
     text = get_local_command_text(line)
     content = SystemContent(text=text)
@@ -145,7 +286,7 @@ def _process_local_command(line: dict) -> list[Event]:
         type=BlockType.SYSTEM,
         content=content,
     )
-    return [AddBlock(block=block)]
+    emit(AddBlock(block=block))
 
 
 # ---------------------------------------------------------------------------
@@ -153,9 +294,9 @@ def _process_local_command(line: dict) -> list[Event]:
 # ---------------------------------------------------------------------------
 
 
-def _process_assistant_text(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_assistant_text(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process ASSISTANT_TEXT: create AddBlock(ASSISTANT)."""
-    request_id = get_request_id(line)
+    request_id = _intern(get_request_id(line))
     message = line.get("message") or {}
     content_list = message.get("content") or []
 
@@ -173,26 +314,25 @@ def _process_assistant_text(context: ProcessingContext, line: dict) -> list[Even
         request_id=request_id,
     )
     context.current_request_id = request_id
-    return [AddBlock(block=block)]
+    emit(AddBlock(block=block))
 
 
-def _process_tool_use(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_tool_use(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process TOOL_USE: create AddBlock(TOOL_CALL or QUESTION), store mapping."""
     tool_name, tool_use_id, input_dict = get_tool_use_info(line)
-    request_id = get_request_id(line)
+    request_id = _intern(get_request_id(line))
 
     # Check if this is an AskUserQuestion tool
     question_data = get_ask_user_question_data(line)
     if question_data is not None:
-        return _process_ask_user_question(
-            context, tool_use_id, question_data, request_id
-        )
+        _process_ask_user_question(context, tool_use_id, question_data, request_id, emit)
+        return
 
     # Regular tool call
     label = abbreviate_tool_input(tool_name, input_dict)
 
     content = ToolCallContent(
-        tool_name=tool_name,
+        tool_name=_intern(tool_name),
         tool_use_id=tool_use_id,
         label=label,
     )
@@ -207,9 +347,9 @@ def _process_tool_use(context: ProcessingContext, line: dict) -> list[Event]:
     # Store mapping for later result/progress updates
     context.tool_use_id_to_block_id[tool_use_id] = block_id
     # Store content for later updates
-    _store_tool_content(tool_use_id, content)
+    _store_tool_content(context, tool_use_id, content)
     context.current_request_id = request_id
-    return [AddBlock(block=block)]
+    emit(AddBlock(block=block))
 
 
 def _process_ask_user_question(
@@ -217,7 +357,8 @@ def _process_ask_user_question(
     tool_use_id: str,
     question_data: list[dict],
     request_id: str | None,
-) -> list[Event]:
+    emit: EventSink,
+) -> None:
     """Process AskUserQuestion tool_use: create AddBlock(QUESTION)."""
     # Parse question data into Question objects
     questions: list[Question] = []
@@ -257,14 +398,14 @@ def _process_ask_user_question(
 
     # Store mapping for later answer updates
     context.tool_use_id_to_block_id[tool_use_id] = block_id
-    _store_question_content(tool_use_id, content)
+    _store_question_content(context, tool_use_id, content)
     context.current_request_id = request_id
-    return [AddBlock(block=block)]
+    emit(AddBlock(block=block))
 
 
-def _process_thinking(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_thinking(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process THINKING: create AddBlock(THINKING)."""
-    request_id = get_request_id(line)
+    request_id = _intern(get_request_id(line))
     content = ThinkingContent()
     block = Block(
         id=_generate_block_id(),
@@ -273,7 +414,7 @@ def _process_thinking(context: ProcessingContext, line: dict) -> list[Event]:
         request_id=request_id,
     )
     context.current_request_id = request_id
-    return [AddBlock(block=block)]
+    emit(AddBlock(block=block))
 
 
 # ---------------------------------------------------------------------------
@@ -281,7 +422,7 @@ def _process_thinking(context: ProcessingContext, line: dict) -> list[Event]:
 # ---------------------------------------------------------------------------
 
 
-def _process_turn_duration(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_turn_duration(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process TURN_DURATION: create AddBlock(DURATION)."""
     duration_ms = get_duration_ms(line)
     content = DurationContent(duration_ms=duration_ms)
@@ -292,14 +433,15 @@ def _process_turn_duration(context: ProcessingContext, line: dict) -> list[Event
     )
     # Reset current_request_id on turn duration
     context.current_request_id = None
-    return [AddBlock(block=block)]
+    emit(AddBlock(block=block))
 
 
-def _process_compact_boundary(context: ProcessingContext) -> list[Event]:
-    """Process COMPACT_BOUNDARY: return ClearAll, clear context."""
+def _process_compact_boundary(
+    context: ProcessingContext, line: dict, emit: EventSink
+) -> None:
+    """Process COMPACT_BOUNDARY: emit ClearAll, clear context."""
     context.clear()
-    _clear_tool_content_cache()
-    return [ClearAll()]
+    emit(ClearAll())
 
 
 # ---------------------------------------------------------------------------
@@ -330,10 +472,9 @@ def _get_task_result_text(line: dict) -> str | None:
     return None
 
 
-def _process_tool_result(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_tool_result(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process TOOL_RESULT: UpdateBlock if match found, else AddBlock(SYSTEM)."""
     results = get_tool_result_info(line)
-    events: list[Event] = []
 
     # Check for Task tool result special handling
     task_result_text = _get_task_result_text(line)
@@ -346,7 +487,7 @@ def _process_tool_result(context: ProcessingContext, line: dict) -> list[Event]:
             block_id = context.tool_use_id_to_block_id[tool_use_id]
 
             # Check if this is a question response
-            question_original = _question_content_cache.get(tool_use_id)
+            question_original = context.question_contents.get(tool_use_id)
             if question_original is not None:
                 # Update QuestionContent with answers
                 updated_content = QuestionContent(
@@ -354,15 +495,16 @@ def _process_tool_result(context: ProcessingContext, line: dict) -> list[Event]:
                     questions=question_original.questions,
                     answers=answers,
                 )
-                _store_question_content(tool_use_id, updated_content)
-                events.append(UpdateBlock(block_id=block_id, content=updated_content))
+                _store_question_content(context, tool_use_id, updated_content)
+                context.mark_resolved(tool_use_id)
+                emit(UpdateBlock(block_id=block_id, content=updated_content))
                 continue
 
             # Regular tool call result
             result_text = truncate_result(content_text)
 
             # Get original content from cache to create complete UpdateBlock
-            original = _tool_content_cache.get(tool_use_id)
+            original = context.tool_contents.get(tool_use_id)
             if original:
                 # Check if this is a Task tool with special result handling
                 if original.tool_name == "Task" and task_result_text is not None:
@@ -377,7 +519,7 @@ def _process_tool_result(context: ProcessingContext, line: dict) -> list[Event]:
                     progress_text=original.progress_text,
                 )
                 # Update cache so subsequent progress messages preserve the result
-                _store_tool_content(tool_use_id, updated_content)
+                _store_tool_content(context, tool_use_id, updated_content)
             else:
                 # Fallback: create content with empty tool_name/label
                 # This shouldn't happen in normal operation
@@ -389,7 +531,8 @@ def _process_tool_result(context: ProcessingContext, line: dict) -> list[Event]:
                     is_error=is_error,
                 )
 
-            events.append(UpdateBlock(block_id=block_id, content=updated_content))
+            context.mark_resolved(tool_use_id)
+            emit(UpdateBlock(block_id=block_id, content=updated_content))
         else:
             # Orphan result - create AddBlock(SYSTEM)
             truncated = truncate_result(content_text)
@@ -399,9 +542,7 @@ def _process_tool_result(context: ProcessingContext, line: dict) -> list[Event]:
                 type=BlockType.SYSTEM,
                 content=content,
             )
-            events.append(AddBlock(block=block))
-
-    return events
+            emit(AddBlock(block=block))
 
 
 # ---------------------------------------------------------------------------
@@ -425,14 +566,14 @@ def _get_bash_progress_text(data: dict) -> str:
 
 
 def _update_tool_progress(
-    context: ProcessingContext, parent_id: str | None, progress_text: str
-) -> list[Event]:
-    """Create UpdateBlock for tool call progress if match found."""
+    context: ProcessingContext, parent_id: str | None, progress_text: str, emit: EventSink
+) -> None:
+    """Emit UpdateBlock for tool call progress if match found."""
     if not parent_id or parent_id not in context.tool_use_id_to_block_id:
-        return []
+        return
 
     block_id = context.tool_use_id_to_block_id[parent_id]
-    original = _tool_content_cache.get(parent_id)
+    original = context.tool_contents.get(parent_id)
 
     if original:
         updated_content = ToolCallContent(
@@ -444,7 +585,7 @@ def _update_tool_progress(
             progress_text=progress_text,
         )
         # Update cache with new progress
-        _store_tool_content(parent_id, updated_content)
+        _store_tool_content(context, parent_id, updated_content)
     else:
         # Fallback: shouldn't happen in normal operation
         updated_content = ToolCallContent(
@@ -454,52 +595,52 @@ def _update_tool_progress(
             progress_text=progress_text,
         )
 
-    return [UpdateBlock(block_id=block_id, content=updated_content)]
+    emit(UpdateBlock(block_id=block_id, content=updated_content))
 
 
-def _process_bash_progress(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_bash_progress(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process BASH_PROGRESS: UpdateBlock with last line of fullOutput."""
     data = get_progress_data(line)
     parent_id = get_parent_tool_use_id(line)
     progress_text = _get_bash_progress_text(data)
-    return _update_tool_progress(context, parent_id, progress_text)
+    _update_tool_progress(context, parent_id, progress_text, emit)
 
 
-def _process_hook_progress(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_hook_progress(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process HOOK_PROGRESS: UpdateBlock with Hook: {hookName}."""
     data = get_progress_data(line)
     parent_id = get_parent_tool_use_id(line)
     hook_name = data.get("hookName", "")
     progress_text = f"Hook: {hook_name}"
-    return _update_tool_progress(context, parent_id, progress_text)
+    _update_tool_progress(context, parent_id, progress_text, emit)
 
 
-def _process_agent_progress(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_agent_progress(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process AGENT_PROGRESS: UpdateBlock with fixed 'Agent: working…'."""
     parent_id = get_parent_tool_use_id(line)
     progress_text = "Agent: working…"
-    return _update_tool_progress(context, parent_id, progress_text)
+    _update_tool_progress(context, parent_id, progress_text, emit)
 
 
-def _process_query_update(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_query_update(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process QUERY_UPDATE: UpdateBlock with Searching: {query}."""
     data = get_progress_data(line)
     parent_id = get_parent_tool_use_id(line)
     query = data.get("query", "")
     progress_text = f"Searching: {query}"
-    return _update_tool_progress(context, parent_id, progress_text)
+    _update_tool_progress(context, parent_id, progress_text, emit)
 
 
-def _process_search_results(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_search_results(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process SEARCH_RESULTS: UpdateBlock with {resultCount} results."""
     data = get_progress_data(line)
     parent_id = get_parent_tool_use_id(line)
     result_count = data.get("resultCount", 0)
     progress_text = f"{result_count} results"
-    return _update_tool_progress(context, parent_id, progress_text)
+    _update_tool_progress(context, parent_id, progress_text, emit)
 
 
-def _process_waiting_for_task(context: ProcessingContext, line: dict) -> list[Event]:
+def _process_waiting_for_task(context: ProcessingContext, line: dict, emit: EventSink) -> None:
     """Process WAITING_FOR_TASK: UpdateBlock if match, else AddBlock(SYSTEM)."""
     data = get_progress_data(line)
     parent_id = get_parent_tool_use_id(line)
@@ -507,7 +648,7 @@ def _process_waiting_for_task(context: ProcessingContext, line: dict) -> list[Ev
     progress_text = f"Waiting: {description}"
 
     if parent_id and parent_id in context.tool_use_id_to_block_id:
-        return _update_tool_progress(context, parent_id, progress_text)
+        _update_tool_progress(context, parent_id, progress_text, emit)
     else:
         # No matching tool call - create standalone SystemOutput
         content = SystemContent(text=f"└ {progress_text}")
@@ -516,4 +657,26 @@ def _process_waiting_for_task(context: ProcessingContext, line: dict) -> list[Ev
             type=BlockType.SYSTEM,
             content=content,
         )
-        return [AddBlock(block=block)]
+        emit(AddBlock(block=block))
+
+
+# ---------------------------------------------------------------------------
+# Dispatch table (LineType.INVISIBLE has no handler)
+# ---------------------------------------------------------------------------
+
+_LINE_HANDLERS: dict[LineType, Callable[[ProcessingContext, dict, EventSink], None]] = {
+    LineType.USER_INPUT: _process_user_input,
+    LineType.LOCAL_COMMAND_OUTPUT: _process_local_command,
+    LineType.ASSISTANT_TEXT: _process_assistant_text,
+    LineType.TOOL_USE: _process_tool_use,
+    LineType.TOOL_RESULT: _process_tool_result,
+    LineType.THINKING: _process_thinking,
+    LineType.TURN_DURATION: _process_turn_duration,
+    LineType.COMPACT_BOUNDARY: _process_compact_boundary,
+    LineType.BASH_PROGRESS: _process_bash_progress,
+    LineType.HOOK_PROGRESS: _process_hook_progress,
+    LineType.AGENT_PROGRESS: _process_agent_progress,
+    LineType.QUERY_UPDATE: _process_query_update,
+    LineType.SEARCH_RESULTS: _process_search_results,
+    LineType.WAITING_FOR_TASK: _process_waiting_for_task,
+}
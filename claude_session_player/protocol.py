@@ -2,6 +2,8 @@
 
 This module defines the async Consumer protocol that all consumers must implement.
 Consumers process events concurrently and independently via the EventEmitter.
+Consumers that can handle several events at once also implement the optional
+BatchConsumer protocol, which the EventEmitter detects.
 """
 
 from __future__ import annotations
@@ -47,3 +49,24 @@ class Consumer(Protocol):
             String representation of the block.
         """
         ...
+
+
+@runtime_checkable
+class BatchConsumer(Consumer, Protocol):
+    """Protocol for consumers that also accept events in batches.
+
+    The EventEmitter delivers a batch with a single ``on_events()`` call
+    instead of one ``on_event()`` per event, letting the consumer collapse
+    work, e.g. send one message edit for a block's final state.
+    """
+
+    async def on_events(self, events: list[Event]) -> None:
+        """Process a batch of events, in order.
+
+        The result must be the same as calling ``on_event()`` for each
+        event in turn, apart from intermediate states being skipped.
+
+        Args:
+            events: The events to process.
+        """
+        ...
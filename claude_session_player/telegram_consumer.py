@@ -30,6 +30,7 @@ from .events import (
     UserContent,
 )
 from .formatter import format_duration
+from .processor import fold_updates
 
 logger = logging.getLogger(__name__)
 
@@ -116,6 +117,19 @@ class TelegramConsumer:
                 extra={"reason": "telegram_consumer_does_not_delete_messages"},
             )
 
+    async def on_events(self, events: list[Event]) -> None:
+        """Process a batch of events.
+
+        Changes to a block within the batch are collapsed first, so a block
+        added and updated in the same batch is posted once with its final
+        content, and an existing message is edited once per batch.
+
+        Args:
+            events: The events to process, in order.
+        """
+        for event in fold_updates(events):
+            await self.on_event(event)
+
     async def _handle_add_block(self, event: AddBlock) -> None:
         """Handle AddBlock event by posting a new message.
 
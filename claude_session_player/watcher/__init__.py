@@ -34,6 +34,7 @@ from claude_session_player.watcher.destinations import (
     parse_telegram_identifier,
 )
 from claude_session_player.watcher.event_buffer import EventBuffer, EventBufferManager
+from claude_session_player.watcher.event_log import EventLog
 from claude_session_player.watcher.file_watcher import FileWatcher, IncrementalReader
 from claude_session_player.watcher.message_binding import (
     MessageBinding,
@@ -42,6 +43,7 @@ from claude_session_player.watcher.message_binding import (
 from claude_session_player.watcher.render_cache import CachedRender, RenderCache
 from claude_session_player.watcher.screen_renderer import (
     Dimensions,
+    IncrementalScreenRenderer,
     Preset,
     ScreenRenderer,
 )
@@ -112,12 +114,14 @@ __all__ = [
     # Event handling
     "EventBuffer",
     "EventBufferManager",
+    "EventLog",
     "FileWatcher",
     "IncrementalReader",
     "transform",
     # Messaging (new architecture)
     "CachedRender",
     "Dimensions",
+    "IncrementalScreenRenderer",
     "MessageBinding",
     "MessageBindingManager",
     "MessageDebouncer",
@@ -8,6 +8,7 @@ Options:
     --port PORT          Port to bind to (default: 8080)
     --config PATH        Path to config.yaml (default: ./config.yaml)
     --state-dir PATH     Path to state directory (default: ./state)
+    --event-log-dir PATH Keep a disk event log for deep SSE replay (default: off)
     --log-level LEVEL    Log level (default: INFO)
 """
 
@@ -20,6 +21,7 @@ import signal
 import sys
 from pathlib import Path
 
+from claude_session_player.watcher.event_log import DEFAULT_MAX_AGE_SECONDS, DEFAULT_MAX_BYTES
 from claude_session_player.watcher.service import WatcherService
 
 
@@ -76,6 +78,38 @@ Examples:
         help="Path to state directory (default: ./state)",
     )
 
+    parser.add_argument(
+        "--state-format",
+        type=str,
+        default="json",
+        choices=["json", "binary"],
+        help="Session state file format (default: json; binary is smaller)",
+    )
+
+    parser.add_argument(
+        "--event-log-dir",
+        type=Path,
+        default=None,
+        help="Directory for per-session event logs enabling SSE replay past the "
+        "in-memory buffer (default: disabled)",
+    )
+
+    parser.add_argument(
+        "--event-log-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help=f"Maximum event log size per session in MiB "
+        f"(default: {DEFAULT_MAX_BYTES // (1024 * 1024)})",
+    )
+
+    parser.add_argument(
+        "--event-log-max-age-hours",
+        type=float,
+        default=DEFAULT_MAX_AGE_SECONDS / 3600,
+        help=f"Drop event log segments not written for this many hours; 0 keeps "
+        f"them regardless of age (default: {DEFAULT_MAX_AGE_SECONDS // 3600})",
+    )
+
     parser.add_argument(
         "--log-level",
         type=str,
@@ -137,6 +171,10 @@ def main(args: list[str] | None = None) -> int:
     service = WatcherService(
         config_path=parsed.config.absolute(),
         state_dir=parsed.state_dir.absolute(),
+        state_format=parsed.state_format,
+        event_log_dir=parsed.event_log_dir.absolute() if parsed.event_log_dir else None,
+        event_log_max_bytes=parsed.event_log_max_mb * 1024 * 1024,
+        event_log_max_age_seconds=parsed.event_log_max_age_hours * 3600 or None,
         host=parsed.host,
         port=parsed.port,
     )
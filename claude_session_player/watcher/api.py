@@ -17,12 +17,15 @@ from typing import TYPE_CHECKING
 
 from aiohttp import web
 
+from claude_session_player import json_codec
+
 if TYPE_CHECKING:
     from claude_session_player.watcher.config import BotConfig, ConfigManager
     from claude_session_player.watcher.destinations import DestinationManager
     from claude_session_player.watcher.event_buffer import EventBufferManager
     from claude_session_player.watcher.indexer import SessionIndexer, SQLiteSessionIndexer
     from claude_session_player.watcher.rate_limit import RateLimiter
+    from claude_session_player.watcher.render_cache import RenderCache
     from claude_session_player.watcher.search import SearchEngine
     from claude_session_player.watcher.sse import SSEManager
 
@@ -72,6 +75,12 @@ class WatcherAPI:
     preview_limiter: RateLimiter | None = None  # 60/min per IP
     refresh_limiter: RateLimiter | None = None  # 1/60s global
 
+    # Directory for LineIndex sidecars (None: scan files for compaction)
+    line_index_dir: Path | None = None
+
+    # Render cache, reported by /health
+    render_cache: RenderCache | None = None
+
     _start_time: float = field(default_factory=time.time, repr=False)
 
     async def handle_attach(self, request: web.Request) -> web.Response:
@@ -461,6 +470,13 @@ class WatcherAPI:
             Accept: text/event-stream
             Last-Event-ID: {event_id}  (optional, for replay)
 
+        Query params:
+            delta: "1" to receive patch_block events for block updates
+                (acknowledged with an X-Event-Delta: 1 response header)
+            snapshot: "1" to start with a snapshot event carrying the
+                session's current blocks instead of replaying events
+                (acknowledged with an X-Event-Snapshot: 1 response header)
+
         Response: SSE stream
         Response 404: Session not found
         """
@@ -475,17 +491,20 @@ class WatcherAPI:
 
         # Get Last-Event-ID from headers
         last_event_id = request.headers.get("Last-Event-ID")
+        delta = request.query.get("delta") == "1"
+        snapshot = request.query.get("snapshot") == "1"
 
         # Create streaming response
-        response = web.StreamResponse(
-            status=200,
-            reason="OK",
-            headers={
-                "Content-Type": "text/event-stream",
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-            },
-        )
+        headers = {
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+        if delta:
+            headers["X-Event-Delta"] = "1"
+        if snapshot:
+            headers["X-Event-Snapshot"] = "1"
+        response = web.StreamResponse(status=200, reason="OK", headers=headers)
         await response.prepare(request)
 
         # Connect to SSE manager
@@ -494,6 +513,8 @@ class WatcherAPI:
                 session_id=session_id,
                 response=response,
                 last_event_id=last_event_id,
+                delta=delta,
+                snapshot=snapshot,
             )
 
             # Keep the connection open until client disconnects or session ends
@@ -525,6 +546,7 @@ class WatcherAPI:
                 "projects_indexed": 5,
                 "index_age_seconds": 127,
                 "uptime_seconds": 3600,
+                "json_backend": "orjson",  # or "json" (stdlib fallback)
                 "bots": {
                     "telegram": "configured",  # or "not_configured"
                     "slack": "not_configured"
@@ -534,6 +556,16 @@ class WatcherAPI:
                     "projects": 5,
                     "fts_enabled": true,
                     "last_refresh": "2024-01-15T10:30:00Z"
+                },
+                "render_cache": {
+                    "sessions": 2,
+                    "bytes": 183040,
+                    "max_bytes": 67108864,
+                    "hits": 412,
+                    "misses": 37,
+                    "evictions": 0,
+                    "expirations": 1,
+                    "session_bytes": {"my-session": 150112, "other": 32928}
                 }
             }
         """
@@ -587,6 +619,7 @@ class WatcherAPI:
             "projects_indexed": projects_indexed,
             "index_age_seconds": index_age_seconds,
             "uptime_seconds": uptime,
+            "json_backend": json_codec.BACKEND,
             "bots": {
                 "telegram": "configured" if bot_config.telegram_token else "not_configured",
                 "slack": "configured" if bot_config.slack_token else "not_configured",
@@ -597,6 +630,9 @@ class WatcherAPI:
         if index_stats:
             response_data["index"] = index_stats
 
+        if self.render_cache is not None:
+            response_data["render_cache"] = self.render_cache.stats()
+
         return web.json_response(response_data)
 
     # =========================================================================
@@ -936,20 +972,31 @@ class WatcherAPI:
                 AssistantContent,
                 ToolCallContent,
             )
+            from claude_session_player.line_index import LineIndex
+            from claude_session_player.parser import iter_session
             from claude_session_player.watcher.transformer import transform
 
-            # Read session file
-            lines = []
-            with open(session.file_path, encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        lines.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
+            # Read session file from the last compaction boundary; earlier
+            # blocks are wiped by the boundary's ClearAll anyway
+            if self.line_index_dir is not None:
+                line_index = LineIndex.open(session.file_path, index_dir=self.line_index_dir)
+                lines = list(
+                    iter_session(
+                        session.file_path,
+                        offset=line_index.compaction_offset(),
+                        skip_invisible=True,
+                    )
+                )
+            else:
+                lines = list(
+                    iter_session(
+                        session.file_path, from_last_compaction=True, skip_invisible=True
+                    )
+                )
 
-            # Process all lines to get events
+            # Process lines to get events
             context = ProcessingContext()
-            all_events, _ = transform(lines, context)
+            all_events, _ = transform(lines, context, owned=True)
 
             # Filter to AddBlock events only (for counting and preview)
             add_events = [e for e in all_events if isinstance(e, AddBlock)]
@@ -1,15 +1,76 @@
 """Per-session event buffer with replay support for SSE reconnection.
 
 This module provides ring buffers that store the last N events per session,
-enabling SSE clients to replay missed events after reconnection.
+enabling SSE clients to replay missed events after reconnection. Compact
+buffers hold events as ``binary_codec`` records and decode them on replay.
+Snapshot buffers also fold every event into the session's current blocks,
+so the full state survives however many updates push its AddBlocks out of
+the ring. With a log directory, every event is also appended to a per-session
+``EventLog`` on disk, so replay can reach back past the ring buffer; snapshot
+buffers checkpoint their block table into the log, so it survives restarts.
 """
 
 from __future__ import annotations
 
+import logging
+import shutil
 from collections import deque
+from collections.abc import Iterator
 from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
 
-from claude_session_player.events import Event
+from claude_session_player import binary_codec
+from claude_session_player.events import (
+    AddBlock,
+    Block,
+    ClearAll,
+    Event,
+    PatchBlock,
+    UpdateBlock,
+)
+from claude_session_player.watcher.event_log import (
+    DEFAULT_MAX_AGE_SECONDS,
+    DEFAULT_MAX_BYTES,
+    DEFAULT_SEGMENT_BYTES,
+    EventLog,
+)
+from claude_session_player.watcher.state import _sanitize_session_id
+
+
+logger = logging.getLogger(__name__)
+
+
+EVENT_ID_PREFIX = "evt_"
+
+
+def format_event_id(seq: int) -> str:
+    """Format an event sequence number as an event ID (e.g. 1 → "evt_001")."""
+    return f"{EVENT_ID_PREFIX}{seq:03d}"
+
+
+def parse_event_id(event_id: str) -> int | None:
+    """Return the sequence number of an event ID, or None if it is malformed."""
+    if not event_id.startswith(EVENT_ID_PREFIX):
+        return None
+    digits = event_id[len(EVENT_ID_PREFIX) :]
+    if not digits.isascii() or not digits.isdigit():
+        return None
+    return int(digits)
+
+
+@dataclass(slots=True)
+class BufferSnapshot:
+    """A session's blocks after the last ClearAll, as of an event.
+
+    ``versions[i]`` is the number of updates ``blocks[i]`` received since
+    its AddBlock, matching the ``base_version`` of the next patch_block
+    sent for it.
+    """
+
+    event_id: str | None  # newest event folded in; None if there were none
+    blocks: list[Block]
+    versions: list[int]
 
 
 @dataclass
@@ -17,12 +78,33 @@ class EventBuffer:
     """Per-session ring buffer storing the last N events.
 
     Supports replay for SSE reconnection via get_since() method.
-    Events are stored with unique IDs for tracking.
+    Events get monotonically increasing sequence numbers, exposed as IDs
+    like "evt_001" (zero-padded to three digits, then growing), and are
+    never renumbered, not even by clear(). The buffer holds a contiguous
+    range of sequence numbers, so finding a replay position is offset
+    arithmetic and only the replayed tail is copied. With
+    ``compact=True`` events are stored encoded, trading decode time on
+    replay for memory.
+
+    With ``snapshot=True`` the buffer also keeps the current block table:
+    every added event is folded into it (updates and patches replace the
+    block's content, ClearAll empties it), so get_snapshot() returns the
+    full state after the last ClearAll at a cost proportional to the
+    number of blocks, not the number of events. The ring then serves only
+    as a short tail for reconnecting clients.
     """
 
     max_size: int = 20
-    _buffer: deque[tuple[str, Event]] = field(default_factory=deque, repr=False)
+    compact: bool = False
+    snapshot: bool = False
+    _buffer: deque[Event | bytes] = field(default_factory=deque, repr=False)
+    # Sequence number of the newest event; the buffer holds
+    # _id_counter - len(_buffer) + 1 .. _id_counter
     _id_counter: int = field(default=0, repr=False)
+    # Snapshot mode: current blocks by ID in screen order (encoded if compact)
+    # and the number of updates each received since its AddBlock
+    _blocks: dict[str, Block | bytes] = field(default_factory=dict, repr=False)
+    _block_versions: dict[str, int] = field(default_factory=dict, repr=False)
 
     def __post_init__(self) -> None:
         """Initialize the deque with maxlen."""
@@ -41,9 +123,93 @@ class EventBuffer:
             The unique event ID (e.g., "evt_001").
         """
         self._id_counter += 1
-        event_id = f"evt_{self._id_counter:03d}"
-        self._buffer.append((event_id, event))
-        return event_id
+        self._buffer.append(binary_codec.encode_event(event) if self.compact else event)
+        if self.snapshot:
+            self._fold(event)
+        return format_event_id(self._id_counter)
+
+    def _fold(self, event: Event) -> None:
+        """Apply an event to the snapshot block table.
+
+        Updates and patches for blocks that are not in the table are
+        ignored with a warning. Patches are applied as they come; buffered
+        events are never patches in practice, since those are made per
+        connection.
+        """
+        if isinstance(event, AddBlock):
+            block = event.block
+            self._blocks.pop(block.id, None)  # a re-added block moves to the end
+            self._block_versions[block.id] = 0
+        elif isinstance(event, (UpdateBlock, PatchBlock)):
+            old = self._blocks.get(event.block_id)
+            if old is None:
+                logger.warning(f"Ignoring update for unknown block {event.block_id}")
+                return
+            if self.compact:
+                old = binary_codec.decode_block(old)
+            if isinstance(event, UpdateBlock):
+                content = event.content
+            else:
+                content = event.apply(old.content)
+            block = Block(id=old.id, type=old.type, content=content, request_id=old.request_id)
+            self._block_versions[block.id] += 1
+        elif isinstance(event, ClearAll):
+            self._blocks.clear()
+            self._block_versions.clear()
+            return
+        else:
+            return
+        self._blocks[block.id] = binary_codec.encode_block(block) if self.compact else block
+
+    def get_snapshot(self) -> BufferSnapshot:
+        """Return the current blocks as of the newest event added.
+
+        Raises:
+            ValueError: If the buffer is not in snapshot mode.
+        """
+        if not self.snapshot:
+            raise ValueError("EventBuffer is not in snapshot mode")
+        blocks = list(self._blocks.values())
+        if self.compact:
+            blocks = [binary_codec.decode_block(data) for data in blocks]
+        return BufferSnapshot(
+            event_id=format_event_id(self._id_counter) if self._id_counter else None,
+            blocks=blocks,
+            versions=[self._block_versions[block.id] for block in blocks],
+        )
+
+    def _checkpoint(self) -> dict:
+        """Return the block table as a checkpoint record for the event log."""
+        snapshot = self.get_snapshot()
+        return {
+            "blocks": [block.to_dict() for block in snapshot.blocks],
+            "versions": snapshot.versions,
+        }
+
+    def _restore(self, checkpoint: dict) -> None:
+        """Replace the block table with one saved by _checkpoint().
+
+        Raises:
+            KeyError, TypeError, ValueError: If the checkpoint is malformed.
+        """
+        blocks = [Block.from_dict(data) for data in checkpoint["blocks"]]
+        versions = [int(version) for version in checkpoint["versions"]]
+        if len(versions) != len(blocks):
+            raise ValueError("checkpoint has one version per block")
+        self._blocks = {
+            block.id: binary_codec.encode_block(block) if self.compact else block
+            for block in blocks
+        }
+        self._block_versions = {block.id: version for block, version in zip(blocks, versions)}
+
+    def _entries(self, count: int) -> list[tuple[str, Event]]:
+        """Return the newest count buffered events with their IDs, decoded."""
+        tail = list(islice(reversed(self._buffer), count))
+        tail.reverse()
+        first = self._id_counter - len(tail) + 1
+        if self.compact:
+            tail = [binary_codec.decode_event(data) for data in tail]
+        return [(format_event_id(first + i), event) for i, event in enumerate(tail)]
 
     def get_since(self, event_id: str | None) -> list[tuple[str, Event]]:
         """Get all events after the given event ID.
@@ -58,23 +224,22 @@ class EventBuffer:
             List of (event_id, event) tuples for events after the given ID.
             Returns all buffered events if event_id is None or not found.
         """
-        if event_id is None:
-            return list(self._buffer)
-
-        # Find the index of the event_id in the buffer
-        for i, (eid, _) in enumerate(self._buffer):
-            if eid == event_id:
-                # Return everything after this event
-                return list(self._buffer)[i + 1 :]
-
-        # event_id not found (evicted or unknown) - return all buffered events
-        return list(self._buffer)
+        seq = parse_event_id(event_id) if event_id is not None else None
+        oldest = self._id_counter - len(self._buffer) + 1
+        if seq is None or not oldest <= seq <= self._id_counter:
+            # None, malformed, evicted or unknown - return all buffered events
+            return self._entries(len(self._buffer))
+        return self._entries(self._id_counter - seq)
 
     def clear(self) -> None:
-        """Clear all events from the buffer."""
+        """Clear all events from the buffer.
+
+        Event IDs keep counting up, so an ID issued before the clear can
+        never be mistaken for a later event.
+        """
         self._buffer.clear()
-        # Reset counter when clearing for cleaner IDs
-        self._id_counter = 0
+        self._blocks.clear()
+        self._block_versions.clear()
 
     def __len__(self) -> int:
         """Return the number of events currently in the buffer."""
@@ -87,10 +252,27 @@ class EventBufferManager:
 
     Creates and manages EventBuffer instances for each session,
     providing a unified interface for event storage and retrieval.
+
+    With ``log_dir`` set, each session also gets an ``EventLog`` in
+    ``log_dir/<session_id>``. A buffer created for a session that already
+    has a log continues its sequence numbers, so event IDs stay valid
+    across restarts, and replay from an ID older than the buffer streams
+    from the log. Snapshot buffers write their block table to the log as
+    a checkpoint whenever it starts a new segment; a buffer created for an
+    existing log restores the newest checkpoint and folds only the events
+    after it, so blocks added before retention trimmed the log are kept
+    and at most about one segment is decoded.
     """
 
     max_size_per_session: int = 20
+    compact: bool = False
+    snapshot: bool = False
+    log_dir: Path | None = None
+    log_segment_bytes: int = DEFAULT_SEGMENT_BYTES
+    log_max_bytes: int = DEFAULT_MAX_BYTES
+    log_max_age_seconds: float | None = DEFAULT_MAX_AGE_SECONDS
     _buffers: dict[str, EventBuffer] = field(default_factory=dict, repr=False)
+    _logs: dict[str, EventLog] = field(default_factory=dict, repr=False)
 
     def get_buffer(self, session_id: str) -> EventBuffer:
         """Get or create an EventBuffer for the given session.
@@ -102,11 +284,63 @@ class EventBufferManager:
             The EventBuffer for this session.
         """
         if session_id not in self._buffers:
-            self._buffers[session_id] = EventBuffer(max_size=self.max_size_per_session)
+            buffer = EventBuffer(
+                max_size=self.max_size_per_session,
+                compact=self.compact,
+                snapshot=self.snapshot,
+            )
+            log = self.get_log(session_id)
+            if log is not None:
+                buffer._id_counter = log.last_seq
+                if self.snapshot:
+                    self._restore_from_log(session_id, buffer, log)
+            self._buffers[session_id] = buffer
         return self._buffers[session_id]
 
+    def _restore_from_log(self, session_id: str, buffer: EventBuffer, log: EventLog) -> None:
+        """Rebuild a snapshot buffer's block table from the log's checkpoint and tail."""
+        seq = None
+        checkpoint = log.latest_checkpoint()
+        if checkpoint is not None:
+            try:
+                buffer._restore(checkpoint[1])
+                seq = checkpoint[0]
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Ignoring malformed event log checkpoint of {session_id}: {e}")
+                buffer._blocks.clear()
+                buffer._block_versions.clear()
+        if seq is None:
+            seq = log.first_seq - 1
+            if log.first_seq > 1:
+                logger.warning(
+                    f"Event log of {session_id} has no checkpoint; blocks added "
+                    f"before event {log.first_seq} are missing from its snapshot"
+                )
+        for _, event in log.iter_since(seq):
+            buffer._fold(event)
+
+    def get_log(self, session_id: str) -> EventLog | None:
+        """Get or open the EventLog for the given session.
+
+        Args:
+            session_id: The session identifier.
+
+        Returns:
+            The EventLog for this session, or None without a log_dir.
+        """
+        if self.log_dir is None:
+            return None
+        if session_id not in self._logs:
+            self._logs[session_id] = EventLog(
+                self.log_dir / _sanitize_session_id(session_id),
+                segment_bytes=self.log_segment_bytes,
+                max_bytes=self.log_max_bytes,
+                max_age_seconds=self.log_max_age_seconds,
+            )
+        return self._logs[session_id]
+
     def remove_buffer(self, session_id: str) -> None:
-        """Remove the EventBuffer for the given session.
+        """Remove the EventBuffer and delete the EventLog for the given session.
 
         Does nothing if the session doesn't have a buffer.
 
@@ -114,11 +348,19 @@ class EventBufferManager:
             session_id: The session identifier.
         """
         self._buffers.pop(session_id, None)
+        log = self._logs.pop(session_id, None)
+        if log is not None:
+            log.delete()
+        elif self.log_dir is not None:
+            shutil.rmtree(self.log_dir / _sanitize_session_id(session_id), ignore_errors=True)
 
     def add_event(self, session_id: str, event: Event) -> str:
         """Add an event to the specified session's buffer.
 
-        Creates a buffer for the session if one doesn't exist.
+        Creates a buffer for the session if one doesn't exist. When the
+        event starts a new log segment, a snapshot buffer's block table is
+        checkpointed. A failed write to the event log is logged and
+        otherwise ignored; the event is still buffered and broadcast.
 
         Args:
             session_id: The session identifier.
@@ -128,7 +370,15 @@ class EventBufferManager:
             The unique event ID.
         """
         buffer = self.get_buffer(session_id)
-        return buffer.add(event)
+        event_id = buffer.add(event)
+        log = self._logs.get(session_id)
+        if log is not None:
+            try:
+                if log.append(buffer._id_counter, event) and self.snapshot:
+                    log.write_checkpoint(buffer._id_counter, buffer._checkpoint())
+            except OSError as e:
+                logger.warning(f"Failed to append to event log of {session_id}: {e}")
+        return event_id
 
     def get_events_since(
         self, session_id: str, last_id: str | None
@@ -146,3 +396,94 @@ class EventBufferManager:
         if session_id not in self._buffers:
             return []
         return self._buffers[session_id].get_since(last_id)
+
+    def iter_events_since(
+        self, session_id: str, last_id: str | None
+    ) -> Iterator[tuple[str, Event]]:
+        """Iterate over a session's events after the given ID, reaching into the log.
+
+        Like get_events_since(), but an ID older than the buffer that the
+        event log still covers replays from the log, streaming from disk.
+        Events appended while iterating are not included.
+
+        Args:
+            session_id: The session identifier.
+            last_id: The last event ID the client received.
+
+        Yields:
+            (event_id, event) tuples for events after last_id.
+        """
+        seq = parse_event_id(last_id) if last_id is not None else None
+        log = self.get_log(session_id)
+        if seq is not None and log is not None:
+            buffer = self._buffers.get(session_id)
+            oldest = buffer._id_counter - len(buffer) + 1 if buffer else log.last_seq + 1
+            if seq < oldest and log.covers(seq):
+                for event_seq, event in log.iter_since(seq):
+                    yield format_event_id(event_seq), event
+                return
+        yield from self.get_events_since(session_id, last_id)
+
+    def iter_events(self, session_id: str) -> Iterator[tuple[str, Event]]:
+        """Iterate over all retained events of a session.
+
+        Streams the whole event log when there is one, otherwise yields
+        the buffered events.
+
+        Args:
+            session_id: The session identifier.
+
+        Yields:
+            (event_id, event) tuples, oldest first.
+        """
+        log = self.get_log(session_id)
+        if log is not None and len(log):
+            for seq, event in log.iter_since(log.first_seq - 1):
+                yield format_event_id(seq), event
+            return
+        yield from self.get_events_since(session_id, None)
+
+    def close(self) -> None:
+        """Close the append handles of all open event logs."""
+        for log in self._logs.values():
+            log.close()
+
+    def get_snapshot(self, session_id: str) -> BufferSnapshot:
+        """Return a session's current blocks.
+
+        In snapshot mode this reads the buffer's block table; otherwise
+        the retained events are folded on the fly, so blocks whose
+        AddBlock is no longer retained are missing.
+
+        Args:
+            session_id: The session identifier.
+
+        Returns:
+            The session's BufferSnapshot (empty for an unknown session).
+        """
+        if self.snapshot:
+            return self.get_buffer(session_id).get_snapshot()
+        folded = EventBuffer(max_size=0, snapshot=True)
+        last_id = None
+        for last_id, event in self.iter_events(session_id):
+            folded._fold(event)
+        snapshot = folded.get_snapshot()
+        snapshot.event_id = last_id
+        return snapshot
+
+    def get_state_events(self, session_id: str) -> list[Event]:
+        """Return events that rebuild a session's current state from scratch.
+
+        In snapshot mode these are AddBlocks for the snapshot's blocks, so
+        nothing is lost to eviction; otherwise all retained events.
+
+        Args:
+            session_id: The session identifier.
+
+        Returns:
+            List of events, in order.
+        """
+        buffer = self._buffers.get(session_id)
+        if self.snapshot and buffer is not None:
+            return [AddBlock(block=block) for block in buffer.get_snapshot().blocks]
+        return [event for _, event in self.iter_events(session_id)]
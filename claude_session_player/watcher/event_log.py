@@ -0,0 +1,374 @@
+"""Disk-backed append-only event log for deep SSE replay.
+
+The in-memory ``EventBuffer`` only holds the last few events of a session.
+An ``EventLog`` keeps every event on disk, as ``binary_codec.frame()``
+records of the event's ``to_dict()`` form, so that a client reconnecting
+after a long gap can resume from any event that is still retained.
+
+A log is a directory of segment files named after the sequence number of
+their first event (``00000000000000000001.seg``). Events are appended to
+the newest segment; when it reaches ``segment_bytes`` a new one is
+started. Each segment keeps an in-memory index from sequence number to
+byte offset (8 bytes per event), rebuilt by scanning the length prefixes
+when the log is opened. Retention drops whole segments, oldest first,
+while the log is larger than ``max_bytes`` or a segment's last write is
+older than ``max_age_seconds``; the newest segment is never dropped.
+
+Appends go through one handle kept open on the newest segment and flushed
+after every record, so readers always see whole records and an append
+costs no open/close; ``close()`` releases the handle.
+
+Replay streams frames from the segment files in fixed-size chunks, so its
+memory use does not grow with the size of the log.
+
+A log can also hold a checkpoint: an opaque record describing the state
+as of some sequence number (``00000000000000000041.ckpt``), written by the
+caller, typically when ``append()`` reports that a new segment started.
+Only the newest checkpoint is kept, and it is dropped once retention
+removes the events right after it, so a reader can always rebuild state
+from the checkpoint plus the events that follow it.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from claude_session_player import binary_codec
+from claude_session_player.events import Event, event_from_dict
+
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".seg"
+CHECKPOINT_SUFFIX = ".ckpt"
+
+# Defaults sized for long sessions: a few hours of heavy tool use fits in
+# the byte budget, and logs of idle sessions age out after a week.
+DEFAULT_SEGMENT_BYTES = 1024 * 1024
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+
+@dataclass(slots=True)
+class _Segment:
+    """One segment file and the byte offsets of its events."""
+
+    path: Path
+    first_seq: int
+    offsets: array = field(default_factory=lambda: array("Q"))
+    size: int = 0
+    mtime: float = 0.0
+
+    @property
+    def last_seq(self) -> int:
+        """Return the sequence number of the segment's newest event."""
+        return self.first_seq + len(self.offsets) - 1
+
+
+def _segment_path(directory: Path, first_seq: int) -> Path:
+    """Return the path of the segment whose first event is first_seq."""
+    return directory / f"{first_seq:020d}{SEGMENT_SUFFIX}"
+
+
+def _checkpoint_path(directory: Path, seq: int) -> Path:
+    """Return the path of the checkpoint taken as of seq."""
+    return directory / f"{seq:020d}{CHECKPOINT_SUFFIX}"
+
+
+def _scan_segment(path: Path, first_seq: int) -> _Segment:
+    """Index an existing segment file.
+
+    A truncated trailing frame (an append interrupted by a crash) is cut
+    off so the next append starts on a frame boundary.
+    """
+    data = path.read_bytes()
+    segment = _Segment(path=path, first_seq=first_seq, mtime=path.stat().st_mtime)
+    pos = 0
+    while pos < len(data):
+        try:
+            length, start = binary_codec._read_varint(data, pos)
+        except IndexError:
+            break
+        if start + length > len(data):
+            break
+        segment.offsets.append(pos)
+        pos = start + length
+    if pos < len(data):
+        logger.warning(f"Truncating partial record at end of event log segment {path}")
+        os.truncate(path, pos)
+    segment.size = pos
+    return segment
+
+
+class EventLog:
+    """Append-only segmented event log of one session.
+
+    Events are appended with the sequence number the session's
+    ``EventBuffer`` gave them. Sequence numbers within a segment are
+    contiguous; if an append skips numbers (e.g. after a failed write) a
+    new segment is started, and replay simply continues with it.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float | None = DEFAULT_MAX_AGE_SECONDS,
+    ) -> None:
+        """Open (or create) the log stored in directory.
+
+        Args:
+            directory: Directory holding the segment files.
+            segment_bytes: Size at which a new segment is started.
+            max_bytes: Total size above which old segments are dropped.
+            max_age_seconds: Age of the last write after which a segment is
+                dropped, or None to keep segments regardless of age.
+        """
+        self._directory = directory
+        self._segment_bytes = segment_bytes
+        self._max_bytes = max_bytes
+        self._max_age_seconds = max_age_seconds
+        self._segments: list[_Segment] = []
+        self._size_bytes = 0
+        # Append handle on the newest segment, opened on first append
+        self._handle: BinaryIO | None = None
+        # Sequence number of the newest checkpoint on disk, if any
+        self._checkpoint_seq: int | None = None
+
+        if directory.is_dir():
+            for path in sorted(directory.glob(f"*{SEGMENT_SUFFIX}")):
+                try:
+                    first_seq = int(path.stem)
+                except ValueError:
+                    continue
+                segment = _scan_segment(path, first_seq)
+                if segment.offsets:
+                    self._segments.append(segment)
+                    self._size_bytes += segment.size
+                else:
+                    path.unlink(missing_ok=True)
+            checkpoints = []
+            for path in directory.glob(f"*{CHECKPOINT_SUFFIX}"):
+                try:
+                    checkpoints.append(int(path.stem))
+                except ValueError:
+                    continue
+            if checkpoints:
+                self._checkpoint_seq = max(checkpoints)
+                self._remove_checkpoints(keep=self._checkpoint_seq)
+            self._enforce_retention()
+
+    @property
+    def directory(self) -> Path:
+        """Return the directory holding the segment files."""
+        return self._directory
+
+    @property
+    def first_seq(self) -> int:
+        """Return the sequence number of the oldest retained event (0 if empty)."""
+        return self._segments[0].first_seq if self._segments else 0
+
+    @property
+    def last_seq(self) -> int:
+        """Return the sequence number of the newest event (0 if empty)."""
+        return self._segments[-1].last_seq if self._segments else 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Return the total size of the retained segments."""
+        return self._size_bytes
+
+    def __len__(self) -> int:
+        """Return the number of retained events."""
+        return sum(len(segment.offsets) for segment in self._segments)
+
+    def append(self, seq: int, event: Event) -> bool:
+        """Append an event with its sequence number.
+
+        Args:
+            seq: The event's sequence number; must be greater than last_seq.
+            event: The event to append.
+
+        Returns:
+            True if the event started a new segment.
+
+        Raises:
+            ValueError: If seq is not greater than last_seq.
+            OSError: If the segment file cannot be written.
+        """
+        if seq <= self.last_seq:
+            raise ValueError(f"event log sequence must increase: {seq} <= {self.last_seq}")
+        record = binary_codec.frame(event.to_dict())
+
+        segment = self._segments[-1] if self._segments else None
+        new_segment = (
+            segment is None or segment.last_seq + 1 != seq or segment.size >= self._segment_bytes
+        )
+        if new_segment:
+            self.close()
+            self._directory.mkdir(parents=True, exist_ok=True)
+            segment = _Segment(path=_segment_path(self._directory, seq), first_seq=seq)
+            self._segments.append(segment)
+
+        try:
+            if self._handle is None:
+                self._handle = open(segment.path, "ab")
+            self._handle.write(record)
+            self._handle.flush()
+        except OSError:
+            # Not indexed; the next append skips this seq and so starts a
+            # new segment after whatever part of the record was written
+            handle, self._handle = self._handle, None
+            if handle is not None:
+                with contextlib.suppress(OSError):
+                    handle.close()
+            if not segment.offsets:
+                self._segments.pop()
+                segment.path.unlink(missing_ok=True)
+            raise
+        segment.offsets.append(segment.size)
+        segment.size += len(record)
+        segment.mtime = time.time()
+        self._size_bytes += len(record)
+
+        self._enforce_retention()
+        return new_segment
+
+    def covers(self, seq: int) -> bool:
+        """Return whether replay can resume after seq.
+
+        True if seq is the newest event or the event right after it is
+        retained.
+        """
+        return bool(self._segments) and self.first_seq - 1 <= seq <= self.last_seq
+
+    def iter_since(self, seq: int) -> Iterator[tuple[int, Event]]:
+        """Yield (sequence number, event) for the retained events after seq.
+
+        Events appended while the iterator is consumed are not included.
+        Segments are read in chunks, never as a whole.
+
+        Args:
+            seq: The last sequence number the caller has; events before the
+                oldest retained one are skipped.
+        """
+        segments = list(self._segments)
+        last_seq = self.last_seq
+        index = max(bisect.bisect_right([s.first_seq for s in segments], seq + 1) - 1, 0)
+        for segment in segments[index:]:
+            start = max(seq + 1, segment.first_seq)
+            end = min(segment.last_seq, last_seq)
+            if start > end:
+                continue
+            try:
+                f = open(segment.path, "rb")
+            except FileNotFoundError:
+                continue  # dropped by retention while replaying
+            with f:
+                f.seek(segment.offsets[start - segment.first_seq])
+                frames = islice(binary_codec.iter_frames(f), end - start + 1)
+                for offset, data in enumerate(frames):
+                    yield start + offset, event_from_dict(data)
+
+    def write_checkpoint(self, seq: int, data: Any) -> None:
+        """Store a checkpoint of the state as of seq, replacing older ones.
+
+        The checkpoint is written atomically; a failed write leaves the
+        previous checkpoint in place.
+
+        Args:
+            seq: The sequence number of the newest event reflected in data;
+                must be covered by the log.
+            data: The checkpoint, anything ``binary_codec`` can encode.
+
+        Raises:
+            ValueError: If the log does not cover seq.
+            OSError: If the checkpoint file cannot be written.
+        """
+        if not self.covers(seq):
+            raise ValueError(f"event log does not cover checkpoint sequence {seq}")
+        path = _checkpoint_path(self._directory, seq)
+        fd, temp_path = tempfile.mkstemp(
+            dir=self._directory,
+            prefix=".ckpt_",
+            suffix=f"{CHECKPOINT_SUFFIX}.tmp",
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(binary_codec.dumps(data))
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        self._checkpoint_seq = seq
+        self._remove_checkpoints(keep=seq)
+
+    def latest_checkpoint(self) -> tuple[int, Any] | None:
+        """Return (sequence number, data) of the newest usable checkpoint.
+
+        Returns:
+            The checkpoint, or None if there is none or it cannot be read.
+        """
+        seq = self._checkpoint_seq
+        if seq is None or not self.covers(seq):
+            return None
+        path = _checkpoint_path(self._directory, seq)
+        try:
+            return seq, binary_codec.loads(path.read_bytes())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable event log checkpoint {path}: {e}")
+            return None
+
+    def _remove_checkpoints(self, keep: int | None = None) -> None:
+        """Delete the checkpoint files, except the one as of keep."""
+        kept = _checkpoint_path(self._directory, keep) if keep is not None else None
+        for path in self._directory.glob(f"*{CHECKPOINT_SUFFIX}"):
+            if path != kept:
+                path.unlink(missing_ok=True)
+
+    def _enforce_retention(self) -> None:
+        """Drop the oldest segments while over the size or age limit."""
+        now = time.time()
+        while len(self._segments) > 1:
+            oldest = self._segments[0]
+            too_big = self._size_bytes > self._max_bytes
+            too_old = (
+                self._max_age_seconds is not None
+                and now - oldest.mtime > self._max_age_seconds
+            )
+            if not (too_big or too_old):
+                break
+            self._segments.pop(0)
+            self._size_bytes -= oldest.size
+            oldest.path.unlink(missing_ok=True)
+        if self._checkpoint_seq is not None and not self.covers(self._checkpoint_seq):
+            self._checkpoint_seq = None
+            self._remove_checkpoints()
+
+    def close(self) -> None:
+        """Close the append handle; the next append reopens it."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def delete(self) -> None:
+        """Delete the log and its directory."""
+        self.close()
+        self._segments.clear()
+        self._size_bytes = 0
+        self._checkpoint_seq = None
+        shutil.rmtree(self._directory, ignore_errors=True)
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
@@ -11,6 +10,10 @@ from pathlib import Path
 
 from watchfiles import Change, awatch
 
+from claude_session_player import json_codec
+from claude_session_player.line_index import LineIndex
+from claude_session_player.parser import is_invisible_raw
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +27,12 @@ class IncrementalReader:
 
     path: Path
     position: int = 0
+    index_dir: Path | None = None
+    skip_invisible: bool = False  # drop INVISIBLE lines before decoding them
+    # Non-empty lines the last read_new_lines() consumed but didn't return
+    # (invisible or malformed)
+    lines_skipped: int = 0
+    _line_index: LineIndex | None = field(default=None, repr=False)
 
     def read_new_lines(self) -> tuple[list[dict], int]:
         """Read new lines from the file starting at saved position.
@@ -31,11 +40,15 @@ class IncrementalReader:
         Returns:
             Tuple of (parsed lines, new position).
             Lines that fail JSON parsing are skipped with a warning.
+            With ``skip_invisible``, lines that can never render are
+            dropped without being decoded. ``lines_skipped`` is set to the
+            number of non-empty lines consumed but not returned.
 
         Notes:
             - Handles partial lines at EOF by not consuming incomplete JSON
             - Handles file truncation by resetting position to 0
         """
+        self.lines_skipped = 0
         try:
             file_size = self.path.stat().st_size
         except FileNotFoundError:
@@ -58,39 +71,29 @@ class IncrementalReader:
             f.seek(self.position)
             raw_data = f.read()
 
-        # Decode to string, handling potential encoding issues
-        try:
-            text = raw_data.decode("utf-8")
-        except UnicodeDecodeError:
-            logger.warning(f"Unicode decode error in {self.path}, skipping chunk")
-            # Move position to end to avoid getting stuck
-            return [], file_size
-
-        # Split into lines but keep track of whether last line is complete
-        lines = text.split("\n")
-        parsed_lines: list[dict] = []
-
-        # If the text doesn't end with newline, the last line is incomplete
+        # If the data doesn't end with a newline, the last line is incomplete.
         # We should not process it yet
-        if text and not text.endswith("\n"):
-            incomplete_line = lines[-1]
-            lines = lines[:-1]
-            # Adjust position to not include the incomplete line
-            bytes_consumed = len(text.encode("utf-8")) - len(incomplete_line.encode("utf-8"))
-        else:
-            bytes_consumed = len(raw_data)
+        bytes_consumed = raw_data.rfind(b"\n") + 1
+        parsed_lines: list[dict] = []
 
-        for line in lines:
-            line = line.strip()
-            if not line:
+        for raw_line in raw_data[:bytes_consumed].split(b"\n"):
+            if not raw_line.strip():
                 # Skip empty lines
                 continue
 
+            if self.skip_invisible and is_invisible_raw(raw_line):
+                self.lines_skipped += 1
+                continue
+
             try:
-                parsed = json.loads(line)
+                parsed = json_codec.loads(raw_line)
                 parsed_lines.append(parsed)
-            except json.JSONDecodeError as e:
+            except UnicodeDecodeError:
+                logger.warning(f"Unicode decode error in {self.path}, skipping line")
+                self.lines_skipped += 1
+            except ValueError as e:
                 logger.warning(f"Malformed JSON in {self.path}: {e}")
+                self.lines_skipped += 1
                 # Skip malformed lines
 
         new_position = self.position + bytes_consumed
@@ -101,6 +104,10 @@ class IncrementalReader:
         """Seek to the position of the nth-to-last line in the file.
 
         Used for initial watch to get some context without reading entire file.
+        Line positions come from the file's persistent LineIndex, so only
+        bytes appended since the index was last refreshed are scanned. A
+        trailing line without a newline counts as the last line, even
+        though the index only holds complete lines.
 
         Args:
             n: Number of lines from the end to seek to.
@@ -110,49 +117,39 @@ class IncrementalReader:
             Returns 0 if file has fewer than n lines.
         """
         try:
-            file_size = self.path.stat().st_size
+            if self._line_index is None:
+                self._line_index = LineIndex.open(self.path, index_dir=self.index_dir)
+            else:
+                self._line_index.refresh()
         except FileNotFoundError:
             return 0
 
-        if file_size == 0:
-            return 0
-
-        # Read the entire file to find line positions
-        # For very large files, a chunked approach would be better,
-        # but for typical JSONL session files this is fine
-        with open(self.path, "rb") as f:
-            content = f.read()
-
-        try:
-            text = content.decode("utf-8")
-        except UnicodeDecodeError:
-            logger.warning(f"Unicode decode error in {self.path}")
-            return file_size
-
-        # Find all line endings
-        lines = text.split("\n")
-
-        # Filter out empty lines and count real lines
-        non_empty_indices: list[int] = []
-        current_pos = 0
-        for i, line in enumerate(lines):
-            if line.strip():
-                non_empty_indices.append(current_pos)
-            # Account for the newline character except for the last segment
-            current_pos += len(line.encode("utf-8"))
-            if i < len(lines) - 1:
-                current_pos += 1  # newline byte
-
-        if len(non_empty_indices) <= n:
+        index = self._line_index
+        partial = self._has_partial_line(index.indexed_size)
+        if index.line_count + partial <= n:
             # File has n or fewer lines, start from beginning
             return 0
 
-        # Get position of nth-to-last line
-        target_index = len(non_empty_indices) - n
-        position = non_empty_indices[target_index]
+        if partial and n > 0:
+            n -= 1
+            position = index.indexed_size if n == 0 else index.offset_of_last_lines(n)
+        else:
+            position = index.offset_of_last_lines(n)
         self.position = position
         return position
 
+    def _has_partial_line(self, offset: int) -> bool:
+        """Return whether the file has a non-blank unterminated line at offset."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                while chunk := f.read(64 * 1024):
+                    if chunk.strip():
+                        return True
+        except FileNotFoundError:
+            pass
+        return False
+
 
 @dataclass
 class WatchedFile:
@@ -173,6 +170,8 @@ class FileWatcher:
 
     on_lines_callback: Callable[[str, list[dict]], Awaitable[None]]
     on_file_deleted_callback: Callable[[str], Awaitable[None]] | None = None
+    index_dir: Path | None = None  # where LineIndex sidecars are stored (None: default)
+    skip_invisible: bool = False  # passed to each IncrementalReader
 
     _watched_files: dict[str, WatchedFile] = field(default_factory=dict)
     _path_to_session: dict[Path, str] = field(default_factory=dict)
@@ -192,7 +191,12 @@ class FileWatcher:
             If watching is already started, the new file will be picked up
             on the next watch iteration.
         """
-        reader = IncrementalReader(path=path, position=start_position)
+        reader = IncrementalReader(
+            path=path,
+            position=start_position,
+            index_dir=self.index_dir,
+            skip_invisible=self.skip_invisible,
+        )
         watched = WatchedFile(session_id=session_id, path=path, reader=reader)
 
         self._watched_files[session_id] = watched
@@ -224,6 +228,23 @@ class FileWatcher:
             return self._watched_files[session_id].reader.position
         return None
 
+    def get_lines_skipped(self, session_id: str) -> int:
+        """Get the number of lines skipped by the read being handled.
+
+        Only meaningful inside on_lines_callback: counts the non-empty lines
+        the read consumed without passing them on (invisible or malformed),
+        and is 0 outside the callback.
+
+        Args:
+            session_id: Identifier of the session.
+
+        Returns:
+            Number of skipped lines (0 if session not found).
+        """
+        if session_id in self._watched_files:
+            return self._watched_files[session_id].reader.lines_skipped
+        return 0
+
     @property
     def is_running(self) -> bool:
         """Return whether the watcher is currently running."""
@@ -350,11 +371,24 @@ class FileWatcher:
             watched = self._watched_files[session_id]
             try:
                 lines, new_position = watched.reader.read_new_lines()
-                if lines:
-                    await self.on_lines_callback(session_id, lines)
+                await self._deliver(watched, lines)
             except Exception as e:
                 logger.error(f"Error processing changes for {session_id}: {e}")
 
+    async def _deliver(self, watched: WatchedFile, lines: list[dict]) -> None:
+        """Pass lines read from a file to the callback.
+
+        Also called when every line was skipped, so the callback can record
+        the new position.
+        """
+        reader = watched.reader
+        if not lines and not reader.lines_skipped:
+            return
+        try:
+            await self.on_lines_callback(watched.session_id, lines)
+        finally:
+            reader.lines_skipped = 0
+
     async def process_initial(self, session_id: str, last_n_lines: int = 3) -> None:
         """Process the last N lines of a newly added file.
 
@@ -371,5 +405,4 @@ class FileWatcher:
         watched.reader.seek_to_last_n_lines(last_n_lines)
 
         lines, _ = watched.reader.read_new_lines()
-        if lines:
-            await self.on_lines_callback(session_id, lines)
+        await self._deliver(watched, lines)
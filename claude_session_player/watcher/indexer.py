@@ -22,6 +22,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from claude_session_player import json_codec
+from claude_session_player.parser import peek_line_type
+
 if TYPE_CHECKING:
     from claude_session_player.watcher.search_db import (
         IndexedSession,
@@ -32,6 +35,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Raw-bytes marker present in every summary line
+_SUMMARY_TOKEN = b'"summary"'
+
 
 # ---------------------------------------------------------------------------
 # Path encoding/decoding functions
@@ -134,7 +140,9 @@ def extract_session_metadata(file_path: Path) -> tuple[str | None, int]:
     """Extract summary and line count from a session file.
 
     Reads the file once, returns (latest_summary, line_count).
-    Uses string search before JSON parsing for speed.
+    Lines are counted as raw bytes; lines whose top-level type is known
+    (via ``peek_line_type``) to be something other than ``summary`` are
+    never decoded.
 
     Args:
         file_path: Path to the session JSONL file.
@@ -146,17 +154,20 @@ def extract_session_metadata(file_path: Path) -> tuple[str | None, int]:
     line_count = 0
 
     try:
-        with open(file_path, encoding="utf-8") as f:
+        with open(file_path, "rb") as f:
             for line in f:
                 line_count += 1
-                # Quick check before JSON parsing
-                if '"type":"summary"' in line or '"type": "summary"' in line:
-                    try:
-                        data = json.loads(line)
-                        if data.get("type") == "summary":
-                            summary = data.get("summary")
-                    except json.JSONDecodeError:
-                        pass
+                # Quick checks before JSON parsing
+                if _SUMMARY_TOKEN not in line:
+                    continue
+                if peek_line_type(line) not in ("summary", None):
+                    continue
+                try:
+                    data = json_codec.loads(line)
+                    if isinstance(data, dict) and data.get("type") == "summary":
+                        summary = data.get("summary")
+                except ValueError:
+                    pass
     except OSError as e:
         logger.warning(f"Failed to read {file_path}: {e}")
         return None, 0
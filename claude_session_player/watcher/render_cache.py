@@ -1,12 +1,17 @@
-"""Render cache for pre-rendered session screens.
+"""Render cache for rendered session screens.
 
-This module provides a per-session cache that stores pre-rendered terminal-style
-output for both desktop and mobile presets. The cache supports TTL-based eviction
-and integrates with the ScreenRenderer for rendering.
+This module provides a per-session cache that stores rendered terminal-style
+output for the desktop and mobile presets and for custom sizes. The cache
+supports TTL-based eviction and integrates with the ScreenRenderer for rendering.
 
 Features:
-- Pre-render desktop (40x80) and mobile (25x60) versions per session
-- TTL-based eviction (30 minutes since last update)
+- Lazy rendering: a preset (desktop 40x80, mobile 25x60) or custom size is
+  rendered only when requested, then cached until the session changes
+- Incremental updates: each session keeps an IncrementalScreenRenderer, so
+  new events are applied without replaying the session
+- Byte budget with least-recently-used eviction (64 MiB by default)
+- TTL-based eviction (30 minutes since last update) as a secondary policy
+- Hit/miss/eviction counters and per-session sizes via stats()
 - Background task for periodic eviction
 - Thread-safe session management
 """
@@ -15,12 +20,19 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import sys
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Literal
 
 from ..events import Event
-from .screen_renderer import Preset, ScreenRenderer
+from .screen_renderer import (
+    PRESET_DIMENSIONS,
+    IncrementalScreenRenderer,
+    Preset,
+    ScreenRenderer,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -33,89 +45,245 @@ DEFAULT_TTL_SECONDS = 30 * 60
 # Default eviction check interval: 5 minutes
 DEFAULT_EVICTION_INTERVAL_SECONDS = 5 * 60
 
+# Default memory budget across all sessions: 64 MiB
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
 
 @dataclass
 class CachedRender:
-    """Holds pre-rendered content for both presets.
+    """Holds a session's render state and the frames rendered from it.
 
     Attributes:
-        desktop: Pre-rendered desktop content (40x80 chars).
-        mobile: Pre-rendered mobile content (25x60 chars).
-        last_updated: Timestamp (monotonic) of last rebuild.
+        screen: Incremental render state of the session.
+        last_updated: Timestamp (monotonic) of last rebuild or update.
+        frames: Rendered content by (rows, cols), valid for
+            ``frames_version``; frames of older versions are dropped on
+            the next request.
+        frames_version: The ``screen.version`` the frames were rendered at.
     """
 
-    desktop: str
-    mobile: str
+    screen: IncrementalScreenRenderer
     last_updated: float
+    frames: dict[tuple[int, int], str] = field(default_factory=dict, repr=False)
+    frames_version: int = 0
+    _frame_bytes: int = field(default=0, repr=False)
+
+    @property
+    def size_bytes(self) -> int:
+        """Return the approximate memory held by the state and frames."""
+        return self.screen.size_bytes + self._frame_bytes
+
+    def clear_frames(self) -> None:
+        """Drop all rendered frames."""
+        self.frames.clear()
+        self._frame_bytes = 0
+
+    def has_frame(self, rows: int, cols: int) -> bool:
+        """Return True if a current frame of the given size is cached."""
+        return self.frames_version == self.screen.version and (rows, cols) in self.frames
+
+    def frame(self, rows: int, cols: int) -> str:
+        """Return the frame for the given size, rendering it if needed."""
+        if self.frames_version != self.screen.version:
+            self.clear_frames()
+            self.frames_version = self.screen.version
+        key = (rows, cols)
+        content = self.frames.get(key)
+        if content is None:
+            content = self.screen.render(rows=rows, cols=cols)
+            self.frames[key] = content
+            self._frame_bytes += sys.getsizeof(content)
+        return content
 
 
 @dataclass
 class RenderCache:
-    """Per-session render cache with TTL-based eviction.
+    """Per-session render cache with a byte budget and TTL-based eviction.
+
+    This cache keeps each session's render state and renders frames on
+    demand, keyed by (session, dimensions, event version): only presets
+    or sizes that are actually requested are rendered, at most once per
+    session change.
 
-    This cache stores pre-rendered terminal-style output for sessions,
-    supporting both desktop and mobile presets. A background task
-    periodically checks for and evicts stale entries.
+    Whenever a session grows (rebuild, update or a newly rendered frame),
+    least recently used sessions are evicted until the approximate total
+    size fits ``max_bytes``; the session just used is never evicted, so a
+    single session larger than the budget still works. Sizes are kept as
+    a running total adjusted by each change, so enforcing the budget does
+    not walk the cached sessions. A background task
+    additionally evicts entries not updated within the TTL.
 
     Attributes:
         ttl_seconds: Time-to-live in seconds (default: 1800 = 30 minutes).
         eviction_interval_seconds: Interval between eviction checks (default: 300 = 5 minutes).
+        max_bytes: Memory budget across all sessions (default: 64 MiB);
+            None disables the budget.
     """
 
     ttl_seconds: float = DEFAULT_TTL_SECONDS
     eviction_interval_seconds: float = DEFAULT_EVICTION_INTERVAL_SECONDS
-
-    _cache: dict[str, CachedRender] = field(default_factory=dict, repr=False)
+    max_bytes: int | None = DEFAULT_MAX_BYTES
+
+    # Least recently used first
+    _cache: OrderedDict[str, CachedRender] = field(default_factory=OrderedDict, repr=False)
+    _hits: int = field(default=0, repr=False)
+    _misses: int = field(default=0, repr=False)
+    _evictions: int = field(default=0, repr=False)
+    _expirations: int = field(default=0, repr=False)
+    # Sum of the size_bytes of the cached sessions
+    _total_bytes: int = field(default=0, repr=False)
     _renderer: ScreenRenderer = field(default_factory=ScreenRenderer, repr=False)
     _eviction_task: asyncio.Task[None] | None = field(default=None, repr=False)
     _running: bool = field(default=False, repr=False)
 
     def rebuild(self, session_id: str, events: list[Event]) -> None:
-        """Rebuild the cache for a session by pre-rendering both presets.
+        """Rebuild the render state for a session from its events.
 
-        This method renders the events to terminal-style text for both
-        desktop (40x80) and mobile (25x60) presets and stores them in
-        the cache with a fresh timestamp.
+        Replaces any cached state and frames of the session and refreshes
+        its timestamp. Frames are rendered when first requested.
 
         Args:
             session_id: The session identifier.
             events: List of events to render.
         """
-        desktop_content = self._renderer.render(events, preset=Preset.DESKTOP)
-        mobile_content = self._renderer.render(events, preset=Preset.MOBILE)
-
-        self._cache[session_id] = CachedRender(
-            desktop=desktop_content,
-            mobile=mobile_content,
-            last_updated=time.monotonic(),
-        )
+        screen = IncrementalScreenRenderer(self._renderer)
+        screen.apply(events)
+        self._remove(session_id)
+        cached = CachedRender(screen=screen, last_updated=time.monotonic())
+        self._cache[session_id] = cached
+        self._total_bytes += cached.size_bytes
+        self._enforce_budget()
 
         logger.debug(
             "Rebuilt render cache",
             extra={
                 "session_id": session_id,
-                "desktop_len": len(desktop_content),
-                "mobile_len": len(mobile_content),
+                "event_count": len(events),
+                "block_count": len(screen.blocks),
             },
         )
 
+    def update(self, session_id: str, events: list[Event]) -> bool:
+        """Apply new events to a cached session's render state.
+
+        Costs time proportional to the new events, not to the session
+        length; frames are re-rendered when next requested.
+
+        Args:
+            session_id: The session identifier.
+            events: Events since the last rebuild or update, in order.
+
+        Returns:
+            True if the session was updated; False if it has no incremental
+            state (not cached), in which case the caller should ``rebuild()``
+            it from the full event list.
+        """
+        cached = self._cache.get(session_id)
+        if cached is None:
+            return False
+
+        size_before = cached.size_bytes
+        cached.screen.apply(events)
+        cached.clear_frames()  # stale; re-rendered on request
+        self._total_bytes += cached.size_bytes - size_before
+        cached.last_updated = time.monotonic()
+        self._cache.move_to_end(session_id)
+        self._enforce_budget()
+        return True
+
     def get(self, session_id: str, preset: PresetName) -> str | None:
-        """Retrieve cached pre-rendered content for a session and preset.
+        """Retrieve rendered content for a session and preset.
+
+        The preset is rendered on first request after each change.
 
         Args:
             session_id: The session identifier.
             preset: The preset to retrieve ("desktop" or "mobile").
 
         Returns:
-            The pre-rendered content string, or None if not cached.
+            The rendered content string, or None if not cached.
+        """
+        dims = PRESET_DIMENSIONS[Preset.DESKTOP if preset == "desktop" else Preset.MOBILE]
+        return self.get_frame(session_id, dims.rows, dims.cols)
+
+    def get_frame(self, session_id: str, rows: int, cols: int) -> str | None:
+        """Retrieve rendered content for a session at a custom size.
+
+        The size is rendered on first request after each change.
+
+        Args:
+            session_id: The session identifier.
+            rows: Number of rows, including borders.
+            cols: Number of columns, including borders.
+
+        Returns:
+            The rendered content string, or None if not cached.
         """
         cached = self._cache.get(session_id)
         if cached is None:
+            self._misses += 1
             return None
 
-        if preset == "desktop":
-            return cached.desktop
-        return cached.mobile
+        self._cache.move_to_end(session_id)
+        if cached.has_frame(rows, cols):
+            self._hits += 1
+            return cached.frame(rows, cols)
+
+        self._misses += 1
+        size_before = cached.size_bytes
+        content = cached.frame(rows, cols)
+        self._total_bytes += cached.size_bytes - size_before
+        self._enforce_budget()
+        return content
+
+    def stats(self) -> dict:
+        """Return cache size and counters.
+
+        Returns:
+            Dict with the session count, approximate total and per-session
+            sizes in bytes, the budget, and hit/miss/eviction (budget) and
+            expiration (TTL) counters.
+        """
+        session_bytes = {session_id: cached.size_bytes for session_id, cached in self._cache.items()}
+        return {
+            "sessions": len(self._cache),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "session_bytes": session_bytes,
+        }
+
+    def _enforce_budget(self) -> None:
+        """Evict least recently used sessions until the cache fits max_bytes.
+
+        The most recently used session is always kept.
+        """
+        if self.max_bytes is None:
+            return
+
+        while self._total_bytes > self.max_bytes and len(self._cache) > 1:
+            session_id = next(iter(self._cache))
+            self._remove(session_id)
+            self._evictions += 1
+            logger.debug(
+                "Evicted least recently used session from render cache",
+                extra={"session_id": session_id, "total_bytes": self._total_bytes},
+            )
+
+    def _remove(self, session_id: str) -> bool:
+        """Remove a session and its size from the cache.
+
+        Returns:
+            True if the session was cached.
+        """
+        cached = self._cache.pop(session_id, None)
+        if cached is None:
+            return False
+        self._total_bytes -= cached.size_bytes
+        return True
 
     def evict(self, session_id: str) -> None:
         """Remove a session from the cache.
@@ -125,8 +293,7 @@ class RenderCache:
         Args:
             session_id: The session identifier to evict.
         """
-        if session_id in self._cache:
-            del self._cache[session_id]
+        if self._remove(session_id):
             logger.debug("Evicted session from render cache", extra={"session_id": session_id})
 
     def get_last_updated(self, session_id: str) -> float | None:
@@ -162,6 +329,7 @@ class RenderCache:
         """Clear all entries from the cache."""
         count = len(self._cache)
         self._cache.clear()
+        self._total_bytes = 0
         logger.debug("Cleared render cache", extra={"evicted_count": count})
 
     async def start(self) -> None:
@@ -230,7 +398,8 @@ class RenderCache:
         ]
 
         for session_id in stale_sessions:
-            del self._cache[session_id]
+            self._remove(session_id)
+        self._expirations += len(stale_sessions)
 
         if stale_sessions:
             logger.info(
@@ -2,10 +2,13 @@
 
 This module provides the ScreenRenderer class that takes events and produces
 a terminal-style preformatted text output, constrained to configurable dimensions.
+IncrementalScreenRenderer keeps the rendered state of one session and applies
+new events as they arrive, so producing a frame does not replay the session.
 """
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from enum import Enum
 
@@ -13,9 +16,11 @@ from ..events import (
     AddBlock,
     AssistantContent,
     Block,
+    BlockContent,
     ClearAll,
     DurationContent,
     Event,
+    PatchBlock,
     QuestionContent,
     SystemContent,
     ThinkingContent,
@@ -47,6 +52,18 @@ PRESET_DIMENSIONS: dict[Preset, Dimensions] = {
     Preset.MOBILE: Dimensions(rows=25, cols=60),
 }
 
+# Approximate memory of a block and its content objects, excluding text
+BLOCK_OVERHEAD_BYTES = 200
+
+
+def _content_bytes(content: BlockContent) -> int:
+    """Return the approximate memory of a block content's text fields."""
+    if isinstance(content, ToolCallContent):
+        texts = (content.label, content.result, content.progress_text)
+        return sum(sys.getsizeof(text) for text in texts if text is not None)
+    text = getattr(content, "text", None)
+    return sys.getsizeof(text) if text is not None else 0
+
 
 class ScreenRenderer:
     """Renders session events to terminal-style text output.
@@ -54,6 +71,12 @@ class ScreenRenderer:
     The renderer takes a list of events and produces a string that looks like
     terminal output, constrained to configurable dimensions with box-drawing
     borders.
+
+    Only the bottom of the conversation is visible, so blocks are formatted
+    from the newest backwards until the viewport is full: the cost of a
+    frame depends on its size, not on the length of the session. To follow
+    a growing session, keep an IncrementalScreenRenderer instead of
+    re-rendering its whole event list.
     """
 
     # Box drawing characters
@@ -85,103 +108,25 @@ class ScreenRenderer:
         Raises:
             ValueError: If neither preset nor rows/cols are provided.
         """
-        # Determine dimensions
-        if rows is not None and cols is not None:
-            dims = Dimensions(rows=rows, cols=cols)
-        elif preset is not None:
-            dims = PRESET_DIMENSIONS[preset]
-        else:
-            raise ValueError("Must provide either preset or rows/cols")
-
-        # Build blocks from events
-        blocks = self._build_blocks(events)
-
-        # Render blocks to lines
-        content_lines = self._render_blocks_to_lines(blocks)
-
-        # Apply viewport (show last N lines that fit)
-        # Account for top and bottom borders
-        available_rows = dims.rows - 2
-        viewport_lines = content_lines[-available_rows:] if content_lines else []
-
-        # Wrap/truncate lines to fit column width
-        # Account for left and right borders
-        inner_width = dims.cols - 2
-        wrapped_lines = self._wrap_lines(viewport_lines, inner_width)
-
-        # Re-apply viewport after wrapping (wrapping may create more lines)
-        viewport_lines = wrapped_lines[-available_rows:] if wrapped_lines else []
-
-        # Pad to fill available rows
-        while len(viewport_lines) < available_rows:
-            viewport_lines.append("")
-
-        # Build framed output
-        return self._build_frame(viewport_lines, dims)
+        screen = IncrementalScreenRenderer(self)
+        screen.apply(events)
+        return screen.render(preset=preset, rows=rows, cols=cols)
 
     def _build_blocks(self, events: list[Event]) -> list[Block]:
         """Build block list from events.
 
+        Updates and patches for blocks not added in ``events`` are ignored,
+        as are patches made against a different block version.
+
         Args:
             events: List of events to process.
 
         Returns:
             List of blocks.
         """
-        blocks: list[Block] = []
-        block_index: dict[str, int] = {}
-
-        for event in events:
-            if isinstance(event, AddBlock):
-                block_index[event.block.id] = len(blocks)
-                blocks.append(event.block)
-            elif isinstance(event, UpdateBlock):
-                if event.block_id in block_index:
-                    idx = block_index[event.block_id]
-                    old_block = blocks[idx]
-                    blocks[idx] = Block(
-                        id=old_block.id,
-                        type=old_block.type,
-                        content=event.content,
-                        request_id=old_block.request_id,
-                    )
-            elif isinstance(event, ClearAll):
-                blocks.clear()
-                block_index.clear()
-
-        return blocks
-
-    def _render_blocks_to_lines(self, blocks: list[Block]) -> list[str]:
-        """Render blocks to a list of lines.
-
-        Args:
-            blocks: List of blocks to render.
-
-        Returns:
-            List of lines (without newlines).
-        """
-        lines: list[str] = []
-        prev_request_id: str | None = None
-
-        for block in blocks:
-            formatted = self._format_block(block)
-            if not formatted:
-                continue
-
-            current_rid = block.request_id
-
-            # Insert blank line separator unless both previous and current
-            # share the same non-None request_id
-            if lines and not (
-                prev_request_id and current_rid and prev_request_id == current_rid
-            ):
-                lines.append("")
-
-            # Split formatted text into lines
-            lines.extend(formatted.split("\n"))
-            prev_request_id = current_rid
-
-        return lines
+        screen = IncrementalScreenRenderer(self)
+        screen.apply(events)
+        return screen.blocks
 
     def _format_block(self, block: Block) -> str:
         """Format a single block as plain text.
@@ -271,26 +216,11 @@ class ScreenRenderer:
 
         return "\n\n".join(parts)
 
-    def _wrap_lines(self, lines: list[str], width: int) -> list[str]:
-        """Wrap or truncate lines to fit within width.
-
-        Args:
-            lines: List of lines to wrap.
-            width: Maximum line width.
-
-        Returns:
-            List of lines, each no longer than width.
-        """
-        result: list[str] = []
-
-        for line in lines:
-            if len(line) <= width:
-                result.append(line)
-            else:
-                # Truncate with ellipsis
-                result.append(line[: width - 1] + "…")
-
-        return result
+    def _fit_line(self, line: str, width: int) -> str:
+        """Truncate a line with an ellipsis if it is longer than width."""
+        if len(line) <= width:
+            return line
+        return line[: width - 1] + "…"
 
     def _build_frame(self, lines: list[str], dims: Dimensions) -> str:
         """Build the framed output with box-drawing borders.
@@ -321,6 +251,183 @@ class ScreenRenderer:
         return "\n".join(result)
 
 
+class IncrementalScreenRenderer:
+    """Rendered screen state of one session, updated event by event.
+
+    Keeps the block list and, per block, its formatted lines. ``apply()``
+    costs time proportional to the new events, and ``render()`` formats
+    (and caches) lines only for blocks that changed and are visible, then
+    fits the bottom of the conversation into the frame. Frames for any
+    dimensions come from the same state.
+
+    Attributes:
+        blocks: Current blocks, oldest first.
+        version: Number of events applied so far.
+        size_bytes: Approximate memory held by the blocks and cached lines.
+    """
+
+    def __init__(self, renderer: ScreenRenderer | None = None) -> None:
+        """Initialize an empty screen.
+
+        Args:
+            renderer: Renderer providing block formatting and framing.
+        """
+        self._renderer = renderer if renderer is not None else ScreenRenderer()
+        self.blocks: list[Block] = []
+        self.version = 0
+        self.size_bytes = 0
+        self._block_index: dict[str, int] = {}  # block_id → index in blocks
+        self._block_versions: dict[str, int] = {}  # block_id → updates applied
+        # Per block: formatted lines, None until formatted or after a change
+        self._lines: list[list[str] | None] = []
+        # Per block: approximate bytes counted in size_bytes
+        self._block_bytes: list[int] = []
+
+    def apply(self, events: list[Event]) -> None:
+        """Apply events to the screen state.
+
+        Updates and patches for blocks that were never added are ignored,
+        as are patches made against a different block version.
+
+        Args:
+            events: New events, in order.
+        """
+        for event in events:
+            self.version += 1
+            if isinstance(event, AddBlock):
+                self._block_index[event.block.id] = len(self.blocks)
+                self._block_versions[event.block.id] = 0
+                self.blocks.append(event.block)
+                self._lines.append(None)
+                size = BLOCK_OVERHEAD_BYTES + _content_bytes(event.block.content)
+                self._block_bytes.append(size)
+                self.size_bytes += size
+            elif isinstance(event, (UpdateBlock, PatchBlock)):
+                idx = self._block_index.get(event.block_id)
+                if idx is None:
+                    continue
+                old_block = self.blocks[idx]
+                if isinstance(event, UpdateBlock):
+                    content = event.content
+                elif event.base_version == self._block_versions[event.block_id]:
+                    content = event.apply(old_block.content)
+                else:
+                    continue
+                self.blocks[idx] = Block(
+                    id=old_block.id,
+                    type=old_block.type,
+                    content=content,
+                    request_id=old_block.request_id,
+                )
+                self._block_versions[event.block_id] += 1
+                self._lines[idx] = None
+                size = BLOCK_OVERHEAD_BYTES + _content_bytes(content)
+                self.size_bytes += size - self._block_bytes[idx]
+                self._block_bytes[idx] = size
+            elif isinstance(event, ClearAll):
+                self.blocks.clear()
+                self._block_index.clear()
+                self._block_versions.clear()
+                self._lines.clear()
+                self._block_bytes.clear()
+                self.size_bytes = 0
+
+    def render(
+        self,
+        preset: Preset | None = None,
+        rows: int | None = None,
+        cols: int | None = None,
+    ) -> str:
+        """Render the current state to terminal-style text output.
+
+        Args:
+            preset: Predefined dimensions (DESKTOP or MOBILE).
+            rows: Number of rows (overrides preset).
+            cols: Number of columns (overrides preset).
+
+        Returns:
+            Terminal-style text output with box-drawing borders.
+
+        Raises:
+            ValueError: If neither preset nor rows/cols are provided.
+        """
+        # Determine dimensions
+        if rows is not None and cols is not None:
+            dims = Dimensions(rows=rows, cols=cols)
+        elif preset is not None:
+            dims = PRESET_DIMENSIONS[preset]
+        else:
+            raise ValueError("Must provide either preset or rows/cols")
+
+        # Render the last lines that fit, accounting for the borders
+        available_rows = max(dims.rows - 2, 0)
+        inner_width = dims.cols - 2
+        viewport_lines = self._render_viewport(available_rows, inner_width)
+
+        # Pad to fill available rows
+        while len(viewport_lines) < available_rows:
+            viewport_lines.append("")
+
+        # Build framed output
+        return self._renderer._build_frame(viewport_lines, dims)
+
+    def _block_lines(self, index: int) -> list[str]:
+        """Return the formatted lines of the block at index, formatting if needed."""
+        lines = self._lines[index]
+        if lines is None:
+            formatted = self._renderer._format_block(self.blocks[index])
+            lines = formatted.split("\n") if formatted else []
+            self._lines[index] = lines
+            size = sys.getsizeof(lines) + sum(sys.getsizeof(line) for line in lines)
+            self._block_bytes[index] += size
+            self.size_bytes += size
+        return lines
+
+    def _render_viewport(self, rows: int, width: int) -> list[str]:
+        """Render the last lines of the blocks that fit in the viewport.
+
+        Walks blocks from newest to oldest, collecting lines only until
+        ``rows`` lines are collected.
+
+        Args:
+            rows: Number of lines in the viewport.
+            width: Maximum line width.
+
+        Returns:
+            Up to ``rows`` lines (without newlines), oldest first.
+        """
+        fit_line = self._renderer._fit_line
+        reversed_lines: list[str] = []
+        has_later = False
+        later_request_id: str | None = None
+
+        for index in range(len(self.blocks) - 1, -1, -1):
+            if len(reversed_lines) >= rows:
+                break
+            block_lines = self._block_lines(index)
+            if not block_lines:
+                continue
+
+            current_rid = self.blocks[index].request_id
+
+            # Blank line separator between this block and the one after it,
+            # unless both share the same non-None request_id
+            if has_later and not (
+                current_rid and later_request_id and current_rid == later_request_id
+            ):
+                reversed_lines.append("")
+
+            needed = rows - len(reversed_lines)
+            if needed > 0:
+                for line in reversed(block_lines[-needed:]):
+                    reversed_lines.append(fit_line(line, width))
+
+            has_later = True
+            later_request_id = current_rid
+
+        return reversed_lines[::-1]
+
+
 def render_events(
     events: list[Event],
     preset: Preset | None = None,
@@ -37,6 +37,7 @@ from claude_session_player.watcher.config import ConfigManager
 from claude_session_player.watcher.debouncer import MessageDebouncer
 from claude_session_player.watcher.destinations import AttachedDestination, DestinationManager
 from claude_session_player.watcher.event_buffer import EventBufferManager
+from claude_session_player.watcher.event_log import DEFAULT_MAX_AGE_SECONDS, DEFAULT_MAX_BYTES
 from claude_session_player.watcher.file_watcher import FileWatcher
 from claude_session_player.watcher.indexer import IndexConfig, SessionIndexer, SQLiteSessionIndexer
 from claude_session_player.watcher.message_binding import MessageBinding, MessageBindingManager
@@ -96,6 +97,15 @@ class WatcherService:
     host: str = "127.0.0.1"
     port: int = 8080
 
+    # Session state file format ("json" or "binary")
+    state_format: str = "json"
+
+    # Disk-backed event log for SSE replay past the in-memory buffer
+    # (None disables it) and its retention (max age None = no age limit)
+    event_log_dir: Path | None = None
+    event_log_max_bytes: int = DEFAULT_MAX_BYTES
+    event_log_max_age_seconds: float | None = DEFAULT_MAX_AGE_SECONDS
+
     # Internal state
     _runner: AppRunner | None = field(default=None, repr=False)
     _site: TCPSite | None = field(default=None, repr=False)
@@ -112,10 +122,15 @@ class WatcherService:
             self.config_manager = ConfigManager(self.config_path)
 
         if self.state_manager is None:
-            self.state_manager = StateManager(self.state_dir)
+            self.state_manager = StateManager(self.state_dir, state_format=self.state_format)
 
         if self.event_buffer is None:
-            self.event_buffer = EventBufferManager()
+            self.event_buffer = EventBufferManager(
+                snapshot=True,
+                log_dir=self.event_log_dir,
+                log_max_bytes=self.event_log_max_bytes,
+                log_max_age_seconds=self.event_log_max_age_seconds,
+            )
 
         if self.sse_manager is None:
             self.sse_manager = SSEManager(event_buffer=self.event_buffer)
@@ -124,6 +139,8 @@ class WatcherService:
             self.file_watcher = FileWatcher(
                 on_lines_callback=self._on_file_change,
                 on_file_deleted_callback=self._on_file_deleted,
+                index_dir=self.state_dir / "line_index",
+                skip_invisible=True,
             )
 
         if self.destination_manager is None:
@@ -206,6 +223,8 @@ class WatcherService:
                 search_limiter=search_limiter,
                 preview_limiter=preview_limiter,
                 refresh_limiter=refresh_limiter,
+                line_index_dir=self.state_dir / "line_index",
+                render_cache=self.render_cache,
             )
 
     @property
@@ -396,6 +415,9 @@ class WatcherService:
         await self._save_all_states()
         logger.info("All states saved")
 
+        # Release event log append handles
+        self.event_buffer.close()
+
         # Final checkpoint and close SQLite indexer
         if self.sqlite_indexer:
             try:
@@ -583,11 +605,17 @@ class WatcherService:
                SSEManager.broadcast(session_id, event_id, event)
                Publish to messaging destinations
 
+        Called with no lines when every line read was skipped; then only
+        the file position and line number are saved.
+
         Args:
             session_id: The session that changed.
             lines: New parsed JSONL lines.
         """
-        if not lines:
+        # Lines the reader skipped count too, so that line_number keeps
+        # matching the file
+        lines_read = len(lines) + self.file_watcher.get_lines_skipped(session_id)
+        if not lines_read:
             return
 
         # Load existing state/context
@@ -599,8 +627,15 @@ class WatcherService:
             context = ProcessingContext()
             line_number = 0
 
-        # Transform lines to events
-        events, new_context = transform(lines, context)
+        # Transform lines to events. The context was just loaded (or created)
+        # for this call, so it is updated in place; if transform raises,
+        # nothing is saved and the next tick reloads the previous state.
+        # Progress updates superseded within the batch are coalesced so they
+        # don't crowd real content out of the replay buffer.
+        if lines:
+            events, new_context = transform(lines, context, owned=True, coalesce=True)
+        else:
+            events, new_context = [], context
 
         # Get current position from file watcher
         position = self.file_watcher.get_position(session_id)
@@ -608,7 +643,7 @@ class WatcherService:
             position = 0
 
         # Update line number
-        new_line_number = line_number + len(lines)
+        new_line_number = line_number + lines_read
 
         # Save updated state
         new_state = SessionState(
@@ -618,17 +653,20 @@ class WatcherService:
             last_modified=datetime.now(timezone.utc),
         )
         self.state_manager.save(session_id, new_state)
+        if not lines:
+            return
 
         # Buffer events and broadcast to SSE subscribers
         for event in events:
             event_id = self.event_buffer.add_event(session_id, event)
             await self.sse_manager.broadcast(session_id, event_id, event)
 
-        # Rebuild render cache with all buffered events
+        # Apply the new events to the render cache, rebuilding it from the
+        # session's current state if it has no render state yet
         if self.render_cache and self.message_bindings:
-            all_events_with_ids = self.event_buffer.get_events_since(session_id, None)
-            all_events = [evt for _, evt in all_events_with_ids]
-            self.render_cache.rebuild(session_id, all_events)
+            if not self.render_cache.update(session_id, events):
+                state_events = self.event_buffer.get_state_events(session_id)
+                self.render_cache.rebuild(session_id, state_events)
 
             # Push cached content to all bindings for this session
             await self._push_to_bindings(session_id)
@@ -816,9 +854,8 @@ class WatcherService:
         content = self.render_cache.get(session_id, preset)  # type: ignore[arg-type]
         if content is None:
             # Build cache if not present (e.g., first attach)
-            all_events_with_ids = self.event_buffer.get_events_since(session_id, None)
-            all_events = [evt for _, evt in all_events_with_ids]
-            self.render_cache.rebuild(session_id, all_events)
+            state_events = self.event_buffer.get_state_events(session_id)
+            self.render_cache.rebuild(session_id, state_events)
             content = self.render_cache.get(session_id, preset)  # type: ignore[arg-type]
 
         # Create initial message
@@ -2,19 +2,40 @@
 
 This module provides SSE support for streaming session events to subscribers
 with replay support via Last-Event-ID.
+
+Clients that opt in to deltas receive live updates of blocks they are in sync
+with as ``patch_block`` events (block_id, base_version, changed content
+fields) instead of ``update_block`` events carrying the full content. A
+block's version is the number of updates it received since its
+``add_block``. Replayed events and updates of blocks the client may not be
+in sync with are always sent in full.
+
+Clients can also ask for a ``snapshot`` event on connect instead of a
+replay: it carries the session's current blocks (after the last ClearAll)
+with their versions and the ID of the newest event they include, so one
+message brings a client to the current screen however long the session.
+Delta clients are in sync with every block of the snapshot.
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Protocol
 
-from claude_session_player.events import AddBlock, ClearAll, Event, UpdateBlock
+from claude_session_player import json_codec
+from claude_session_player.events import (
+    AddBlock,
+    Block,
+    ClearAll,
+    Event,
+    PatchBlock,
+    UpdateBlock,
+)
+from claude_session_player.processor import DeltaEncoder
 
 if TYPE_CHECKING:
-    from claude_session_player.watcher.event_buffer import EventBufferManager
+    from claude_session_player.watcher.event_buffer import BufferSnapshot, EventBufferManager
 
 
 class StreamResponse(Protocol):
@@ -53,6 +74,8 @@ def _event_type_name(event: Event) -> str:
         return "add_block"
     elif isinstance(event, UpdateBlock):
         return "update_block"
+    elif isinstance(event, PatchBlock):
+        return "patch_block"
     elif isinstance(event, ClearAll):
         return "clear_all"
     else:
@@ -80,12 +103,31 @@ def _event_to_data(event: Event) -> dict:
             "block_id": event.block_id,
             "content": event.content.to_dict(),
         }
+    elif isinstance(event, PatchBlock):
+        return {
+            "block_id": event.block_id,
+            "base_version": event.base_version,
+            "changes": event.changes,
+        }
     elif isinstance(event, ClearAll):
         return {}
     else:
         return {}
 
 
+def _snapshot_to_data(snapshot: BufferSnapshot) -> dict:
+    """Convert a buffer snapshot to the data of a snapshot event.
+
+    Each block has the fields of an add_block event plus its version.
+    """
+    return {
+        "blocks": [
+            {**_event_to_data(AddBlock(block=block)), "version": version}
+            for block, version in zip(snapshot.blocks, snapshot.versions)
+        ]
+    }
+
+
 def format_sse_message(
     event_id: str | None = None,
     event_type: str | None = None,
@@ -101,17 +143,17 @@ def format_sse_message(
     Returns:
         SSE-formatted message as bytes.
     """
-    lines = []
+    lines: list[bytes] = []
     if event_id is not None:
-        lines.append(f"id: {event_id}")
+        lines.append(f"id: {event_id}".encode())
     if event_type is not None:
-        lines.append(f"event: {event_type}")
+        lines.append(f"event: {event_type}".encode())
     if data is not None:
         # JSON data on a single line
-        lines.append(f"data: {json.dumps(data)}")
-    lines.append("")  # Empty line terminates the message
-    lines.append("")  # Extra newline for separation
-    return "\n".join(lines).encode("utf-8")
+        lines.append(b"data: " + json_codec.dumps(data))
+    lines.append(b"")  # Empty line terminates the message
+    lines.append(b"")  # Extra newline for separation
+    return b"\n".join(lines)
 
 
 def format_keepalive() -> bytes:
@@ -132,15 +174,33 @@ class SSEConnection:
 
     session_id: str
     response: StreamResponse
+    delta: bool = False  # client accepts patch_block events
     _closed: bool = field(default=False, repr=False)
+    # Blocks whose add_block and every later update this client received
+    _synced: set[str] = field(default_factory=set, repr=False)
+
+    def track(self, event: Event) -> None:
+        """Record an event sent to the client, for deciding when deltas apply."""
+        if isinstance(event, AddBlock):
+            self._synced.add(event.block.id)
+        elif isinstance(event, ClearAll):
+            self._synced.clear()
+
+    def track_snapshot(self, blocks: list[Block]) -> None:
+        """Record a snapshot sent to the client, replacing its synced blocks."""
+        self._synced = {block.id for block in blocks}
+
+    def accepts_patch(self, block_id: str) -> bool:
+        """Return True if the client can apply a patch to the block."""
+        return self.delta and block_id in self._synced
 
     async def send_event(
-        self, event_id: str, event_type: str, data: dict
+        self, event_id: str | None, event_type: str, data: dict
     ) -> None:
         """Send an event to the client.
 
         Args:
-            event_id: The event ID.
+            event_id: The event ID, or None to send the event without one.
             event_type: The event type name.
             data: The event data dictionary.
 
@@ -201,43 +261,60 @@ class SSEManager:
     _keepalive_tasks: dict[int, asyncio.Task] = field(
         default_factory=dict, repr=False
     )  # keyed by id(connection)
+    # Per-session delta state, kept only while the session has subscribers
+    _encoders: dict[str, DeltaEncoder] = field(default_factory=dict, repr=False)
 
     async def connect(
         self,
         session_id: str,
         response: StreamResponse,
         last_event_id: str | None = None,
+        delta: bool = False,
+        snapshot: bool = False,
     ) -> SSEConnection:
         """Create and register a new SSE connection.
 
-        Replays buffered events if last_event_id is provided.
+        Replays buffered events if last_event_id is provided, streaming
+        them from the session's event log when the ID is older than the
+        in-memory buffer. With snapshot, sends a snapshot event with the
+        session's current blocks instead, whatever last_event_id is.
 
         Args:
             session_id: The session to subscribe to.
             response: The HTTP streaming response.
             last_event_id: The last event ID received (for replay).
+            delta: Whether the client accepts patch_block events.
+            snapshot: Whether to start with a snapshot instead of a replay.
 
         Returns:
             The new SSEConnection.
         """
-        connection = SSEConnection(session_id=session_id, response=response)
+        connection = SSEConnection(session_id=session_id, response=response, delta=delta)
 
         # Register the connection
         if session_id not in self._connections:
             self._connections[session_id] = []
         self._connections[session_id].append(connection)
 
-        # Replay buffered events
-        events_to_replay = self.event_buffer.get_events_since(session_id, last_event_id)
-        for event_id, event in events_to_replay:
-            event_type = _event_type_name(event)
-            data = _event_to_data(event)
-            try:
-                await connection.send_event(event_id, event_type, data)
-            except ConnectionError:
-                # Client disconnected during replay
-                await self.disconnect(connection)
-                raise
+        # Track before each send: a broadcast during the await may track
+        # newer events, which must not be overwritten afterwards
+        try:
+            if snapshot:
+                state = self.event_buffer.get_snapshot(session_id)
+                connection.track_snapshot(state.blocks)
+                await connection.send_event(state.event_id, "snapshot", _snapshot_to_data(state))
+            else:
+                # Replay buffered (or logged) events
+                replay = self.event_buffer.iter_events_since(session_id, last_event_id)
+                for event_id, event in replay:
+                    event_type = _event_type_name(event)
+                    data = _event_to_data(event)
+                    connection.track(event)
+                    await connection.send_event(event_id, event_type, data)
+        except ConnectionError:
+            # Client disconnected during replay
+            await self.disconnect(connection)
+            raise
 
         # Start keep-alive task
         task = asyncio.create_task(self._keepalive_loop(connection))
@@ -271,6 +348,7 @@ class SSEManager:
                 pass  # Already removed
             if not self._connections[session_id]:
                 del self._connections[session_id]
+                self._encoders.pop(session_id, None)
 
         # Close the connection
         await connection.close()
@@ -280,6 +358,9 @@ class SSEManager:
     ) -> None:
         """Broadcast an event to all subscribers of a session.
 
+        Delta clients in sync with the block receive UpdateBlocks as
+        patch_block events; everyone else gets the event as is.
+
         Args:
             session_id: The session to broadcast to.
             event_id: The event ID.
@@ -291,11 +372,21 @@ class SSEManager:
         event_type = _event_type_name(event)
         data = _event_to_data(event)
 
+        encoder = self._encoders.get(session_id)
+        if encoder is None:
+            encoder = self._encoders[session_id] = DeltaEncoder()
+        patch = encoder.encode(event)
+        patch_data = _event_to_data(patch) if patch is not None and patch is not event else None
+
         # Copy the list to allow modification during iteration
         connections = list(self._connections.get(session_id, []))
         for connection in connections:
             try:
-                await connection.send_event(event_id, event_type, data)
+                if patch_data is not None and connection.accepts_patch(patch.block_id):
+                    await connection.send_event(event_id, "patch_block", patch_data)
+                else:
+                    await connection.send_event(event_id, event_type, data)
+                connection.track(event)
             except ConnectionError:
                 # Client disconnected, clean up
                 await self.disconnect(connection)
@@ -10,8 +10,12 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from claude_session_player import binary_codec
 from claude_session_player.events import ProcessingContext
 
+# State file formats and their file suffixes
+STATE_FORMATS = {"json": ".json", "binary": ".state"}
+
 
 @dataclass
 class SessionState:
@@ -76,32 +80,59 @@ class StateManager:
 
     Provides save/load/delete operations for SessionState with atomic writes
     and graceful handling of corrupt state files.
+
+    State is written as indented JSON (``<id>.json``) or, with
+    ``state_format="binary"``, as a ``binary_codec`` record (``<id>.state``),
+    which is several times smaller. A session whose state exists only in the
+    other format is loaded from it and migrated on the next save.
     """
 
-    def __init__(self, state_dir: Path) -> None:
+    def __init__(self, state_dir: Path, state_format: str = "json") -> None:
         """Initialize with state directory path.
 
         Args:
             state_dir: Directory where state files will be stored.
+            state_format: "json" or "binary".
+
+        Raises:
+            ValueError: If state_format is unknown.
         """
+        if state_format not in STATE_FORMATS:
+            raise ValueError(
+                f"Unknown state format: {state_format!r} (expected one of {sorted(STATE_FORMATS)})"
+            )
         self._state_dir = state_dir
+        self._state_format = state_format
+        # Sessions loaded from a file in the other format, removed on next save
+        self._migrating: set[str] = set()
 
     @property
     def state_dir(self) -> Path:
         """Return the state directory path."""
         return self._state_dir
 
-    def _state_file_path(self, session_id: str) -> Path:
+    @property
+    def state_format(self) -> str:
+        """Return the format new state files are written in."""
+        return self._state_format
+
+    def _state_file_path(self, session_id: str, state_format: str | None = None) -> Path:
         """Get the state file path for a session.
 
         Args:
             session_id: The session identifier.
+            state_format: File format; defaults to the configured one.
 
         Returns:
             Path to the state file.
         """
         safe_id = _sanitize_session_id(session_id)
-        return self._state_dir / f"{safe_id}.json"
+        suffix = STATE_FORMATS[state_format or self._state_format]
+        return self._state_dir / f"{safe_id}{suffix}"
+
+    def _other_format(self) -> str:
+        """Return the state format that is not configured."""
+        return "binary" if self._state_format == "json" else "json"
 
     def exists(self, session_id: str) -> bool:
         """Check if state file exists for a session.
@@ -112,7 +143,10 @@ class StateManager:
         Returns:
             True if state file exists, False otherwise.
         """
-        return self._state_file_path(session_id).exists()
+        return (
+            self._state_file_path(session_id).exists()
+            or self._state_file_path(session_id, self._other_format()).exists()
+        )
 
     def load(self, session_id: str) -> SessionState | None:
         """Load session state from file.
@@ -124,20 +158,31 @@ class StateManager:
             SessionState if loaded successfully, None if file doesn't exist
             or is corrupt.
         """
+        state_format = self._state_format
         state_path = self._state_file_path(session_id)
 
         if not state_path.exists():
-            return None
+            state_format = self._other_format()
+            state_path = self._state_file_path(session_id, state_format)
+            if not state_path.exists():
+                return None
 
         try:
-            with open(state_path, encoding="utf-8") as f:
-                data = json.load(f)
-            return SessionState.from_dict(data)
-        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            raw = state_path.read_bytes()
+            if state_format == "binary":
+                data = binary_codec.loads(raw)
+            else:
+                data = json.loads(raw)
+            state = SessionState.from_dict(data)
+        except (OSError, KeyError, TypeError, ValueError):
             # Corrupt state file - log warning would go here
             # Return None so caller can reset
             return None
 
+        if state_format != self._state_format:
+            self._migrating.add(session_id)
+        return state
+
     def save(self, session_id: str, state: SessionState) -> None:
         """Save session state to file.
 
@@ -153,16 +198,20 @@ class StateManager:
         self._state_dir.mkdir(parents=True, exist_ok=True)
 
         data = state.to_dict()
+        if self._state_format == "binary":
+            payload = binary_codec.dumps(data)
+        else:
+            payload = json.dumps(data, indent=2).encode("utf-8")
 
         # Atomic write: write to temp file in same directory, then rename
         fd, temp_path = tempfile.mkstemp(
             dir=self._state_dir,
             prefix=".state_",
-            suffix=".json.tmp",
+            suffix=f"{state_path.suffix}.tmp",
         )
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
             # Atomic rename
             os.replace(temp_path, state_path)
         except Exception:
@@ -171,6 +220,10 @@ class StateManager:
                 os.unlink(temp_path)
             raise
 
+        if session_id in self._migrating:
+            self._migrating.discard(session_id)
+            self._state_file_path(session_id, self._other_format()).unlink(missing_ok=True)
+
     def delete(self, session_id: str) -> None:
         """Delete session state file.
 
@@ -180,6 +233,6 @@ class StateManager:
         Note:
             Does nothing if state file doesn't exist.
         """
-        state_path = self._state_file_path(session_id)
-        if state_path.exists():
-            state_path.unlink()
+        self._migrating.discard(session_id)
+        for state_format in STATE_FORMATS:
+            self._state_file_path(session_id, state_format).unlink(missing_ok=True)
@@ -1,69 +1,51 @@
-"""Stateless session transformer for the watcher service.
+"""Session transformer for the watcher service.
 
-This module provides a pure function that transforms JSONL lines into events
-with explicit state threading. The original context is never mutated.
+This module provides a function that transforms JSONL lines into events
+with explicit state threading. By default the original context is never
+mutated; callers that own their context can let it be updated in place.
 """
 
 from __future__ import annotations
 
-import copy
-
 from claude_session_player.events import (
     Event,
     ProcessingContext,
 )
-from claude_session_player.processor import (
-    _question_content_cache,
-    _tool_content_cache,
-    process_line,
-)
+from claude_session_player.processor import coalesce_updates, process_lines
 
 
 def transform(
     lines: list[dict],
     context: ProcessingContext,
+    *,
+    owned: bool = False,
+    coalesce: bool = False,
 ) -> tuple[list[Event], ProcessingContext]:
     """Process lines and return events with updated context.
 
-    Pure function: no side effects, no I/O.
-    The original context is not mutated; a new context is returned.
+    No side effects beyond the context, no I/O. All processor state lives
+    in the context, so transforms of different sessions can run
+    concurrently.
 
     Args:
         lines: List of parsed JSONL line dicts to process.
         context: Processing context with tool mappings and current request ID.
+        owned: If True, the caller hands the context over (e.g. it was just
+            loaded from the state file): it is updated in place and returned,
+            so a batch costs O(lines) regardless of session history. If
+            processing raises, the context may be partially updated and must
+            be discarded; the last saved state is the rollback point. If
+            False (default), the context is copied first and never mutated.
+        coalesce: If True, UpdateBlocks superseded by a later update of the
+            same block within the batch are dropped (see
+            ``coalesce_updates``). The context is unaffected.
 
     Returns:
         Tuple of (events, new_context) where events is the list of all events
         produced and new_context is the updated processing context.
     """
-    # Deep copy context so we don't mutate the original
-    ctx = copy.deepcopy(context)
-
-    # Save and restore module-level caches to ensure isolation
-    # This is necessary because processor.py uses module-level caches
-    saved_tool_cache = _tool_content_cache.copy()
-    saved_question_cache = _question_content_cache.copy()
-
-    try:
-        # Clear module caches and restore them from context state if needed
-        # Note: The caches need to be in sync with the context's tool mappings
-        _tool_content_cache.clear()
-        _question_content_cache.clear()
-
-        events: list[Event] = []
-        for line in lines:
-            line_events = process_line(ctx, line)
-            events.extend(line_events)
-
-            # Check if ClearAll was emitted (context compaction)
-            # process_line already calls ctx.clear() and _clear_tool_content_cache()
-            # but we track this for clarity
-
-        return events, ctx
-
-    finally:
-        # Restore the original module-level caches
-        _tool_content_cache.clear()
-        _tool_content_cache.update(saved_tool_cache)
-        _question_content_cache.clear()
-        _question_content_cache.update(saved_question_cache)
+    ctx = context if owned else context.copy()
+    events = process_lines(ctx, lines)
+    if coalesce:
+        events = coalesce_updates(events)
+    return events, ctx
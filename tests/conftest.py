@@ -2,6 +2,16 @@
 
 import pytest
 
+from claude_session_player import line_index
+
+
+@pytest.fixture(autouse=True)
+def _line_index_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Keep default-located LineIndex sidecars out of the home directory."""
+    monkeypatch.setattr(line_index, "DEFAULT_INDEX_DIR", tmp_path_factory.mktemp("line_index"))
+
 
 # ---------------------------------------------------------------------------
 # Issue 02 fixtures: JSONL line dicts for each message type
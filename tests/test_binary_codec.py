@@ -0,0 +1,169 @@
+"""Tests for the binary event/state codec."""
+
+import io
+import json
+
+import pytest
+
+from claude_session_player import binary_codec
+from claude_session_player.events import (
+    AddBlock,
+    Block,
+    BlockType,
+    ClearAll,
+    ProcessingContext,
+    Question,
+    QuestionContent,
+    QuestionOption,
+    ToolCallContent,
+    UpdateBlock,
+    UserContent,
+)
+
+_PAYLOADS = [
+    {"type": "add_block", "block": {"id": "b1", "content": {"text": "hello"}}},
+    {"text": "héllo wörld 😀   \x7f", "unknown key ✓": "lone surrogate \ud800"},
+    {"nested": [[], {}, [0, 1, -1, 127, 128, -129, 2**63 - 1, -(2**63), 2**100]]},
+    {"flags": [None, True, False], "floats": [0.0, -0.0, 0.1, 1e300, -2.25]},
+    [],
+    "",
+    "tool_call",
+    42,
+    None,
+]
+
+_TOOL_CONTENT = ToolCallContent(
+    tool_name="Bash",
+    tool_use_id="toolu_001",
+    label="npm test",
+    result="ok\n" * 10,
+    progress_text="running",
+)
+
+_EVENTS = [
+    AddBlock(
+        block=Block(
+            id="b1", type=BlockType.TOOL_CALL, content=_TOOL_CONTENT, request_id="req_1"
+        )
+    ),
+    AddBlock(block=Block(id="b2", type=BlockType.USER, content=UserContent(text="hi"))),
+    UpdateBlock(
+        block_id="b3",
+        content=QuestionContent(
+            tool_use_id="toolu_q",
+            questions=[
+                Question(
+                    question="Which?",
+                    header="Pick",
+                    options=[QuestionOption(label="A", description="first")],
+                    multi_select=True,
+                )
+            ],
+            answers={"Which?": "A"},
+        ),
+    ),
+    ClearAll(),
+]
+
+
+class TestValues:
+
+    @pytest.mark.parametrize("obj", _PAYLOADS)
+    def test_round_trip(self, obj) -> None:
+        assert binary_codec.loads(binary_codec.dumps(obj)) == obj
+
+    def test_int_and_bool_types_preserved(self) -> None:
+        assert binary_codec.loads(binary_codec.dumps([1, True, 0, False])) == [1, True, 0, False]
+        assert [type(v) for v in binary_codec.loads(binary_codec.dumps([1, True]))] == [int, bool]
+
+    def test_dict_key_order_preserved(self) -> None:
+        obj = {"z": 1, "type": 2, "a": 3}
+        assert list(binary_codec.loads(binary_codec.dumps(obj))) == ["z", "type", "a"]
+
+    def test_smaller_than_json(self) -> None:
+        data = _EVENTS[0].to_dict()
+        assert len(binary_codec.dumps(data)) < len(json.dumps(data, separators=(",", ":")))
+
+    @pytest.mark.parametrize("obj", [(1, 2), {1: "a"}, {1, 2}, object()])
+    def test_unsupported_values_raise_type_error(self, obj) -> None:
+        with pytest.raises(TypeError):
+            binary_codec.dumps(obj)
+
+
+class TestVersioning:
+
+    def test_records_start_with_header(self) -> None:
+        assert binary_codec.dumps(None).startswith(binary_codec.HEADER)
+
+    def test_unknown_version_rejected(self) -> None:
+        data = bytearray(binary_codec.dumps({"a": 1}))
+        data[1] = binary_codec.VERSION + 1
+        with pytest.raises(ValueError, match="version"):
+            binary_codec.loads(bytes(data))
+
+    @pytest.mark.parametrize(
+        "data",
+        [b"", b"{}", binary_codec.HEADER, binary_codec.dumps("text")[:-1]],
+        ids=["empty", "json", "header-only", "truncated"],
+    )
+    def test_malformed_records_raise_value_error(self, data: bytes) -> None:
+        with pytest.raises(ValueError):
+            binary_codec.loads(data)
+
+    def test_trailing_data_rejected(self) -> None:
+        with pytest.raises(ValueError, match="trailing"):
+            binary_codec.loads(binary_codec.dumps(1) + b"\x00")
+
+
+class TestTypedHelpers:
+
+    @pytest.mark.parametrize("event", _EVENTS, ids=lambda e: type(e).__name__)
+    def test_event_round_trip(self, event) -> None:
+        assert binary_codec.decode_event(binary_codec.encode_event(event)) == event
+
+    def test_block_round_trip(self) -> None:
+        block = _EVENTS[0].block
+        assert binary_codec.decode_block(binary_codec.encode_block(block)) == block
+
+    def test_context_round_trip_matches_dict_form(self) -> None:
+        context = ProcessingContext(
+            tool_use_id_to_block_id={"toolu_001": "b1"},
+            current_request_id="req_1",
+            tool_contents={"toolu_001": _TOOL_CONTENT},
+            resolved_tool_use_ids=["toolu_000"],
+        )
+
+        decoded = binary_codec.decode_context(binary_codec.encode_context(context))
+
+        assert decoded.to_dict() == context.to_dict()
+
+
+class TestFrames:
+
+    def test_decoder_handles_arbitrary_chunking(self) -> None:
+        stream = b"".join(binary_codec.frame(obj) for obj in _PAYLOADS)
+        decoder = binary_codec.FrameDecoder()
+
+        values = []
+        for i in range(len(stream)):
+            values.extend(decoder.feed(stream[i : i + 1]))
+
+        assert values == _PAYLOADS
+        assert decoder.pending == 0
+
+    def test_decoder_keeps_partial_frame(self) -> None:
+        first, second = binary_codec.frame("a"), binary_codec.frame("b" * 300)
+        decoder = binary_codec.FrameDecoder()
+
+        assert decoder.feed(first + second[:5]) == ["a"]
+        assert decoder.pending == 5
+        assert decoder.feed(second[5:]) == ["b" * 300]
+
+    def test_iter_frames_ignores_truncated_tail(self) -> None:
+        stream = binary_codec.frame({"n": 1}) + binary_codec.frame({"n": 2})[:-2]
+
+        assert list(binary_codec.iter_frames(io.BytesIO(stream), chunk_size=3)) == [{"n": 1}]
+
+    def test_corrupt_frame_raises_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            binary_codec.FrameDecoder().feed(b"\x02xx")
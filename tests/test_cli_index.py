@@ -576,6 +576,46 @@ class TestCLIIntegration:
         assert "world" in result.stdout
 
 
+    def test_replay_at_line(self, tmp_path: Path):
+        """'replay --line N' renders the session as of line N."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text(
+            '{"type":"user","uuid":"a","message":{"role":"user","content":"first"}}\n'
+            '{"type":"user","uuid":"b","message":{"role":"user","content":"second"}}\n'
+        )
+
+        result = subprocess.run(
+            [
+                sys.executable, "-m", "claude_session_player.cli",
+                "replay", str(session_file), "--line", "1",
+                "--state-dir", str(tmp_path / "state"),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0
+        assert "first" in result.stdout
+        assert "second" not in result.stdout
+        assert list((tmp_path / "state" / "line_index").glob("*.idx"))
+
+    def test_replay_at_line_out_of_range(self, tmp_path: Path):
+        """'replay --line N' fails for lines past the end."""
+        session_file = tmp_path / "test.jsonl"
+        session_file.write_text('{"type":"user","message":{"content":"x"}}\n')
+
+        result = subprocess.run(
+            [
+                sys.executable, "-m", "claude_session_player.cli",
+                "replay", str(session_file), "--line", "5",
+                "--state-dir", str(tmp_path / "state"),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 1
+        assert "out of range" in result.stderr
+
+
 # ---------------------------------------------------------------------------
 # Test Main Function
 # ---------------------------------------------------------------------------
@@ -19,6 +19,7 @@ from claude_session_player.events import (
     BlockType,
     ClearAll,
     DurationContent,
+    PatchBlock,
     ProcessingContext,
     SystemContent,
     ThinkingContent,
@@ -26,6 +27,7 @@ from claude_session_player.events import (
     UpdateBlock,
     UserContent,
 )
+from claude_session_player.protocol import BatchConsumer
 
 
 # ---------------------------------------------------------------------------
@@ -186,6 +188,211 @@ class TestUpdateBlock:
         assert consumer.blocks[0].content.is_error is False
 
 
+class TestPatchBlock:
+    """Tests for PatchBlock (delta update) event handling."""
+
+    def test_patch_block_replaces_changed_fields(
+        self, consumer: ScreenStateConsumer, tool_call_block: Block
+    ) -> None:
+        """PatchBlock changes only the given fields."""
+        consumer.handle(AddBlock(block=tool_call_block))
+
+        consumer.handle(
+            PatchBlock(block_id="block-tool-1", changes={"result": "done"}, base_version=0)
+        )
+
+        assert consumer.blocks[0].content == ToolCallContent(
+            tool_name="Read", tool_use_id="tool-use-1", label="README.md", result="done"
+        )
+        assert consumer.blocks[0].request_id == "req-123"
+
+    def test_patch_block_versions_count_all_updates(
+        self, consumer: ScreenStateConsumer, tool_call_block: Block
+    ) -> None:
+        """Versions advance on both UpdateBlock and PatchBlock."""
+        consumer.handle(AddBlock(block=tool_call_block))
+        consumer.handle(
+            UpdateBlock(block_id="block-tool-1", content=tool_call_block.content)
+        )
+        consumer.handle(
+            PatchBlock(block_id="block-tool-1", changes={"progress_text": "a"}, base_version=1)
+        )
+        consumer.handle(
+            PatchBlock(block_id="block-tool-1", changes={"progress_text": "b"}, base_version=2)
+        )
+
+        assert consumer.blocks[0].content.progress_text == "b"
+
+    def test_patch_block_stale_version_raises(
+        self, consumer: ScreenStateConsumer, tool_call_block: Block
+    ) -> None:
+        """A patch against a different version is rejected."""
+        consumer.handle(AddBlock(block=tool_call_block))
+
+        with pytest.raises(ValueError, match="version"):
+            consumer.handle(
+                PatchBlock(block_id="block-tool-1", changes={"result": "x"}, base_version=1)
+            )
+        assert consumer.blocks[0].content.result is None
+
+
+# ---------------------------------------------------------------------------
+# Test memoized and incremental markdown
+# ---------------------------------------------------------------------------
+
+
+def _tool_update(result: str) -> UpdateBlock:
+    return UpdateBlock(
+        block_id="block-tool-1",
+        content=ToolCallContent(
+            tool_name="Read", tool_use_id="tool-use-1", label="README.md", result=result
+        ),
+    )
+
+
+class TestOnEvents:
+    """Tests for batched delivery to ScreenStateConsumer."""
+
+    def test_is_batch_consumer(self, consumer: ScreenStateConsumer) -> None:
+        """ScreenStateConsumer implements the optional BatchConsumer protocol."""
+        assert isinstance(consumer, BatchConsumer)
+
+    @pytest.mark.asyncio
+    async def test_on_events_matches_handle(
+        self, user_block: Block, tool_call_block: Block
+    ) -> None:
+        """on_events() leaves the same state as handling each event."""
+        events = [AddBlock(block=user_block), AddBlock(block=tool_call_block), _tool_update("ok")]
+        batched, single = ScreenStateConsumer(), ScreenStateConsumer()
+
+        await batched.on_events(events)
+        for event in events:
+            single.handle(event)
+
+        assert batched.to_markdown() == single.to_markdown()
+
+
+class TestIncrementalMarkdown:
+    """Tests for per-block memoization and markdown_update()."""
+
+    @staticmethod
+    def _apply(document: str, consumer: ScreenStateConsumer) -> str:
+        """Apply the next markdown_update() to document, checking offsets."""
+        update = consumer.markdown_update()
+        assert len(document[: update.offset].encode("utf-8")) == update.byte_offset
+        return document[: update.offset] + update.text
+
+    def test_only_changed_blocks_are_reformatted(
+        self,
+        consumer: ScreenStateConsumer,
+        user_block: Block,
+        tool_call_block: Block,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """to_markdown() formats a block again only after it changes."""
+        import claude_session_player.consumer as consumer_module
+
+        formatted: list[str] = []
+        original = consumer_module.format_block
+
+        def counting_format_block(block: Block) -> str:
+            formatted.append(block.id)
+            return original(block)
+
+        monkeypatch.setattr(consumer_module, "format_block", counting_format_block)
+        consumer.handle(AddBlock(block=user_block))
+        consumer.handle(AddBlock(block=tool_call_block))
+        consumer.to_markdown()
+        consumer.to_markdown()
+        consumer.handle(_tool_update("done"))
+        markdown = consumer.to_markdown()
+
+        assert formatted == ["block-user-1", "block-tool-1", "block-tool-1"]
+        assert "done" in markdown
+
+    def test_first_update_is_whole_document(
+        self, consumer: ScreenStateConsumer, user_block: Block, assistant_block: Block
+    ) -> None:
+        """The first update starts at offset 0 with the full markdown."""
+        consumer.handle(AddBlock(block=user_block))
+        consumer.handle(AddBlock(block=assistant_block))
+
+        update = consumer.markdown_update()
+
+        assert (update.offset, update.byte_offset) == (0, 0)
+        assert update.text == consumer.to_markdown()
+
+    def test_append_returns_only_new_blocks(
+        self, consumer: ScreenStateConsumer, user_block: Block, assistant_block: Block
+    ) -> None:
+        """Adding a block yields an update at the end of the document."""
+        consumer.handle(AddBlock(block=user_block))
+        document = consumer.markdown_update().text
+
+        consumer.handle(AddBlock(block=assistant_block))
+        update = consumer.markdown_update()
+
+        assert update.offset == len(document)
+        assert update.text == "\n\n● Hello! How can I help you?"
+
+    def test_no_changes_returns_empty_update(
+        self, consumer: ScreenStateConsumer, user_block: Block
+    ) -> None:
+        """Without changes the update is empty at the end of the document."""
+        consumer.handle(AddBlock(block=user_block))
+        document = consumer.markdown_update().text
+
+        update = consumer.markdown_update()
+
+        assert (update.offset, update.text) == (len(document), "")
+
+    def test_sequence_of_updates_matches_to_markdown(
+        self,
+        consumer: ScreenStateConsumer,
+        user_block: Block,
+        assistant_block: Block,
+        tool_call_block: Block,
+    ) -> None:
+        """Applying each update reproduces to_markdown() after every change."""
+        events = [
+            AddBlock(block=user_block),
+            AddBlock(block=assistant_block),
+            AddBlock(block=tool_call_block),
+            _tool_update("résumé ✓"),
+            AddBlock(
+                block=Block(id="sys-1", type=BlockType.SYSTEM, content=SystemContent(text=""))
+            ),
+            AddBlock(
+                block=Block(
+                    id="dur-1", type=BlockType.DURATION, content=DurationContent(duration_ms=5000)
+                )
+            ),
+            _tool_update("changed again"),
+            ClearAll(),
+            AddBlock(block=user_block),
+        ]
+
+        document = ""
+        for event in events:
+            consumer.handle(event)
+            document = self._apply(document, consumer)
+            assert document == consumer.to_markdown()
+
+    def test_clear_all_restarts_at_offset_zero(
+        self, consumer: ScreenStateConsumer, user_block: Block, assistant_block: Block
+    ) -> None:
+        """After ClearAll the update replaces the whole document."""
+        consumer.handle(AddBlock(block=user_block))
+        consumer.markdown_update()
+
+        consumer.handle(ClearAll())
+        consumer.handle(AddBlock(block=assistant_block))
+        update = consumer.markdown_update()
+
+        assert update.offset == 0
+        assert update.text == "● Hello! How can I help you?"
+
+
 # ---------------------------------------------------------------------------
 # Test ClearAll event handling
 # ---------------------------------------------------------------------------
@@ -589,6 +796,54 @@ class TestReplaySession:
         assert "└ File contents here" in result
 
 
+    def test_replay_session_accepts_generator(self) -> None:
+        """replay_session() consumes a lazy iterator the same as a list."""
+        lines = [
+            {"type": "user", "message": {"content": "one", "role": "user"}},
+            {"type": "user", "message": {"content": "two", "role": "user"}},
+        ]
+        assert replay_session(line for line in lines) == replay_session(lines)
+
+
+    def test_replay_from_last_compaction_matches_full_replay(
+        self, tmp_path
+    ) -> None:
+        """Replaying only the lines after the last boundary renders the same output."""
+        import json
+
+        from claude_session_player.parser import iter_session
+
+        lines = [
+            {"type": "user", "message": {"content": "before", "role": "user"}},
+            {
+                "type": "assistant",
+                "message": {
+                    "content": [
+                        {"type": "tool_use", "id": "t1", "name": "Bash", "input": {"command": "ls"}}
+                    ],
+                    "role": "assistant",
+                },
+                "requestId": "req-1",
+            },
+            {"type": "system", "subtype": "compact_boundary"},
+            {"type": "user", "message": {"content": "after", "role": "user"}},
+            {
+                "type": "user",
+                "message": {
+                    "content": [{"type": "tool_result", "tool_use_id": "t1", "content": "x"}],
+                    "role": "user",
+                },
+            },
+        ]
+        path = tmp_path / "session.jsonl"
+        path.write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+        full = replay_session(iter_session(path))
+        fast = replay_session(iter_session(path, from_last_compaction=True))
+        assert fast == full
+        assert "before" not in fast
+
+
 # ---------------------------------------------------------------------------
 # Test format helper functions
 # ---------------------------------------------------------------------------
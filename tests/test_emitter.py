@@ -7,7 +7,7 @@ import logging
 
 import pytest
 
-from claude_session_player.emitter import EventEmitter
+from claude_session_player.emitter import EventEmitter, QueueMetrics
 from claude_session_player.events import (
     AddBlock,
     AssistantContent,
@@ -472,3 +472,308 @@ class TestEmitLogging:
             emitter.unsubscribe(consumer)
 
         assert "consumer_unsubscribed" in caplog.text
+
+
+# ---------------------------------------------------------------------------
+# Test queued mode
+# ---------------------------------------------------------------------------
+
+
+class GatedConsumer(MockConsumer):
+    """A consumer that waits for a gate before handling each event."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = asyncio.Event()
+
+    async def on_event(self, event: Event) -> None:
+        """Record the event once the gate is open."""
+        self.call_count += 1
+        await self.gate.wait()
+        self.events_received.append(event)
+
+
+def _update(block_id: str, result: str) -> UpdateBlock:
+    return UpdateBlock(
+        block_id=block_id,
+        content=ToolCallContent(
+            tool_name="Bash", tool_use_id=f"tool-{block_id}", label="ls", result=result
+        ),
+    )
+
+
+class TestQueuedEmitter:
+    """Tests for per-consumer queues with overflow policies."""
+
+    def test_invalid_arguments_raise(self) -> None:
+        """Non-positive queue sizes and unknown policies are rejected."""
+        with pytest.raises(ValueError):
+            EventEmitter(queue_size=0)
+        with pytest.raises(ValueError):
+            EventEmitter(queue_size=4, overflow="explode")
+
+    @pytest.mark.asyncio
+    async def test_events_delivered_in_order(self, user_block: Block) -> None:
+        """A slow consumer still receives events in emit order."""
+        emitter = EventEmitter(queue_size=100)
+        consumer = MockConsumer(delay=0.001)
+        emitter.subscribe(consumer)
+        events = [AddBlock(block=user_block)] + [_update("block-user-1", str(i)) for i in range(20)]
+
+        for event in events:
+            await emitter.emit(event)
+        await emitter.join()
+
+        assert consumer.events_received == events
+        assert emitter.queue_metrics()[0].delivered == 21
+        await emitter.close()
+
+    @pytest.mark.asyncio
+    async def test_block_policy_waits_for_room(self) -> None:
+        """With "block", emit() waits while the queue is full."""
+        emitter = EventEmitter(queue_size=1)
+        consumer = GatedConsumer()
+        emitter.subscribe(consumer)
+
+        await emitter.emit(_update("b", "0"))
+        await asyncio.sleep(0)  # worker takes the first event
+        await emitter.emit(_update("b", "1"))
+        pending = asyncio.create_task(emitter.emit(_update("b", "2")))
+        await asyncio.sleep(0.01)
+        assert not pending.done()
+
+        consumer.gate.set()
+        await pending
+        await emitter.join()
+        assert [e.content.result for e in consumer.events_received] == ["0", "1", "2"]
+        await emitter.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy(self) -> None:
+        """With "drop_oldest", the oldest queued event is discarded."""
+        emitter = EventEmitter(queue_size=2, overflow="drop_oldest")
+        consumer = GatedConsumer()
+        emitter.subscribe(consumer)
+
+        await emitter.emit(_update("a", "0"))
+        await asyncio.sleep(0)
+        for i in range(1, 5):
+            await emitter.emit(_update("a", str(i)))
+        metrics = emitter.queue_metrics()[0]
+        assert metrics.depth == 2
+        assert metrics.dropped == 2
+
+        consumer.gate.set()
+        await emitter.join()
+        assert [e.content.result for e in consumer.events_received] == ["0", "3", "4"]
+        await emitter.close()
+
+    @pytest.mark.asyncio
+    async def test_coalesce_policy_replaces_queued_update(self, user_block: Block) -> None:
+        """With "coalesce", a queued update of the same block is replaced in place."""
+        emitter = EventEmitter(queue_size=2, overflow="coalesce")
+        consumer = GatedConsumer()
+        emitter.subscribe(consumer)
+
+        await emitter.emit(AddBlock(block=user_block))
+        await asyncio.sleep(0)
+        await emitter.emit(_update("a", "1"))
+        await emitter.emit(_update("b", "1"))
+        await emitter.emit(_update("a", "2"))
+        await emitter.emit(_update("a", "3"))
+
+        metrics = emitter.queue_metrics()[0]
+        assert metrics.depth == 2
+        assert metrics.coalesced == 2
+
+        consumer.gate.set()
+        await emitter.join()
+        received = [(e.block_id, e.content.result) for e in consumer.events_received[1:]]
+        assert received == [("a", "3"), ("b", "1")]
+        await emitter.close()
+
+    @pytest.mark.asyncio
+    async def test_coalesce_policy_does_not_cross_clear_all(self) -> None:
+        """An update is never merged across a ClearAll; emit() waits instead."""
+        emitter = EventEmitter(queue_size=2, overflow="coalesce")
+        consumer = GatedConsumer()
+        emitter.subscribe(consumer)
+
+        await emitter.emit(ClearAll())
+        await asyncio.sleep(0)
+        await emitter.emit(_update("a", "1"))
+        await emitter.emit(ClearAll())
+        pending = asyncio.create_task(emitter.emit(_update("a", "2")))
+        await asyncio.sleep(0.01)
+        assert not pending.done()
+
+        consumer.gate.set()
+        await pending
+        await emitter.join()
+        assert len(consumer.events_received) == 4
+        assert emitter.queue_metrics()[0].coalesced == 0
+        await emitter.close()
+
+    @pytest.mark.asyncio
+    async def test_metrics_report_depth_and_lag(self) -> None:
+        """queue_metrics() reports depth and the age of the oldest event."""
+        emitter = EventEmitter(queue_size=10)
+        consumer = GatedConsumer()
+        emitter.subscribe(consumer)
+        assert emitter.queue_metrics() == [
+            QueueMetrics(
+                consumer_type="GatedConsumer", depth=0, lag=0.0, delivered=0, dropped=0, coalesced=0
+            )
+        ]
+
+        await emitter.emit(ClearAll())
+        await emitter.emit(ClearAll())
+        await asyncio.sleep(0.02)
+        metrics = emitter.queue_metrics()[0]
+        assert metrics.depth == 1
+        assert metrics.lag >= 0.02
+
+        consumer.gate.set()
+        await emitter.join()
+        metrics = emitter.queue_metrics()[0]
+        assert (metrics.depth, metrics.lag, metrics.delivered) == (0, 0.0, 2)
+        await emitter.close()
+
+    @pytest.mark.asyncio
+    async def test_failing_consumer_keeps_worker_running(self) -> None:
+        """A consumer exception is logged and later events are still delivered."""
+        emitter = EventEmitter(queue_size=4)
+        failing = FailingConsumer()
+        emitter.subscribe(failing)
+
+        await emitter.emit(ClearAll())
+        await emitter.emit(ClearAll())
+        await emitter.join()
+
+        assert failing.call_count == 2
+        await emitter.close()
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_cancels_worker(self) -> None:
+        """unsubscribe() stops the consumer's worker and drops its queue."""
+        emitter = EventEmitter(queue_size=4)
+        consumer = GatedConsumer()
+        emitter.subscribe(consumer)
+        await emitter.emit(ClearAll())
+        await asyncio.sleep(0)
+
+        emitter.unsubscribe(consumer)
+        await asyncio.sleep(0)
+
+        assert emitter.queue_metrics() == []
+        assert consumer.events_received == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("overflow", ["block", "coalesce"])
+    async def test_unsubscribe_releases_blocked_emit(self, overflow: str) -> None:
+        """An emit waiting on a full queue returns when its consumer is unsubscribed."""
+        emitter = EventEmitter(queue_size=1, overflow=overflow)
+        consumer = GatedConsumer()
+        emitter.subscribe(consumer)
+        await emitter.emit(ClearAll())
+        await asyncio.sleep(0)  # worker takes the first event
+        await emitter.emit(ClearAll())
+        pending = asyncio.create_task(emitter.emit(ClearAll()))
+        await asyncio.sleep(0.01)
+        assert not pending.done()
+
+        emitter.unsubscribe(consumer)
+
+        await asyncio.wait_for(pending, timeout=1)
+        assert consumer.events_received == []
+
+    @pytest.mark.asyncio
+    async def test_close_releases_blocked_emit(self) -> None:
+        """close() wakes emits waiting on a full queue, which then return."""
+        emitter = EventEmitter(queue_size=1)
+        consumer = GatedConsumer()
+        emitter.subscribe(consumer)
+        await emitter.emit(ClearAll())
+        await asyncio.sleep(0)
+        await emitter.emit(ClearAll())
+        pending = asyncio.create_task(emitter.emit(ClearAll()))
+        await asyncio.sleep(0.01)
+
+        await emitter.close()
+
+        await asyncio.wait_for(pending, timeout=1)
+        assert emitter.queue_metrics()[0].depth == 0
+
+
+class BatchMockConsumer(MockConsumer):
+    """A mock consumer that also implements on_events()."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[list[Event]] = []
+
+    async def on_events(self, events: list[Event]) -> None:
+        """Record the batch and its events."""
+        self.batches.append(list(events))
+        self.events_received.extend(events)
+
+
+class TestEmitBatch:
+    """Tests for emit_batch() and BatchConsumer detection."""
+
+    @pytest.mark.asyncio
+    async def test_batch_consumer_gets_one_call(self, emitter: EventEmitter) -> None:
+        """A BatchConsumer receives the whole batch in one on_events() call."""
+        consumer = BatchMockConsumer()
+        emitter.subscribe(consumer)
+        events = [_update("a", str(i)) for i in range(5)]
+
+        await emitter.emit_batch(events)
+        await asyncio.sleep(0.01)
+
+        assert consumer.batches == [events]
+        assert consumer.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_plain_consumer_gets_events_in_order(self, emitter: EventEmitter) -> None:
+        """Consumers without on_events() get each event, in order, from one task."""
+        consumer = MockConsumer(delay=0.001)
+        emitter.subscribe(consumer)
+        events = [_update("a", str(i)) for i in range(5)]
+
+        await emitter.emit_batch(events)
+        await asyncio.sleep(0.05)
+
+        assert consumer.events_received == events
+
+    @pytest.mark.asyncio
+    async def test_queued_worker_drains_backlog_as_batch(self) -> None:
+        """In queued mode a BatchConsumer receives everything queued at once."""
+        emitter = EventEmitter(queue_size=10)
+        consumer = BatchMockConsumer()
+        emitter.subscribe(consumer)
+        events = [_update("a", str(i)) for i in range(4)]
+
+        await emitter.emit_batch(events)
+        await emitter.join()
+
+        assert consumer.batches == [events]
+        assert emitter.queue_metrics()[0].delivered == 4
+        await emitter.close()
+
+    @pytest.mark.asyncio
+    async def test_failing_batch_is_logged(
+        self, emitter: EventEmitter, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """An exception from on_events() is logged, not raised."""
+
+        class FailingBatchConsumer(BatchMockConsumer):
+            async def on_events(self, events: list[Event]) -> None:
+                raise RuntimeError("batch failed")
+
+        emitter.subscribe(FailingBatchConsumer())
+        with caplog.at_level(logging.ERROR):
+            await emitter.emit_batch([ClearAll()])
+            await asyncio.sleep(0.01)
+
+        assert "batch_dispatch_failed" in caplog.text
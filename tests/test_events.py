@@ -11,6 +11,7 @@ from claude_session_player.events import (
     ClearAll,
     DurationContent,
     Event,
+    PatchBlock,
     ProcessingContext,
     Question,
     QuestionContent,
@@ -20,7 +21,9 @@ from claude_session_player.events import (
     ToolCallContent,
     UpdateBlock,
     UserContent,
+    content_changes,
     content_from_dict,
+    event_from_dict,
 )
 
 
@@ -128,6 +131,32 @@ class TestBlockContent:
         content = SystemContent(text="System message")
         assert content.text == "System message"
 
+    @pytest.mark.parametrize(
+        "instance",
+        [
+            UserContent(text="hi"),
+            AssistantContent(text="hi"),
+            ToolCallContent(tool_name="Bash", tool_use_id="t1", label="ls"),
+            QuestionContent(
+                tool_use_id="t1",
+                questions=[Question(question="q", header="h", options=[QuestionOption("a", "b")])],
+            ),
+            ThinkingContent(),
+            DurationContent(duration_ms=1),
+            SystemContent(text="hi"),
+            Block(id="b1", type=BlockType.USER, content=UserContent(text="hi")),
+            AddBlock(block=Block(id="b1", type=BlockType.USER, content=UserContent(text="hi"))),
+            UpdateBlock(block_id="b1", content=UserContent(text="hi")),
+            ClearAll(),
+        ],
+        ids=lambda instance: type(instance).__name__,
+    )
+    def test_slotted_without_instance_dict(self, instance: object) -> None:
+        """Blocks, contents and events are slotted (no per-instance __dict__)."""
+        assert not hasattr(instance, "__dict__")
+        with pytest.raises(AttributeError):
+            instance.unknown_attribute = 1  # type: ignore[attr-defined]
+
 
 class TestBlock:
     """Tests for Block dataclass."""
@@ -851,6 +880,85 @@ class TestContentFromDict:
             content_from_dict(data)
 
 
+class TestEventSerialization:
+    """Tests for Event to_dict/from_dict and event_from_dict."""
+
+    def test_add_block_to_dict(self) -> None:
+        """AddBlock serializes its block."""
+        block = Block(id="b1", type=BlockType.USER, content=UserContent(text="hi"))
+        assert AddBlock(block=block).to_dict() == {
+            "type": "add_block",
+            "block": block.to_dict(),
+        }
+
+    def test_update_block_to_dict(self) -> None:
+        """UpdateBlock serializes block_id and content."""
+        event = UpdateBlock(block_id="b1", content=SystemContent(text="x"))
+        assert event.to_dict() == {
+            "type": "update_block",
+            "block_id": "b1",
+            "content": {"type": "system", "text": "x"},
+        }
+
+    def test_clear_all_to_dict(self) -> None:
+        """ClearAll serializes to its type only."""
+        assert ClearAll().to_dict() == {"type": "clear_all"}
+
+    @pytest.mark.parametrize(
+        "event",
+        [
+            AddBlock(
+                block=Block(
+                    id="b1",
+                    type=BlockType.TOOL_CALL,
+                    content=ToolCallContent(tool_name="Bash", tool_use_id="t1", label="ls"),
+                    request_id="req_1",
+                )
+            ),
+            UpdateBlock(block_id="b1", content=DurationContent(duration_ms=5)),
+            PatchBlock(block_id="b1", changes={"result": "ok"}, base_version=2),
+            ClearAll(),
+        ],
+        ids=lambda event: type(event).__name__,
+    )
+    def test_event_from_dict_round_trip(self, event: Event) -> None:
+        """event_from_dict restores each event type."""
+        assert event_from_dict(event.to_dict()) == event
+
+    def test_event_from_dict_unknown_type_raises(self) -> None:
+        """Unknown event types raise KeyError."""
+        with pytest.raises(KeyError):
+            event_from_dict({"type": "remove_block"})
+
+
+class TestPatchBlock:
+    """Tests for PatchBlock and content_changes."""
+
+    def test_content_changes_lists_changed_fields(self) -> None:
+        """Only fields that differ are returned."""
+        old = ToolCallContent(tool_name="Bash", tool_use_id="t1", label="ls")
+        new = ToolCallContent(tool_name="Bash", tool_use_id="t1", label="ls", progress_text="1")
+
+        assert content_changes(old, new) == {"progress_text": "1"}
+        assert content_changes(new, new) == {}
+
+    def test_content_changes_different_types(self) -> None:
+        """A change of content type cannot be expressed as a patch."""
+        assert content_changes(UserContent(text="a"), SystemContent(text="a")) is None
+
+    def test_apply_restores_new_content(self) -> None:
+        """Applying the changes to the old content yields the new content."""
+        old = QuestionContent(
+            tool_use_id="t1",
+            questions=[Question(question="Q?", header="H", options=[])],
+        )
+        new = QuestionContent(tool_use_id="t1", questions=old.questions, answers={"Q?": "A"})
+        patch = PatchBlock(block_id="b1", changes=content_changes(old, new), base_version=0)
+
+        assert patch.apply(old) == new
+        assert old.answers is None
+
+
 class TestBlockSerialization:
     """Tests for Block to_dict/from_dict."""
 
@@ -1007,6 +1115,9 @@ class TestProcessingContextSerialization:
         assert result == {
             "tool_use_id_to_block_id": {},
             "current_request_id": None,
+            "tool_contents": {},
+            "question_contents": {},
+            "resolved_tool_use_ids": [],
         }
 
     def test_to_dict_returns_expected_dict_populated(self) -> None:
@@ -1019,6 +1130,9 @@ class TestProcessingContextSerialization:
         assert result == {
             "tool_use_id_to_block_id": {"toolu_1": "block_1", "toolu_2": "block_2"},
             "current_request_id": "req-123",
+            "tool_contents": {},
+            "question_contents": {},
+            "resolved_tool_use_ids": [],
         }
 
     def test_from_dict_reconstructs_object(self) -> None:
@@ -1063,3 +1177,63 @@ class TestProcessingContextSerialization:
         )
         restored = ProcessingContext.from_dict(original.to_dict())
         assert restored == original
+
+    def test_mark_resolved_prunes_oldest(self) -> None:
+        """mark_resolved() keeps only the most recent resolved tool calls."""
+        ctx = ProcessingContext()
+        for i in range(4):
+            ctx.tool_use_id_to_block_id[f"toolu_{i}"] = f"block_{i}"
+            ctx.tool_contents[f"toolu_{i}"] = ToolCallContent(
+                tool_name="Bash", tool_use_id=f"toolu_{i}", label="ls"
+            )
+        ctx.tool_use_id_to_block_id["open"] = "block_open"
+
+        for i in range(4):
+            ctx.mark_resolved(f"toolu_{i}", max_resolved=2)
+
+        assert ctx.resolved_tool_use_ids == ["toolu_2", "toolu_3"]
+        assert set(ctx.tool_use_id_to_block_id) == {"toolu_2", "toolu_3", "open"}
+        assert set(ctx.tool_contents) == {"toolu_2", "toolu_3"}
+
+    def test_mark_resolved_refreshes_existing_entry(self) -> None:
+        """Resolving a tool call again moves it to the most recent position."""
+        ctx = ProcessingContext()
+        for tool_use_id in ("a", "b", "a"):
+            ctx.mark_resolved(tool_use_id)
+        assert ctx.resolved_tool_use_ids == ["b", "a"]
+
+    def test_copy_is_independent(self) -> None:
+        """copy() returns a context whose mappings can change independently."""
+        content = ToolCallContent(tool_name="Bash", tool_use_id="toolu_1", label="ls")
+        original = ProcessingContext(
+            tool_use_id_to_block_id={"toolu_1": "block_1"},
+            current_request_id="req-1",
+            tool_contents={"toolu_1": content},
+        )
+
+        copied = original.copy()
+        copied.tool_use_id_to_block_id["toolu_2"] = "block_2"
+        copied.tool_contents.clear()
+        copied.current_request_id = None
+
+        assert copied != original
+        assert original.tool_use_id_to_block_id == {"toolu_1": "block_1"}
+        assert original.tool_contents == {"toolu_1": content}
+        assert original.current_request_id == "req-1"
+        assert original.copy() == original
+
+    def test_round_trip_with_tool_contents(self) -> None:
+        """Round-trip preserves open tool call and question contents."""
+        original = ProcessingContext(
+            tool_use_id_to_block_id={"toolu_1": "block_1", "toolu_2": "block_2"},
+            tool_contents={
+                "toolu_1": ToolCallContent(
+                    tool_name="Bash", tool_use_id="toolu_1", label="ls", progress_text="x"
+                ),
+            },
+            question_contents={
+                "toolu_2": QuestionContent(tool_use_id="toolu_2", questions=[]),
+            },
+        )
+        restored = ProcessingContext.from_dict(original.to_dict())
+        assert restored == original
@@ -0,0 +1,63 @@
+"""Tests for the JSON codec backends."""
+
+import json
+
+import pytest
+
+from claude_session_player import json_codec
+
+_PAYLOADS = [
+    {"type": "add_block", "block": {"id": "b1", "content": {"text": "hello"}}},
+    {"text": "héllo wörld 😀   \x7f", "escapes": "quote \" backslash \\ \n\t\r\b\f\x01\x1f"},
+    {"nested": [[], {}, [1, -2, 2**63 - 1], {"a": None, "b": True, "c": False}]},
+    {"floats": [0.1, 1.5, -2.25, 123456.789]},
+    [],
+    "plain string",
+    42,
+    None,
+]
+
+_BACKENDS = [
+    pytest.param(json_codec._stdlib_loads, json_codec._stdlib_dumps, id="stdlib"),
+    pytest.param(
+        json_codec._orjson_loads,
+        json_codec._orjson_dumps,
+        id="orjson",
+        marks=pytest.mark.skipif(json_codec.orjson is None, reason="orjson not installed"),
+    ),
+]
+
+
+class TestBackendSelection:
+
+    def test_backend_name(self) -> None:
+        expected = "orjson" if json_codec.orjson is not None else "json"
+        assert json_codec.BACKEND == expected
+
+
+@pytest.mark.parametrize(("loads", "dumps"), _BACKENDS)
+class TestBackends:
+
+    @pytest.mark.parametrize("obj", _PAYLOADS)
+    def test_dumps_matches_stdlib_bytes(self, loads, dumps, obj) -> None:
+        assert dumps(obj) == json_codec._stdlib_dumps(obj)
+
+    @pytest.mark.parametrize("obj", _PAYLOADS)
+    def test_round_trip(self, loads, dumps, obj) -> None:
+        assert loads(dumps(obj)) == obj
+
+    def test_loads_accepts_bytes_and_str(self, loads, dumps) -> None:
+        assert loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+        assert loads('{"a": [1, 2]}\n') == {"a": [1, 2]}
+
+    def test_loads_matches_stdlib_on_edge_cases(self, loads, dumps) -> None:
+        for raw in (b"NaN", b"[-Infinity]", '{"é": "\\ud83d\\ude00"}'.encode()):
+            assert repr(loads(raw)) == repr(json.loads(raw))
+
+    @pytest.mark.parametrize("raw", [b"not json", b'{"a": 1', b'{"a": "\xff"}', b""])
+    def test_invalid_input_raises_value_error(self, loads, dumps, raw) -> None:
+        with pytest.raises(ValueError):
+            loads(raw)
+
+    def test_dumps_non_string_keys(self, loads, dumps) -> None:
+        assert dumps({1: "a"}) == b'{"1":"a"}'
@@ -0,0 +1,217 @@
+"""Tests for the persistent LineIndex sidecar."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from claude_session_player import line_index as line_index_module
+from claude_session_player.consumer import replay_session
+from claude_session_player.line_index import LineIndex, sidecar_path_for
+from claude_session_player.parser import iter_session
+
+
+_BOUNDARY = {"type": "system", "subtype": "compact_boundary", "uuid": "u-boundary"}
+
+
+def _user(text: str, uuid: str) -> dict:
+    return {"type": "user", "uuid": uuid, "message": {"role": "user", "content": text}}
+
+
+def _write(path: Path, objs: list[dict], mode: str = "w") -> None:
+    with path.open(mode) as f:
+        for obj in objs:
+            f.write(json.dumps(obj) + "\n")
+
+
+@pytest.fixture
+def session_path(tmp_path: Path) -> Path:
+    path = tmp_path / "session.jsonl"
+    _write(path, [_user("one", "u-1"), _user("two", "u-2"), _BOUNDARY, _user("three", "u-3")])
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Building and querying
+# ---------------------------------------------------------------------------
+
+
+class TestBuild:
+    """Tests for building a LineIndex from scratch."""
+
+    def test_offsets_point_at_line_starts(self, session_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        data = session_path.read_bytes()
+        assert index.line_count == 4
+        for line in range(index.line_count):
+            assert index.offset_of(line) == 0 or data[index.offset_of(line) - 1:index.offset_of(line)] == b"\n"
+        assert index.indexed_size == len(data)
+
+    def test_skips_blank_lines(self, tmp_path: Path) -> None:
+        path = tmp_path / "s.jsonl"
+        path.write_text('{"a":1}\n\n   \n{"a":2}\n')
+        index = LineIndex.open(path)
+        assert index.line_count == 2
+        assert index.offset_of(1) == path.read_text().index('{"a":2}')
+
+    def test_partial_last_line_not_indexed(self, tmp_path: Path) -> None:
+        path = tmp_path / "s.jsonl"
+        path.write_text('{"a":1}\n{"a":')
+        index = LineIndex.open(path)
+        assert index.line_count == 1
+        assert index.indexed_size == len('{"a":1}\n')
+
+    def test_compact_boundaries_and_uuids(self, session_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        assert index.compact_boundaries == [2]
+        assert index.offset_of_uuid("u-3") == index.offset_of(3)
+        assert index.offset_of_uuid("missing") is None
+
+    def test_nested_uuid_keys_use_top_level(self, tmp_path: Path) -> None:
+        path = tmp_path / "s.jsonl"
+        _write(path, [{"toolUseResult": {"uuid": "inner"}, "uuid": "outer", "type": "user"}])
+        index = LineIndex.open(path)
+        assert index.uuid_to_line == {"outer": 0}
+
+    def test_nested_only_uuid_ignored(self, tmp_path: Path) -> None:
+        path = tmp_path / "s.jsonl"
+        _write(path, [{"type": "user", "toolUseResult": {"uuid": "inner", "text": "{"}}])
+        index = LineIndex.open(path)
+        assert index.uuid_to_line == {}
+
+    def test_uuid_after_nested_object(self, tmp_path: Path) -> None:
+        path = tmp_path / "s.jsonl"
+        _write(path, [{"message": {"content": "a } b"}, "uuid": "outer", "type": "user"}])
+        index = LineIndex.open(path)
+        assert index.uuid_to_line == {"outer": 0}
+
+    def test_offset_of_last_lines(self, session_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        assert index.offset_of_last_lines(2) == index.offset_of(2)
+        assert index.offset_of_last_lines(10) == 0
+
+    def test_small_read_chunks(self, session_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        expected = LineIndex.open(session_path, index_dir=session_path.parent / "a")
+        monkeypatch.setattr(line_index_module, "_READ_CHUNK_SIZE", 5)
+        index = LineIndex.open(session_path, index_dir=session_path.parent / "b")
+        assert list(index.offsets) == list(expected.offsets)
+        assert index.uuid_to_line == expected.uuid_to_line
+
+
+class TestReplayBounds:
+    """Tests for compaction-aware replay ranges."""
+
+    def test_compaction_offset(self, session_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        assert index.compaction_offset() == index.offset_of(3)
+        assert index.compaction_offset(before_line=1) == 0
+
+    def test_replay_at_line_matches_prefix_replay(self, session_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        all_lines = list(iter_session(session_path))
+        for line in range(index.line_count):
+            start, end = index.replay_bounds(line)
+            rendered = replay_session(iter_session(session_path, offset=start, end=end))
+            assert rendered == replay_session(all_lines[: line + 1])
+
+
+# ---------------------------------------------------------------------------
+# Persistence and invalidation
+# ---------------------------------------------------------------------------
+
+
+class TestPersistence:
+    """Tests for sidecar persistence and incremental refresh."""
+
+    def test_sidecar_written_and_reloaded(self, session_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        assert sidecar_path_for(session_path).exists()
+
+        reloaded = LineIndex(path=session_path, sidecar_path=index.sidecar_path)
+        reloaded._load()
+        assert list(reloaded.offsets) == list(index.offsets)
+        assert reloaded.compact_boundaries == index.compact_boundaries
+        assert reloaded.uuid_to_line == index.uuid_to_line
+        assert reloaded.indexed_size == index.indexed_size
+
+    def test_default_sidecar_not_beside_session(self, session_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        assert index.sidecar_path.parent == line_index_module.DEFAULT_INDEX_DIR
+        assert sorted(p.name for p in session_path.parent.iterdir()) == [session_path.name]
+
+    def test_index_dir_sidecar_location(self, session_path: Path, tmp_path: Path) -> None:
+        index_dir = tmp_path / "idx"
+        index = LineIndex.open(session_path, index_dir=index_dir)
+        assert index.sidecar_path.parent == index_dir
+        assert index.sidecar_path.exists()
+
+    def test_reopen_does_not_rescan(self, session_path: Path) -> None:
+        LineIndex.open(session_path)
+        index = LineIndex(path=session_path, sidecar_path=sidecar_path_for(session_path))
+        index._load()
+        assert index.refresh() is False
+
+    def test_refresh_extends_appended_lines(self, session_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        size = session_path.stat().st_size
+        _write(session_path, [_user("four", "u-4")], mode="a")
+        assert index.refresh() is True
+        assert index.line_count == 5
+        assert index.offset_of(4) == size
+        assert LineIndex.open(session_path).line_count == 5
+
+    def test_refresh_appends_to_sidecar(self, session_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        offsets_path = index.sidecar_path.with_name(index.sidecar_path.name + ".offsets")
+        inode = offsets_path.stat().st_ino
+        header_size = index.sidecar_path.stat().st_size
+        _write(session_path, [_user("four", "u-4")], mode="a")
+        index.refresh()
+        # Offsets are appended in place; the header doesn't grow with the uuids
+        assert offsets_path.stat().st_ino == inode
+        assert offsets_path.stat().st_size == 5 * 8
+        assert index.sidecar_path.stat().st_size == header_size
+        reloaded = LineIndex.open(session_path)
+        assert list(reloaded.offsets) == list(index.offsets)
+        assert reloaded.uuid_to_line == index.uuid_to_line
+
+    def test_records_past_header_ignored(self, session_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        for suffix in (".offsets", ".uuids"):
+            with index.sidecar_path.with_name(index.sidecar_path.name + suffix).open("ab") as f:
+                f.write(b"partial")
+        reloaded = LineIndex.open(session_path)
+        assert list(reloaded.offsets) == list(index.offsets)
+        assert reloaded.uuid_to_line == index.uuid_to_line
+        _write(session_path, [_user("four", "u-4")], mode="a")
+        reloaded.refresh()
+        assert LineIndex.open(session_path).uuid_to_line["u-4"] == 4
+
+    def test_truncation_rebuilds(self, session_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        with session_path.open("r+") as f:
+            f.truncate(0)
+        _write(session_path, [_user("new", "u-new")], mode="a")
+        index.refresh()
+        assert index.line_count == 1
+        assert index.uuid_to_line == {"u-new": 0}
+        assert index.compact_boundaries == []
+
+    def test_replaced_file_rebuilds(self, session_path: Path, tmp_path: Path) -> None:
+        index = LineIndex.open(session_path)
+        replacement = tmp_path / "replacement.jsonl"
+        _write(replacement, [_user("x" * 100, "u-a"), _user("y", "u-b"), _user("z", "u-c"),
+                             _user("w", "u-d"), _user("v", "u-e")])
+        os.replace(replacement, session_path)
+        index.refresh()
+        assert index.line_count == 5
+        assert "u-1" not in index.uuid_to_line
+
+    def test_corrupt_sidecar_ignored(self, session_path: Path) -> None:
+        sidecar = sidecar_path_for(session_path)
+        sidecar.write_bytes(b"garbage")
+        index = LineIndex.open(session_path)
+        assert index.line_count == 4
@@ -5,9 +5,11 @@ from pathlib import Path
 
 import pytest
 
+from claude_session_player import parser as parser_module
 from claude_session_player.parser import (
     LineType,
     classify_line,
+    find_last_compact_boundary,
     get_duration_ms,
     get_local_command_text,
     get_parent_tool_use_id,
@@ -16,6 +18,9 @@ from claude_session_player.parser import (
     get_tool_result_info,
     get_tool_use_info,
     get_user_text,
+    is_invisible_raw,
+    iter_session,
+    peek_line_type,
     read_session,
 )
 
@@ -328,6 +333,209 @@ class TestReadSession:
         assert [obj["index"] for obj in result] == [0, 1, 2, 3, 4]
 
 
+class TestIterSession:
+    """Tests for iter_session."""
+
+    def test_returns_generator(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        p.write_text('{"type":"user"}\n')
+        result = iter_session(p)
+        assert iter(result) is result
+        assert list(result) == [{"type": "user"}]
+
+    def test_matches_read_session(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        p.write_text('{"index":0}\n\nbad\n[1,2]\n{"index":1}\n')
+        assert list(iter_session(p)) == read_session(p) == [{"index": 0}, {"index": 1}]
+
+    def test_lazy_reads(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        p.write_text('{"index":0}\nnot json\n')
+        gen = iter_session(p)
+        assert next(gen) == {"index": 0}
+        # Append after the first line was consumed; the open file sees it
+        with p.open("a") as f:
+            f.write('{"index":1}\n')
+        assert list(gen) == [{"index": 1}]
+
+    def test_warnings_include_line_numbers(
+        self, tmp_path: Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        p = tmp_path / "test.jsonl"
+        p.write_text('{"type":"user"}\n\nnot json\n"a string"\n')
+        with caplog.at_level("WARNING", logger="claude_session_player.parser"):
+            list(iter_session(p))
+        messages = [r.getMessage() for r in caplog.records]
+        assert any(m.startswith("Line 3: failed to parse JSON") for m in messages)
+        assert "Line 4: expected dict, got str" in messages
+
+
+_BOUNDARY = {"type": "system", "subtype": "compact_boundary", "content": "Conversation compacted"}
+
+
+def _write_jsonl(path: Path, objs: list[dict]) -> list[int]:
+    """Write objects as JSONL and return the byte offset of each line."""
+    offsets: list[int] = []
+    data = b""
+    for obj in objs:
+        offsets.append(len(data))
+        data += json.dumps(obj).encode("utf-8") + b"\n"
+    path.write_bytes(data)
+    return offsets
+
+
+class TestFindLastCompactBoundary:
+    """Tests for find_last_compact_boundary."""
+
+    def test_no_boundary_returns_zero(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        _write_jsonl(p, [{"type": "user", "message": {"content": "hi"}}])
+        assert find_last_compact_boundary(p) == 0
+
+    def test_empty_file_returns_zero(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        p.write_bytes(b"")
+        assert find_last_compact_boundary(p) == 0
+
+    def test_returns_offset_after_last_boundary(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        offsets = _write_jsonl(p, [
+            {"type": "user", "message": {"content": "a"}},
+            _BOUNDARY,
+            {"type": "user", "message": {"content": "b"}},
+            _BOUNDARY,
+            {"type": "user", "message": {"content": "c"}},
+        ])
+        assert find_last_compact_boundary(p) == offsets[4]
+
+    def test_boundary_as_last_line_without_newline(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        p.write_text('{"type":"user"}\n' + json.dumps(_BOUNDARY))
+        assert find_last_compact_boundary(p) == p.stat().st_size
+
+    def test_marker_in_text_is_not_a_boundary(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        offsets = _write_jsonl(p, [
+            _BOUNDARY,
+            {"type": "user", "message": {"content": "what is \"compact_boundary\"?"}},
+            {"type": "progress", "data": {"type": "compact_boundary"}},
+        ])
+        assert find_last_compact_boundary(p) == offsets[1]
+
+    def test_lines_spanning_chunks(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(parser_module, "_REVERSE_SCAN_CHUNK_SIZE", 7)
+        p = tmp_path / "test.jsonl"
+        offsets = _write_jsonl(p, [
+            {"type": "user", "message": {"content": "x" * 50}},
+            _BOUNDARY,
+            {"type": "user", "message": {"content": "y" * 50}},
+            {"type": "user", "message": {"content": "z" * 50}},
+        ])
+        assert find_last_compact_boundary(p) == offsets[2]
+
+    def test_long_line_spanning_many_chunks(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(parser_module, "_REVERSE_SCAN_CHUNK_SIZE", 7)
+        p = tmp_path / "test.jsonl"
+        text = "x" * 200 + '"compact_boundary"' + "y" * 200
+        offsets = _write_jsonl(p, [
+            _BOUNDARY,
+            {"type": "user", "message": {"content": text}},
+            _BOUNDARY,
+            {"type": "user", "message": {"content": text}},
+        ])
+        assert find_last_compact_boundary(p) == offsets[3]
+
+
+class TestIterSessionFromLastCompaction:
+    """Tests for iter_session(from_last_compaction=True)."""
+
+    def test_yields_lines_after_last_boundary(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        _write_jsonl(p, [{"index": 0}, _BOUNDARY, {"index": 1}, _BOUNDARY, {"index": 2}])
+        assert list(iter_session(p, from_last_compaction=True)) == [{"index": 2}]
+
+    def test_without_boundary_yields_everything(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        _write_jsonl(p, [{"index": 0}, {"index": 1}])
+        assert list(iter_session(p, from_last_compaction=True)) == [{"index": 0}, {"index": 1}]
+
+
+_INVISIBLE_RAW_CASES = [
+    {"type": "summary", "summary": "s", "leafUuid": "u"},
+    {"type": "file-history-snapshot", "snapshot": {"type": "user"}},
+    {"type": "queue-operation", "operation": "enqueue"},
+    {"type": "pr-link", "url": "https://example.com"},
+    {"isSidechain": True, "type": "user", "message": {"content": "hi"}},
+    {"type": "assistant", "isSidechain": True, "message": {"content": []}},
+    # CLI key order: "type" follows the nested "message"
+    {"parentUuid": None, "isSidechain": True, "cwd": "C:\\work", "message": {"content": []},
+     "requestId": "r1", "type": "assistant", "uuid": "a1"},
+]
+
+_VISIBLE_RAW_CASES = [
+    {"type": "user", "isSidechain": False, "message": {"content": "hi"}},
+    {"parentUuid": "p", "isSidechain": False, "message": {"content": []}, "type": "assistant"},
+    {"type": "user", "message": {"content": [{"type": "summary"}]}},
+    {"type": "user", "message": {"content": '"type":"summary" "isSidechain":true'}},
+    {"type": "progress", "isSidechain": True, "data": {"type": "bash_progress"}},
+    {"data": {"type": "summary", "isSidechain": True}, "type": "system"},
+    {"message": {"type": "summary"}},
+    {"message": {"role": "user", "type": "summary"}, "uuid": "u"},
+]
+
+_PREFILTER_CASES = _INVISIBLE_RAW_CASES + _VISIBLE_RAW_CASES
+
+
+class TestRawLinePrefilter:
+    """Tests for is_invisible_raw and peek_line_type."""
+
+    @pytest.mark.parametrize("obj", _PREFILTER_CASES)
+    def test_never_hides_visible_lines(self, obj: dict) -> None:
+        for separators in ((",", ":"), (", ", ": ")):
+            raw = json.dumps(obj, separators=separators).encode("utf-8") + b"\n"
+            if is_invisible_raw(raw):
+                assert classify_line(obj) is LineType.INVISIBLE
+
+    @pytest.mark.parametrize("obj", _INVISIBLE_RAW_CASES)
+    def test_detects_invisible_lines(self, obj: dict) -> None:
+        assert is_invisible_raw(json.dumps(obj).encode("utf-8"))
+
+    @pytest.mark.parametrize("obj", _VISIBLE_RAW_CASES)
+    def test_keeps_other_lines(self, obj: dict) -> None:
+        assert not is_invisible_raw(json.dumps(obj).encode("utf-8"))
+
+    def test_malformed_lines_are_kept(self) -> None:
+        assert not is_invisible_raw(b'{"type":"summary"')
+        assert not is_invisible_raw(b'["type", "summary"]')
+        assert not is_invisible_raw(b"not json")
+
+    def test_peek_line_type(self) -> None:
+        assert peek_line_type(b'{"message":{"type":"x"},"type":"user"}') == "user"
+        assert peek_line_type(b'{"a":1, "type" : "user", "message":{}}') == "user"
+        assert peek_line_type(b'{"type":"caf\\u00e9"}') == "caf\u00e9"
+        assert peek_line_type(b'{"message":{"type":"x"}}') is None
+        assert peek_line_type(b'{"type":1}') is None
+
+
+class TestIterSessionSkipInvisible:
+    """Tests for iter_session(skip_invisible=True)."""
+
+    def test_drops_invisible_lines(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        _write_jsonl(p, _PREFILTER_CASES)
+        assert list(iter_session(p, skip_invisible=True)) == _VISIBLE_RAW_CASES
+        assert read_session(p, skip_invisible=True) == _VISIBLE_RAW_CASES
+
+    def test_default_keeps_everything(self, tmp_path: Path) -> None:
+        p = tmp_path / "test.jsonl"
+        _write_jsonl(p, _PREFILTER_CASES)
+        assert list(iter_session(p)) == _PREFILTER_CASES
+
+
 # ===================================================================
 # Real data integration test
 # ===================================================================
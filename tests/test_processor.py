@@ -2,6 +2,7 @@
 
 import pytest
 
+from claude_session_player.consumer import ScreenStateConsumer
 from claude_session_player.events import (
     AddBlock,
     AssistantContent,
@@ -9,6 +10,7 @@ from claude_session_player.events import (
     BlockType,
     ClearAll,
     DurationContent,
+    PatchBlock,
     ProcessingContext,
     SystemContent,
     ThinkingContent,
@@ -17,20 +19,14 @@ from claude_session_player.events import (
     UserContent,
 )
 from claude_session_player.processor import (
-    _clear_tool_content_cache,
-    _tool_content_cache,
+    DeltaEncoder,
+    coalesce_updates,
+    fold_updates,
     process_line,
+    process_lines,
 )
 
 
-@pytest.fixture(autouse=True)
-def clear_cache():
-    """Clear the tool content cache before each test."""
-    _clear_tool_content_cache()
-    yield
-    _clear_tool_content_cache()
-
-
 @pytest.fixture
 def context() -> ProcessingContext:
     """Return a fresh ProcessingContext."""
@@ -528,6 +524,18 @@ class TestCompactBoundary:
         assert context.tool_use_id_to_block_id == {}
         assert context.current_request_id is None
 
+    def test_compact_boundary_clears_tool_contents(
+        self, context: ProcessingContext, tool_use_line: dict, compact_boundary_line: dict
+    ) -> None:
+        """COMPACT_BOUNDARY drops stored tool call contents."""
+        process_line(context, tool_use_line)
+        assert "toolu_001" in context.tool_contents
+
+        process_line(context, compact_boundary_line)
+
+        assert context.tool_contents == {}
+        assert context.question_contents == {}
+
 
 class TestInvisible:
     """Tests for INVISIBLE line type."""
@@ -651,6 +659,66 @@ class TestToolUseIdMapping:
         assert events_B[0].block_id == block_id_B
         assert events_B[0].content.result == "B"
 
+    def test_resolved_tool_calls_are_bounded(self, context: ProcessingContext) -> None:
+        """Context size stays constant across thousands of resolved tool calls."""
+        from claude_session_player.events import MAX_RESOLVED_TOOL_CALLS
+
+        for i in range(MAX_RESOLVED_TOOL_CALLS * 4):
+            tool_use = {
+                "type": "assistant",
+                "requestId": "req_001",
+                "message": {"role": "assistant", "content": [
+                    {"type": "tool_use", "id": f"toolu_{i}", "name": "Bash", "input": {}}
+                ]},
+            }
+            result = {
+                "type": "user",
+                "message": {"role": "user", "content": [
+                    {"type": "tool_result", "tool_use_id": f"toolu_{i}", "content": "ok"}
+                ]},
+            }
+            process_line(context, tool_use)
+            events = process_line(context, result)
+            assert isinstance(events[0], UpdateBlock)
+
+        assert len(context.tool_use_id_to_block_id) == MAX_RESOLVED_TOOL_CALLS
+        assert len(context.tool_contents) == MAX_RESOLVED_TOOL_CALLS
+        assert "toolu_0" not in context.tool_use_id_to_block_id
+
+    def test_progress_after_result_still_updates(
+        self, context: ProcessingContext, tool_use_line: dict, tool_result_line: dict
+    ) -> None:
+        """Recently resolved tool calls still accept late progress updates."""
+        process_line(context, tool_use_line)
+        process_line(context, tool_result_line)
+
+        events = process_line(context, {
+            "type": "progress",
+            "parentToolUseID": "toolu_001",
+            "data": {"type": "hook_progress", "hookName": "PostToolUse"},
+        })
+
+        assert isinstance(events[0], UpdateBlock)
+        assert events[0].content.result == "file1.py\nfile2.py"
+        assert events[0].content.progress_text == "Hook: PostToolUse"
+
+    def test_interleaved_sessions_do_not_share_tool_state(
+        self, tool_use_line: dict, tool_result_line: dict
+    ) -> None:
+        """Tool contents are stored per context, not globally."""
+        session_a = ProcessingContext()
+        session_b = ProcessingContext()
+
+        process_line(session_a, tool_use_line)
+        # Same tool_use_id in another session without its tool_use line
+        session_b.tool_use_id_to_block_id["toolu_001"] = "block_b"
+        events_b = process_line(session_b, tool_result_line)
+        events_a = process_line(session_a, tool_result_line)
+
+        assert events_b[0].content.tool_name == ""
+        assert events_a[0].content.tool_name == "Bash"
+        assert "toolu_001" not in session_b.tool_contents
+
 
 class TestRequestIdGrouping:
     """Tests for request ID grouping in sequential assistant lines."""
@@ -727,3 +795,277 @@ class TestProgressWithoutMatch:
 
         events = process_line(context, agent_progress)
         assert events == []
+
+
+class TestProcessLines:
+    """Tests for batch processing with process_lines."""
+
+    @pytest.fixture
+    def session_lines(
+        self,
+        user_input_line: dict,
+        assistant_text_line: dict,
+        tool_use_line: dict,
+        bash_progress_line: dict,
+        tool_result_line: dict,
+        file_history_snapshot_line: dict,
+        turn_duration_line: dict,
+        compact_boundary_line: dict,
+    ) -> list[dict]:
+        """Return a session exercising adds, updates, invisible lines and a clear."""
+        return [
+            user_input_line,
+            assistant_text_line,
+            tool_use_line,
+            bash_progress_line,
+            file_history_snapshot_line,
+            tool_result_line,
+            turn_duration_line,
+            compact_boundary_line,
+            user_input_line,
+        ]
+
+    @staticmethod
+    def _shape(events: list) -> list[tuple]:
+        """Return events without their random block ids."""
+        return [
+            (
+                type(event).__name__,
+                getattr(getattr(event, "block", None), "content", None)
+                or getattr(event, "content", None),
+            )
+            for event in events
+        ]
+
+    def test_matches_process_line(self, session_lines: list[dict]) -> None:
+        """process_lines returns the concatenated process_line events."""
+        single_context = ProcessingContext()
+        expected = [
+            event for line in session_lines for event in process_line(single_context, line)
+        ]
+
+        batch_context = ProcessingContext()
+        events = process_lines(batch_context, session_lines)
+
+        assert self._shape(events) == self._shape(expected)
+        assert isinstance(events[-2], ClearAll)
+        assert batch_context.current_request_id == single_context.current_request_id
+
+    def test_emit_sink_receives_events_in_order(self, session_lines: list[dict]) -> None:
+        """With a sink, events are delivered to it and the result is empty."""
+        received: list = []
+
+        result = process_lines(ProcessingContext(), session_lines, received.append)
+
+        assert result == []
+        assert self._shape(received) == self._shape(
+            process_lines(ProcessingContext(), session_lines)
+        )
+
+    def test_accepts_generator(self, session_lines: list[dict]) -> None:
+        """Lines can be a lazy iterator."""
+        events = process_lines(ProcessingContext(), (line for line in session_lines))
+
+        assert len(events) == len(process_lines(ProcessingContext(), session_lines))
+
+    def test_empty_batch(self, context: ProcessingContext) -> None:
+        """No lines produce no events."""
+        assert process_lines(context, []) == []
+
+
+class TestCoalesceUpdates:
+    """Tests for coalescing superseded UpdateBlocks within a batch."""
+
+    @staticmethod
+    def _add(block_id: str) -> AddBlock:
+        return AddBlock(
+            block=Block(id=block_id, type=BlockType.USER, content=UserContent(text=block_id))
+        )
+
+    @staticmethod
+    def _update(block_id: str, progress: str) -> UpdateBlock:
+        return UpdateBlock(
+            block_id=block_id,
+            content=ToolCallContent(
+                tool_name="Bash", tool_use_id=block_id, label="ls", progress_text=progress
+            ),
+        )
+
+    def test_keeps_last_update_per_block(self) -> None:
+        """Consecutive updates of one block collapse to the last one."""
+        add = self._add("b1")
+        updates = [self._update("b1", f"step {i}") for i in range(5)]
+
+        assert coalesce_updates([add, *updates]) == [add, updates[-1]]
+
+    def test_interleaved_blocks_keep_relative_order(self) -> None:
+        """Updates of different blocks in one run each keep their last update."""
+        a1, b1, a2, b2, a3 = (
+            self._update("a", "1"),
+            self._update("b", "1"),
+            self._update("a", "2"),
+            self._update("b", "2"),
+            self._update("a", "3"),
+        )
+
+        assert coalesce_updates([a1, b1, a2, b2, a3]) == [b2, a3]
+
+    def test_never_crosses_add_block(self) -> None:
+        """An AddBlock between updates keeps both sides."""
+        before = self._update("a", "before")
+        add = self._add("b")
+        after = self._update("a", "after")
+
+        assert coalesce_updates([before, add, after]) == [before, add, after]
+
+    def test_never_crosses_clear_all(self) -> None:
+        """A ClearAll between updates keeps both sides."""
+        before = self._update("a", "before")
+        clear = ClearAll()
+        after = self._update("a", "after")
+
+        assert coalesce_updates([before, clear, after]) == [before, clear, after]
+
+    def test_no_updates_unchanged(self) -> None:
+        """Batches without updates are returned as is."""
+        events = [self._add("a"), ClearAll(), self._add("b")]
+
+        assert coalesce_updates(events) == events
+        assert coalesce_updates([]) == []
+
+    def test_progress_flood_same_final_state(
+        self,
+        tool_use_line: dict,
+        bash_progress_line: dict,
+        tool_result_line: dict,
+    ) -> None:
+        """A progress flood collapses without changing the rendered result."""
+        lines = [tool_use_line, *[bash_progress_line] * 50, tool_result_line]
+        events = process_lines(ProcessingContext(), lines)
+        coalesced = coalesce_updates(events)
+
+        assert len(events) == 52
+        assert [type(e) for e in coalesced] == [AddBlock, UpdateBlock]
+
+        full, reduced = ScreenStateConsumer(), ScreenStateConsumer()
+        for event in events:
+            full.handle(event)
+        for event in coalesced:
+            reduced.handle(event)
+        assert reduced.to_markdown() == full.to_markdown()
+
+
+class TestFoldUpdates:
+    """Tests for folding a batch's updates for messaging consumers."""
+
+    _add = staticmethod(TestCoalesceUpdates._add)
+    _update = staticmethod(TestCoalesceUpdates._update)
+
+    def test_update_folded_into_add(self) -> None:
+        """Updates of a block added in the batch become its AddBlock content."""
+        add = self._add("a")
+        other = self._add("b")
+        last = self._update("a", "2")
+
+        folded = fold_updates([add, self._update("a", "1"), other, last])
+
+        assert len(folded) == 2
+        assert folded[0].block.id == "a"
+        assert folded[0].block.content is last.content
+        assert folded[1] is other
+        assert add.block.content == UserContent(text="a")
+
+    def test_keeps_last_update_across_add_block(self) -> None:
+        """Only the last update of an earlier block survives, even across AddBlocks."""
+        first = self._update("a", "1")
+        add = self._add("b")
+        last = self._update("a", "2")
+
+        assert fold_updates([first, add, last]) == [add, last]
+
+    def test_clear_all_is_barrier(self) -> None:
+        """Nothing is folded across a ClearAll."""
+        add = self._add("a")
+        clear = ClearAll()
+        update = self._update("a", "1")
+
+        assert fold_updates([add, clear, update]) == [add, clear, update]
+
+    def test_same_final_state(
+        self,
+        tool_use_line: dict,
+        bash_progress_line: dict,
+        tool_result_line: dict,
+    ) -> None:
+        """Folding a progress flood leaves one AddBlock with the final content."""
+        lines = [tool_use_line, *[bash_progress_line] * 20, tool_result_line]
+        events = process_lines(ProcessingContext(), lines)
+        folded = fold_updates(events)
+
+        assert [type(e) for e in folded] == [AddBlock]
+        full, reduced = ScreenStateConsumer(), ScreenStateConsumer()
+        for event in events:
+            full.handle(event)
+        for event in folded:
+            reduced.handle(event)
+        assert reduced.to_markdown() == full.to_markdown()
+
+
+class TestDeltaEncoder:
+    """Tests for deriving PatchBlocks from UpdateBlocks."""
+
+    def test_session_replays_identically_with_patches(
+        self,
+        tool_use_line: dict,
+        bash_progress_line: dict,
+        tool_result_line: dict,
+    ) -> None:
+        """Replacing updates by their patches renders the same screen."""
+        events = process_lines(
+            ProcessingContext(), [tool_use_line, bash_progress_line, tool_result_line]
+        )
+        encoder = DeltaEncoder()
+        delta_events = [encoder.encode(event) or event for event in events]
+
+        assert [type(e) for e in delta_events] == [AddBlock, PatchBlock, PatchBlock]
+        assert [e.base_version for e in delta_events[1:]] == [0, 1]
+        assert "label" not in delta_events[1].changes
+
+        full, delta = ScreenStateConsumer(), ScreenStateConsumer()
+        for event in events:
+            full.handle(event)
+        for event in delta_events:
+            delta.handle(event)
+        assert delta.blocks == full.blocks
+
+    def test_untracked_block_has_no_patch(self) -> None:
+        """Updates of blocks never seen added stay full updates."""
+        encoder = DeltaEncoder()
+        update = UpdateBlock(block_id="b1", content=SystemContent(text="x"))
+
+        assert encoder.encode(update) is None
+        assert encoder.encode(update) is None
+
+    def test_clear_all_forgets_blocks(self) -> None:
+        """After ClearAll no earlier block is tracked."""
+        encoder = DeltaEncoder()
+        encoder.encode(
+            AddBlock(block=Block(id="b1", type=BlockType.SYSTEM, content=SystemContent(text="a")))
+        )
+        encoder.encode(ClearAll())
+
+        assert encoder.encode(UpdateBlock(block_id="b1", content=SystemContent(text="b"))) is None
+
+    def test_evicts_least_recently_updated_block(self) -> None:
+        """Only the most recently touched blocks are tracked."""
+        encoder = DeltaEncoder(max_blocks=2)
+        for block_id in ("b1", "b2", "b3"):
+            encoder.encode(
+                AddBlock(
+                    block=Block(id=block_id, type=BlockType.SYSTEM, content=SystemContent(text=""))
+                )
+            )
+
+        assert encoder.encode(UpdateBlock(block_id="b1", content=SystemContent(text="x"))) is None
+        patch = encoder.encode(UpdateBlock(block_id="b3", content=SystemContent(text="x")))
+        assert patch == PatchBlock(block_id="b3", changes={"text": "x"}, base_version=0)
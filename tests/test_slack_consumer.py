@@ -25,7 +25,7 @@ from claude_session_player.events import (
     UpdateBlock,
     UserContent,
 )
-from claude_session_player.protocol import Consumer
+from claude_session_player.protocol import BatchConsumer, Consumer
 from claude_session_player.slack_consumer import SLACK_MESSAGE_LIMIT, SlackConsumer
 
 
@@ -247,6 +247,67 @@ class TestUpdateBlock:
         assert "update_block_skipped" in caplog.text
 
 
+class TestOnEvents:
+    """Tests for batched event delivery."""
+
+    def test_is_batch_consumer(self, consumer: SlackConsumer) -> None:
+        """SlackConsumer implements the optional BatchConsumer protocol."""
+        assert isinstance(consumer, BatchConsumer)
+
+    @pytest.mark.asyncio
+    async def test_added_and_updated_block_posted_once(
+        self,
+        consumer: SlackConsumer,
+        mock_client: AsyncMock,
+        tool_call_block: Block,
+    ) -> None:
+        """A block added and updated within a batch is posted once, with its final state."""
+        events = [AddBlock(block=tool_call_block)] + [
+            UpdateBlock(
+                block_id=tool_call_block.id,
+                content=ToolCallContent(
+                    tool_name="Read", tool_use_id="tool-1", label="file.txt", result=f"v{i}"
+                ),
+            )
+            for i in range(3)
+        ]
+
+        await consumer.on_events(events)
+
+        mock_client.chat_postMessage.assert_called_once()
+        assert "v2" in mock_client.chat_postMessage.call_args.kwargs["text"]
+        mock_client.chat_update.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_existing_block_edited_once(
+        self,
+        consumer: SlackConsumer,
+        mock_client: AsyncMock,
+        tool_call_block: Block,
+        user_block: Block,
+    ) -> None:
+        """Several updates of an already posted block produce one edit."""
+        await consumer.on_event(AddBlock(block=tool_call_block))
+        events = []
+        for i in range(3):
+            events.append(
+                UpdateBlock(
+                    block_id=tool_call_block.id,
+                    content=ToolCallContent(
+                        tool_name="Read", tool_use_id="tool-1", label="file.txt", result=f"v{i}"
+                    ),
+                )
+            )
+            if i == 0:
+                events.append(AddBlock(block=user_block))
+
+        await consumer.on_events(events)
+
+        mock_client.chat_update.assert_called_once()
+        assert "v2" in mock_client.chat_update.call_args.kwargs["text"]
+        assert mock_client.chat_postMessage.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # Test ClearAll event handling
 # ---------------------------------------------------------------------------
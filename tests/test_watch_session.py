@@ -225,3 +225,145 @@ class TestSessionWatcher:
         content = output_path.read_text()
         assert "Read(file.txt)" in content
         assert "File contents here" in content
+
+
+def _load_watch_session():
+    from importlib.util import module_from_spec, spec_from_file_location
+
+    spec = spec_from_file_location("watch_session", bin_dir / "watch-session.py")
+    assert spec is not None
+    assert spec.loader is not None
+    watch_session = module_from_spec(spec)
+    spec.loader.exec_module(watch_session)
+    return watch_session
+
+
+class TestMarkdownFileWriter:
+    """Tests for the append-and-patch markdown writer."""
+
+    @pytest.fixture
+    def writer(self, tmp_path: Path):
+        from claude_session_player.consumer import ScreenStateConsumer
+
+        watch_session = _load_watch_session()
+        return watch_session.MarkdownFileWriter(tmp_path / "output.md", ScreenStateConsumer())
+
+    @staticmethod
+    def _user(block_id: str, text: str):
+        from claude_session_player.events import AddBlock, Block, BlockType, UserContent
+
+        return AddBlock(block=Block(id=block_id, type=BlockType.USER, content=UserContent(text=text)))
+
+    @staticmethod
+    def _tool(result: str | None):
+        from claude_session_player.events import Block, BlockType, ToolCallContent
+
+        return Block(
+            id="tool",
+            type=BlockType.TOOL_CALL,
+            content=ToolCallContent(
+                tool_name="Bash", tool_use_id="t1", label="ls", result=result
+            ),
+        )
+
+    def _check(self, writer) -> None:
+        assert writer.path.read_text(encoding="utf-8") == writer.consumer.to_markdown()
+
+    def test_first_sync_rewrites(self, writer) -> None:
+        writer.consumer.handle(self._user("u1", "Hello"))
+        assert writer.sync() == "rewrite"
+        self._check(writer)
+
+    def test_new_blocks_are_appended(self, writer) -> None:
+        writer.consumer.handle(self._user("u1", "Hello"))
+        writer.sync()
+        writer.consumer.handle(self._user("u2", "Héllo again"))
+        assert writer.sync() == "append"
+        self._check(writer)
+        assert writer.sync() == "unchanged"
+
+    def test_recent_update_patches_tail(self, writer) -> None:
+        from claude_session_player.events import AddBlock, UpdateBlock
+
+        writer.consumer.handle(self._user("u1", "Hello"))
+        writer.consumer.handle(AddBlock(block=self._tool(None)))
+        writer.sync()
+        writer.consumer.handle(UpdateBlock(block_id="tool", content=self._tool("ok").content))
+        assert writer.sync() == "patch"
+        self._check(writer)
+        # Shrinking the tail truncates the file
+        writer.consumer.handle(UpdateBlock(block_id="tool", content=self._tool(None).content))
+        assert writer.sync() == "patch"
+        self._check(writer)
+
+    def test_old_update_rewrites(self, tmp_path: Path) -> None:
+        from claude_session_player.consumer import ScreenStateConsumer
+        from claude_session_player.events import AddBlock, UpdateBlock
+
+        watch_session = _load_watch_session()
+        writer = watch_session.MarkdownFileWriter(
+            tmp_path / "output.md", ScreenStateConsumer(), max_patch_bytes=16
+        )
+        writer.consumer.handle(AddBlock(block=self._tool(None)))
+        writer.consumer.handle(self._user("u1", "x" * 100))
+        writer.sync()
+        writer.consumer.handle(UpdateBlock(block_id="tool", content=self._tool("ok").content))
+        assert writer.sync() == "rewrite"
+        self._check(writer)
+        assert list(tmp_path.iterdir()) == [writer.path]
+
+    def test_clear_all_rewrites(self, writer) -> None:
+        from claude_session_player.events import ClearAll
+
+        writer.consumer.handle(self._user("u1", "Hello"))
+        writer.sync()
+        writer.consumer.handle(ClearAll())
+        writer.consumer.handle(self._user("u2", "Fresh"))
+        assert writer.sync() == "rewrite"
+        self._check(writer)
+
+    def test_external_change_rewrites(self, writer) -> None:
+        writer.consumer.handle(self._user("u1", "Hello"))
+        writer.sync()
+        writer.path.write_text("edited elsewhere", encoding="utf-8")
+        writer.consumer.handle(self._user("u2", "More"))
+        assert writer.sync() == "rewrite"
+        self._check(writer)
+
+    def test_patch_replaces_file_atomically(self, writer) -> None:
+        from claude_session_player.events import AddBlock, UpdateBlock
+
+        writer.consumer.handle(self._user("u1", "Hello"))
+        writer.consumer.handle(AddBlock(block=self._tool(None)))
+        writer.sync()
+        inode = writer.path.stat().st_ino
+        writer.consumer.handle(UpdateBlock(block_id="tool", content=self._tool("ok").content))
+        assert writer.sync() == "patch"
+        self._check(writer)
+        # Renamed over the old file rather than truncated in place
+        assert writer.path.stat().st_ino != inode
+        assert list(writer.path.parent.iterdir()) == [writer.path]
+
+    def test_mode_preserved(self, writer) -> None:
+        import os
+        import stat
+
+        from claude_session_player.events import AddBlock, UpdateBlock
+
+        umask = os.umask(0o022)
+        try:
+            writer.consumer.handle(self._user("u1", "Hello"))
+            writer.consumer.handle(AddBlock(block=self._tool(None)))
+            writer.sync()
+        finally:
+            os.umask(umask)
+        assert stat.S_IMODE(writer.path.stat().st_mode) == 0o644
+
+        writer.path.chmod(0o640)
+        writer.consumer.handle(UpdateBlock(block_id="tool", content=self._tool("ok").content))
+        assert writer.sync() == "patch"
+        assert stat.S_IMODE(writer.path.stat().st_mode) == 0o640
+        writer.consumer.handle(self._user("u2", "x"))
+        writer.path.write_text("edited elsewhere", encoding="utf-8")
+        assert writer.sync() == "rewrite"
+        assert stat.S_IMODE(writer.path.stat().st_mode) == 0o640
@@ -847,6 +847,36 @@ class TestHandleHealth:
         assert isinstance(data["uptime_seconds"], int)
         assert data["uptime_seconds"] >= 0
 
+    async def test_health_returns_json_backend(self, watcher_api: WatcherAPI) -> None:
+        """GET /health reports the active JSON codec backend."""
+        from claude_session_player import json_codec
+
+        request = MockRequest()
+
+        response = await watcher_api.handle_health(request)
+
+        data = json.loads(response.body)
+        assert data["json_backend"] == json_codec.BACKEND
+
+    async def test_health_returns_render_cache_stats(self, watcher_api: WatcherAPI) -> None:
+        """GET /health reports render cache size and counters when available."""
+        from claude_session_player.watcher.render_cache import RenderCache
+
+        request = MockRequest()
+        response = await watcher_api.handle_health(request)
+        assert "render_cache" not in json.loads(response.body)
+
+        watcher_api.render_cache = RenderCache()
+        watcher_api.render_cache.rebuild("s", [])
+        watcher_api.render_cache.get("s", "desktop")
+
+        response = await watcher_api.handle_health(request)
+
+        stats = json.loads(response.body)["render_cache"]
+        assert stats["sessions"] == 1
+        assert stats["misses"] == 1
+        assert stats["session_bytes"]["s"] == stats["bytes"] > 0
+
     async def test_health_returns_bot_status_not_configured(
         self, watcher_api: WatcherAPI
     ) -> None:
@@ -803,6 +803,52 @@ class TestProgressUpdates:
             await watcher_service.stop()
 
 
+    async def test_progress_flood_coalesced_within_batch(
+        self, watcher_service: WatcherService, session_file: Path
+    ) -> None:
+        """Test that a batch of progress lines does not evict earlier content."""
+        try:
+            await watcher_service.start()
+            await watcher_service.watch("flood-e2e", session_file)
+
+            user_line = {"type": "user", "message": {"content": "Run the build"}}
+            tool_use_line = {
+                "type": "assistant",
+                "message": {
+                    "content": [{
+                        "type": "tool_use",
+                        "id": "flood_tu_001",
+                        "name": "Bash",
+                        "input": {"command": "make"}
+                    }]
+                }
+            }
+            progress_lines = [
+                {
+                    "type": "progress",
+                    "parentToolUseID": "flood_tu_001",
+                    "data": {"type": "bash_progress", "fullOutput": f"step {i}"}
+                }
+                for i in range(50)
+            ]
+            await watcher_service._on_file_change(
+                "flood-e2e", [user_line, tool_use_line, *progress_lines]
+            )
+
+            response = MockStreamResponse()
+            await watcher_service.sse_manager.connect("flood-e2e", response)
+
+            events = response.get_events()
+            assert [e.get("event") for e in events] == [
+                "add_block", "add_block", "update_block"
+            ]
+            assert events[0]["data"]["content"]["text"] == "Run the build"
+            assert events[2]["data"]["content"]["progress_text"] == "step 49"
+
+        finally:
+            await watcher_service.stop()
+
+
 # --- E2E Tests: Event Buffer Limits ---
 
 
@@ -12,7 +12,13 @@ from claude_session_player.events import (
     ClearAll,
     UpdateBlock,
 )
-from claude_session_player.watcher.event_buffer import EventBuffer, EventBufferManager
+from claude_session_player.watcher.event_buffer import (
+    BufferSnapshot,
+    EventBuffer,
+    EventBufferManager,
+    format_event_id,
+    parse_event_id,
+)
 
 
 # --- Helper functions ---
@@ -229,15 +235,60 @@ class TestEventBufferClear:
         assert len(buffer) == 0
         assert buffer.get_since(None) == []
 
-    def test_clear_resets_id_counter(self) -> None:
-        """clear() resets the ID counter."""
+    def test_clear_keeps_id_counter(self) -> None:
+        """clear() does not reuse event IDs, so old IDs stay unambiguous."""
         buffer = EventBuffer()
         buffer.add(make_add_block_event("a"))  # evt_001
         buffer.add(make_add_block_event("b"))  # evt_002
         buffer.clear()
 
         event_id = buffer.add(make_add_block_event("c"))
-        assert event_id == "evt_001"
+        assert event_id == "evt_003"
+        assert [eid for eid, _ in buffer.get_since("evt_002")] == ["evt_003"]
+
+
+class TestEventBufferIds:
+    """Tests for integer-backed event IDs and offset-based replay."""
+
+    def test_format_and_parse_round_trip(self) -> None:
+        """IDs are zero-padded to three digits and parse back to integers."""
+        assert format_event_id(7) == "evt_007"
+        assert format_event_id(12345) == "evt_12345"
+        for seq in (1, 999, 1000, 10**9):
+            assert parse_event_id(format_event_id(seq)) == seq
+
+    @pytest.mark.parametrize("bad", ["", "evt_", "evt_x1", "event_001", "evt_-1", "evt_１"])
+    def test_parse_rejects_malformed(self, bad: str) -> None:
+        """Malformed IDs parse to None."""
+        assert parse_event_id(bad) is None
+
+    def test_replay_past_999(self) -> None:
+        """Replay positions stay correct once IDs outgrow three digits."""
+        buffer = EventBuffer(max_size=50)
+        for i in range(1020):
+            buffer.add(make_add_block_event(str(i)))
+
+        since = buffer.get_since("evt_1009")
+
+        assert [eid for eid, _ in since] == [f"evt_{n}" for n in range(1010, 1021)]
+        assert since[-1][1].block.content.text == "1019"
+
+    def test_replay_from_newest_is_empty(self) -> None:
+        """Replaying after the newest ID returns nothing."""
+        buffer = EventBuffer()
+        buffer.add(make_add_block_event("a"))
+        last = buffer.add(make_add_block_event("b"))
+
+        assert buffer.get_since(last) == []
+
+    @pytest.mark.parametrize("last_id", ["evt_999", "garbage", "evt_000"])
+    def test_unknown_or_malformed_id_replays_all(self, last_id: str) -> None:
+        """IDs outside the buffered range replay the whole buffer."""
+        buffer = EventBuffer()
+        buffer.add(make_add_block_event("a"))
+        buffer.add(make_add_block_event("b"))
+
+        assert [eid for eid, _ in buffer.get_since(last_id)] == ["evt_001", "evt_002"]
 
 
 class TestEventBufferEventTypes:
@@ -287,6 +338,178 @@ class TestEventBufferEventTypes:
         assert isinstance(events[2][1], ClearAll)
 
 
+class TestEventBufferCompact:
+    """Tests for buffers storing encoded events."""
+
+    def test_compact_buffer_replays_equal_events(self) -> None:
+        """Compact buffers return events equal to the ones added."""
+        events = [make_add_block_event("a"), make_update_block_event(), ClearAll()]
+        buffer = EventBuffer(compact=True)
+        ids = [buffer.add(event) for event in events]
+
+        assert buffer.get_since(None) == list(zip(ids, events))
+        assert buffer.get_since(ids[0]) == list(zip(ids[1:], events[1:]))
+
+    def test_compact_buffer_stores_bytes(self) -> None:
+        """Compact buffers hold encoded records, not event objects."""
+        buffer = EventBuffer(compact=True)
+        buffer.add(make_add_block_event())
+
+        assert all(isinstance(data, bytes) for data in buffer._buffer)
+
+    def test_manager_creates_compact_buffers(self) -> None:
+        """EventBufferManager passes compact to the buffers it creates."""
+        manager = EventBufferManager(compact=True)
+
+        assert manager.get_buffer("s1").compact is True
+
+
+class TestEventBufferSnapshot:
+    """Tests for buffers folding events into a block snapshot."""
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_snapshot_survives_eviction(self, compact: bool) -> None:
+        """Updates that evict the AddBlock from the ring are folded into it."""
+        buffer = EventBuffer(max_size=3, compact=compact, snapshot=True)
+        buffer.add(make_add_block_event("a"))
+        buffer.add(make_add_block_event("b"))
+        for i in range(10):
+            buffer.add(make_update_block_event("block_a", f"a{i}"))
+
+        assert len(buffer) == 3
+        snapshot = buffer.get_snapshot()
+        assert snapshot.event_id == "evt_012"
+        assert [b.id for b in snapshot.blocks] == ["block_a", "block_b"]
+        assert snapshot.blocks[0].content.text == "a9"
+        assert snapshot.blocks[1].content.text == "b"
+        assert snapshot.versions == [10, 0]
+
+    def test_snapshot_starts_after_clear_all(self) -> None:
+        """ClearAll empties the snapshot."""
+        buffer = EventBuffer(snapshot=True)
+        buffer.add(make_add_block_event("a"))
+        buffer.add(ClearAll())
+        buffer.add(make_add_block_event("b"))
+
+        assert [b.id for b in buffer.get_snapshot().blocks] == ["block_b"]
+
+    def test_snapshot_ignores_updates_for_unknown_blocks(self, caplog) -> None:
+        """Updates for blocks that were never added are ignored with a warning."""
+        buffer = EventBuffer(snapshot=True)
+        buffer.add(make_update_block_event("missing"))
+
+        assert buffer.get_snapshot() == BufferSnapshot("evt_001", [], [])
+        assert "unknown block missing" in caplog.text
+
+    def test_empty_snapshot(self) -> None:
+        """A new snapshot buffer has no event ID and no blocks."""
+        assert EventBuffer(snapshot=True).get_snapshot() == BufferSnapshot(None, [], [])
+
+    def test_get_snapshot_requires_snapshot_mode(self) -> None:
+        """get_snapshot() raises ValueError on a plain buffer."""
+        with pytest.raises(ValueError):
+            EventBuffer().get_snapshot()
+
+    def test_replay_tail_unchanged(self) -> None:
+        """Snapshot mode doesn't change replay from the ring."""
+        buffer = EventBuffer(max_size=2, snapshot=True)
+        for text in "abc":
+            buffer.add(make_add_block_event(text))
+
+        assert [e.block.id for _, e in buffer.get_since(None)] == ["block_b", "block_c"]
+
+    def test_manager_state_events(self) -> None:
+        """get_state_events() returns AddBlocks for the snapshot."""
+        manager = EventBufferManager(max_size_per_session=2, snapshot=True)
+        manager.add_event("s1", make_add_block_event("a"))
+        for i in range(5):
+            manager.add_event("s1", make_update_block_event("block_a", f"a{i}"))
+
+        events = manager.get_state_events("s1")
+        assert len(events) == 1
+        assert isinstance(events[0], AddBlock)
+        assert events[0].block.content.text == "a4"
+
+    def test_manager_state_events_without_snapshot(self) -> None:
+        """Without snapshot mode get_state_events() returns the buffered events."""
+        manager = EventBufferManager()
+        events = [make_add_block_event("a"), make_update_block_event("block_a")]
+        for event in events:
+            manager.add_event("s1", event)
+
+        assert manager.get_state_events("s1") == events
+
+    def test_manager_folds_existing_log(self, tmp_path) -> None:
+        """A snapshot buffer over an existing log starts from its state."""
+        manager = EventBufferManager(snapshot=True, log_dir=tmp_path)
+        manager.add_event("s1", make_add_block_event("a"))
+        manager.add_event("s1", make_update_block_event("block_a", "a2"))
+
+        restarted = EventBufferManager(snapshot=True, log_dir=tmp_path)
+        snapshot = restarted.get_buffer("s1").get_snapshot()
+        assert snapshot.event_id == "evt_002"
+        assert [b.content.text for b in snapshot.blocks] == ["a2"]
+        assert snapshot.versions == [1]
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_manager_restores_checkpoint_after_retention(
+        self, tmp_path, monkeypatch, compact: bool
+    ) -> None:
+        """Blocks whose AddBlock retention dropped survive a restart via the checkpoint."""
+        settings = dict(
+            compact=compact,
+            snapshot=True,
+            log_dir=tmp_path,
+            log_segment_bytes=200,
+            log_max_bytes=400,
+        )
+        manager = EventBufferManager(**settings)
+        manager.add_event("s1", make_add_block_event("a"))
+        manager.add_event("s1", make_add_block_event("b"))
+        for i in range(40):
+            manager.add_event("s1", make_update_block_event("block_a", f"a{i}"))
+        log = manager.get_log("s1")
+        assert log.first_seq > 2  # both AddBlocks were dropped
+
+        folded = []
+        original_fold = EventBuffer._fold
+
+        def counting_fold(self, event) -> None:
+            folded.append(event)
+            original_fold(self, event)
+
+        monkeypatch.setattr(EventBuffer, "_fold", counting_fold)
+        restarted = EventBufferManager(**settings)
+        snapshot = restarted.get_snapshot("s1")
+        assert snapshot == manager.get_snapshot("s1")
+        assert [b.content.text for b in snapshot.blocks] == ["a39", "b"]
+        assert snapshot.versions == [40, 0]
+        # Only the events after the checkpoint are folded, not the whole log
+        assert 0 < len(folded) < len(log)
+
+    def test_manager_keeps_one_checkpoint(self, tmp_path) -> None:
+        """Starting a segment replaces the previous checkpoint."""
+        manager = EventBufferManager(snapshot=True, log_dir=tmp_path, log_segment_bytes=1)
+        for text in "abc":
+            manager.add_event("s1", make_add_block_event(text))
+
+        assert [p.name for p in (tmp_path / "s1").glob("*.ckpt")] == [
+            "00000000000000000003.ckpt"
+        ]
+
+    def test_manager_snapshot_without_snapshot_mode(self) -> None:
+        """Without snapshot mode get_snapshot() folds the retained events."""
+        manager = EventBufferManager()
+        manager.add_event("s1", make_add_block_event("a"))
+        manager.add_event("s1", make_update_block_event("block_a", "a2"))
+
+        snapshot = manager.get_snapshot("s1")
+        assert snapshot.event_id == "evt_002"
+        assert [b.content.text for b in snapshot.blocks] == ["a2"]
+        assert snapshot.versions == [1]
+        assert manager.get_snapshot("unknown") == BufferSnapshot(None, [], [])
+
+
 # --- EventBufferManager tests ---
 
 
@@ -0,0 +1,263 @@
+"""Tests for the disk-backed event log."""
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from claude_session_player.events import AddBlock, AssistantContent, Block, BlockType
+from claude_session_player.watcher.event_buffer import EventBufferManager
+from claude_session_player.watcher.event_log import CHECKPOINT_SUFFIX, SEGMENT_SUFFIX, EventLog
+
+
+def make_event(text: str) -> AddBlock:
+    """Create a simple AddBlock event for testing."""
+    return AddBlock(
+        block=Block(
+            id=f"block_{text}",
+            type=BlockType.ASSISTANT,
+            content=AssistantContent(text=text),
+        )
+    )
+
+
+def texts(events) -> list[str]:
+    """Return the block texts of (id, event) pairs."""
+    return [event.block.content.text for _, event in events]
+
+
+def segment_files(directory) -> list[str]:
+    """Return the names of the segment files in a log directory."""
+    return sorted(p.name for p in directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+
+class TestEventLog:
+    """Tests for appending to and replaying from an EventLog."""
+
+    def test_empty_log(self, tmp_path) -> None:
+        """A new log has no events and creates no directory."""
+        log = EventLog(tmp_path / "log")
+        assert len(log) == 0
+        assert log.first_seq == 0
+        assert log.last_seq == 0
+        assert list(log.iter_since(0)) == []
+        assert not (tmp_path / "log").exists()
+
+    def test_append_and_iter_since(self, tmp_path) -> None:
+        """iter_since() yields the events after a sequence number."""
+        log = EventLog(tmp_path)
+        for seq in range(1, 6):
+            log.append(seq, make_event(f"e{seq}"))
+
+        assert len(log) == 5
+        assert (log.first_seq, log.last_seq) == (1, 5)
+        replay = list(log.iter_since(2))
+        assert [seq for seq, _ in replay] == [3, 4, 5]
+        assert texts(replay) == ["e3", "e4", "e5"]
+        assert list(log.iter_since(5)) == []
+
+    def test_sequence_must_increase(self, tmp_path) -> None:
+        """Appending a sequence number that doesn't increase raises ValueError."""
+        log = EventLog(tmp_path)
+        log.append(1, make_event("a"))
+        with pytest.raises(ValueError):
+            log.append(1, make_event("b"))
+
+    def test_rolls_over_segments(self, tmp_path) -> None:
+        """A full segment starts a new one; replay spans segments."""
+        log = EventLog(tmp_path, segment_bytes=1)
+        for seq in range(1, 4):
+            log.append(seq, make_event(f"e{seq}"))
+
+        assert len(segment_files(tmp_path)) == 3
+        assert texts(log.iter_since(0)) == ["e1", "e2", "e3"]
+        assert texts(log.iter_since(1)) == ["e2", "e3"]
+
+    def test_gap_starts_new_segment(self, tmp_path) -> None:
+        """Skipped sequence numbers start a new segment."""
+        log = EventLog(tmp_path)
+        log.append(1, make_event("a"))
+        log.append(2, make_event("b"))
+        log.append(5, make_event("e"))
+
+        assert len(segment_files(tmp_path)) == 2
+        assert [seq for seq, _ in log.iter_since(1)] == [2, 5]
+        assert [seq for seq, _ in log.iter_since(3)] == [5]
+
+    def test_reopen_rebuilds_index(self, tmp_path) -> None:
+        """Reopening a log rebuilds the offset index from the segments."""
+        log = EventLog(tmp_path, segment_bytes=40)
+        for seq in range(1, 11):
+            log.append(seq, make_event(f"e{seq}"))
+
+        reopened = EventLog(tmp_path, segment_bytes=40)
+        assert (reopened.first_seq, reopened.last_seq) == (1, 10)
+        assert reopened.size_bytes == log.size_bytes
+        assert texts(reopened.iter_since(6)) == ["e7", "e8", "e9", "e10"]
+
+    def test_reopen_truncates_partial_record(self, tmp_path) -> None:
+        """A partial trailing record is cut off on reopen."""
+        log = EventLog(tmp_path)
+        log.append(1, make_event("a"))
+        log.append(2, make_event("b"))
+        path = tmp_path / segment_files(tmp_path)[0]
+        os.truncate(path, path.stat().st_size - 3)
+
+        reopened = EventLog(tmp_path)
+        assert reopened.last_seq == 1
+        reopened.append(2, make_event("c"))
+        assert texts(reopened.iter_since(0)) == ["a", "c"]
+
+    def test_size_retention_drops_oldest_segments(self, tmp_path) -> None:
+        """Old segments are dropped while the log exceeds max_bytes."""
+        log = EventLog(tmp_path, segment_bytes=1, max_bytes=100)
+        for seq in range(1, 21):
+            log.append(seq, make_event(f"e{seq}"))
+
+        assert log.size_bytes <= 100
+        assert log.last_seq == 20
+        assert log.first_seq > 1
+        assert len(segment_files(tmp_path)) == len(log)
+        assert not log.covers(0)
+        assert log.covers(log.first_seq - 1)
+        assert texts(log.iter_since(0))[-1] == "e20"
+
+    def test_age_retention_keeps_newest_segment(self, tmp_path) -> None:
+        """Expired segments are dropped, except the newest one."""
+        log = EventLog(tmp_path, segment_bytes=1, max_age_seconds=60)
+        log.append(1, make_event("old"))
+        log.append(2, make_event("older"))
+        old = time.time() - 120
+        for name in segment_files(tmp_path):
+            os.utime(tmp_path / name, (old, old))
+
+        reopened = EventLog(tmp_path, segment_bytes=1, max_age_seconds=60)
+        assert (reopened.first_seq, reopened.last_seq) == (2, 2)
+        reopened.append(3, make_event("new"))
+        assert (reopened.first_seq, reopened.last_seq) == (3, 3)
+
+    def test_append_handle_kept_open(self, tmp_path) -> None:
+        """Appends to a segment share one handle; rollover and close() release it."""
+        log = EventLog(tmp_path, segment_bytes=40)
+        log.append(1, make_event("a"))
+        handle = log._handle
+        log.append(2, make_event("b"))
+        assert log._handle is handle
+        assert texts(EventLog(tmp_path).iter_since(0)) == ["a", "b"]
+
+        log.append(3, make_event("c" * 50))
+        log.append(4, make_event("d"))
+        assert handle.closed
+        assert log._handle is not handle
+
+        log.close()
+        assert log._handle is None
+        log.append(5, make_event("e"))
+        assert texts(log.iter_since(3)) == ["d", "e"]
+
+    def test_checkpoint_round_trip(self, tmp_path) -> None:
+        """latest_checkpoint() returns the newest checkpoint, also after reopening."""
+        log = EventLog(tmp_path)
+        assert log.latest_checkpoint() is None
+        log.append(1, make_event("a"))
+        log.write_checkpoint(1, {"n": 1})
+        log.append(2, make_event("b"))
+        log.write_checkpoint(2, {"n": 2})
+
+        assert log.latest_checkpoint() == (2, {"n": 2})
+        assert [p.name for p in tmp_path.glob(f"*{CHECKPOINT_SUFFIX}")] == [
+            f"{2:020d}{CHECKPOINT_SUFFIX}"
+        ]
+        assert EventLog(tmp_path).latest_checkpoint() == (2, {"n": 2})
+
+    def test_checkpoint_must_be_covered(self, tmp_path) -> None:
+        """A checkpoint past the newest event raises ValueError."""
+        log = EventLog(tmp_path)
+        log.append(1, make_event("a"))
+        with pytest.raises(ValueError):
+            log.write_checkpoint(2, {})
+
+    def test_retention_drops_stale_checkpoint(self, tmp_path) -> None:
+        """A checkpoint whose following events were dropped is deleted."""
+        log = EventLog(tmp_path, segment_bytes=1, max_bytes=100)
+        log.append(1, make_event("a"))
+        log.write_checkpoint(1, {"n": 1})
+        for seq in range(2, 21):
+            log.append(seq, make_event(f"e{seq}"))
+
+        assert not log.covers(1)
+        assert log.latest_checkpoint() is None
+        assert list(tmp_path.glob(f"*{CHECKPOINT_SUFFIX}")) == []
+
+    def test_delete(self, tmp_path) -> None:
+        """delete() removes the log directory."""
+        log = EventLog(tmp_path / "log")
+        log.append(1, make_event("a"))
+        log.delete()
+        assert len(log) == 0
+        assert not (tmp_path / "log").exists()
+
+
+class TestEventBufferManagerLog:
+    """Tests for EventBufferManager with an event log directory."""
+
+    def test_replays_past_buffer_from_log(self, tmp_path) -> None:
+        """IDs older than the buffer replay from the log."""
+        manager = EventBufferManager(max_size_per_session=2, log_dir=tmp_path)
+        for i in range(1, 7):
+            manager.add_event("s", make_event(f"e{i}"))
+
+        assert texts(manager.get_events_since("s", "evt_002")) == ["e5", "e6"]
+        replay = list(manager.iter_events_since("s", "evt_002"))
+        assert [event_id for event_id, _ in replay] == ["evt_003", "evt_004", "evt_005", "evt_006"]
+        assert texts(replay) == ["e3", "e4", "e5", "e6"]
+
+    def test_recent_id_and_none_use_buffer(self, tmp_path) -> None:
+        """Buffered, missing and malformed IDs replay from the buffer."""
+        manager = EventBufferManager(max_size_per_session=2, log_dir=tmp_path)
+        for i in range(1, 7):
+            manager.add_event("s", make_event(f"e{i}"))
+
+        assert texts(manager.iter_events_since("s", "evt_005")) == ["e6"]
+        assert texts(manager.iter_events_since("s", None)) == ["e5", "e6"]
+        assert texts(manager.iter_events_since("s", "bogus")) == ["e5", "e6"]
+
+    def test_iter_events_streams_whole_log(self, tmp_path) -> None:
+        """iter_events() yields every retained event."""
+        manager = EventBufferManager(max_size_per_session=2, log_dir=tmp_path)
+        for i in range(1, 5):
+            manager.add_event("s", make_event(f"e{i}"))
+
+        assert texts(manager.iter_events("s")) == ["e1", "e2", "e3", "e4"]
+
+    def test_ids_continue_across_restart(self, tmp_path) -> None:
+        """A new manager continues the sequence numbers of the log."""
+        manager = EventBufferManager(log_dir=tmp_path)
+        manager.add_event("s", make_event("a"))
+        manager.add_event("s", make_event("b"))
+
+        restarted = EventBufferManager(log_dir=tmp_path)
+        assert texts(restarted.iter_events_since("s", "evt_001")) == ["b"]
+        assert restarted.add_event("s", make_event("c")) == "evt_003"
+        assert texts(restarted.iter_events("s")) == ["a", "b", "c"]
+
+    def test_remove_buffer_deletes_log(self, tmp_path) -> None:
+        """remove_buffer() deletes the session's log."""
+        manager = EventBufferManager(log_dir=tmp_path)
+        manager.add_event("s", make_event("a"))
+        manager.remove_buffer("s")
+
+        assert list(tmp_path.iterdir()) == []
+        assert list(manager.iter_events("s")) == []
+
+    def test_without_log_dir(self) -> None:
+        """Without a log_dir the manager falls back to the buffer."""
+        manager = EventBufferManager(max_size_per_session=2)
+        for i in range(1, 5):
+            manager.add_event("s", make_event(f"e{i}"))
+
+        assert manager.get_log("s") is None
+        assert texts(manager.iter_events_since("s", "evt_001")) == ["e3", "e4"]
+        assert texts(manager.iter_events("s")) == ["e3", "e4"]
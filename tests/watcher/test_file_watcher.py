@@ -134,6 +134,40 @@ class TestIncrementalReaderReadNewLines:
         assert lines[0] == {"valid": 1}
         assert lines[1] == {"valid": 2}
 
+    def test_read_new_lines_partial_multibyte_line(self, tmp_path: Path) -> None:
+        """A partial line ending mid-character does not drop complete lines."""
+        file_path = tmp_path / "test.jsonl"
+        data = '{"line": 1}\n{"text": "日本"}\n'.encode()
+        file_path.write_bytes(data[:-4])
+        reader = IncrementalReader(path=file_path, position=0)
+
+        lines, _ = reader.read_new_lines()
+        assert lines == [{"line": 1}]
+
+        file_path.write_bytes(data)
+        lines2, pos = reader.read_new_lines()
+        assert lines2 == [{"text": "日本"}]
+        assert pos == len(data)
+
+    def test_read_new_lines_skip_invisible(self, tmp_path: Path) -> None:
+        """read_new_lines() drops invisible lines when skip_invisible is set."""
+        file_path = tmp_path / "test.jsonl"
+        file_path.write_text(
+            '{"type":"summary","summary":"s"}\n'
+            '{"type":"user","isSidechain":true,"message":{"content":"sub"}}\n'
+            '{"type":"user","message":{"content":"hi"}}\n'
+        )
+
+        reader = IncrementalReader(path=file_path, position=0, skip_invisible=True)
+        lines, pos = reader.read_new_lines()
+        assert lines == [{"type": "user", "message": {"content": "hi"}}]
+        assert pos == file_path.stat().st_size
+        assert reader.lines_skipped == 2
+
+        reader = IncrementalReader(path=file_path, position=0)
+        lines, _ = reader.read_new_lines()
+        assert len(lines) == 3
+
     def test_read_new_lines_handles_file_truncation(self, tmp_path: Path) -> None:
         """read_new_lines() resets position when file is truncated."""
         file_path = tmp_path / "test.jsonl"
@@ -268,6 +302,36 @@ class TestIncrementalReaderSeekToLastNLines:
 
         assert reader.position == position
 
+    def test_seek_to_last_n_lines_counts_partial_last_line(self, tmp_path: Path) -> None:
+        """A last line without a trailing newline counts as a line."""
+        file_path = tmp_path / "test.jsonl"
+        file_path.write_text('{"line": 1}\n{"line": 2}\n{"line": 3}')
+        reader = IncrementalReader(path=file_path)
+
+        assert reader.seek_to_last_n_lines(2) == len('{"line": 1}\n')
+        assert reader.seek_to_last_n_lines(1) == len('{"line": 1}\n{"line": 2}\n')
+        assert reader.seek_to_last_n_lines(3) == 0
+
+        with file_path.open("a") as f:
+            f.write("\n")
+        lines, _ = reader.read_new_lines()
+        assert lines == [{"line": 3}]
+
+    def test_seek_to_last_n_lines_uses_line_index(self, tmp_path: Path) -> None:
+        """seek_to_last_n_lines() persists a sidecar and extends it on growth."""
+        file_path = tmp_path / "test.jsonl"
+        file_path.write_text('{"line": 1}\n{"line": 2}\n')
+        reader = IncrementalReader(path=file_path, index_dir=tmp_path / "idx")
+
+        reader.seek_to_last_n_lines(1)
+        assert list((tmp_path / "idx").glob("*.idx"))
+
+        with file_path.open("a") as f:
+            f.write('{"line": 3}\n')
+        reader.seek_to_last_n_lines(1)
+        lines, _ = reader.read_new_lines()
+        assert lines == [{"line": 3}]
+
 
 # ---------------------------------------------------------------------------
 # WatchedFile tests
@@ -496,6 +560,26 @@ class TestFileWatcherProcessInitial:
         callback.assert_not_called()
 
 
+    @pytest.mark.asyncio
+    async def test_process_initial_all_lines_skipped(self, tmp_path: Path) -> None:
+        """The callback gets an empty batch when every line read was skipped."""
+        file_path = tmp_path / "test.jsonl"
+        file_path.write_text('{"type":"summary","summary":"s"}\n{"broken\n')
+        skipped = []
+
+        async def callback(session_id: str, lines: list[dict]) -> None:
+            skipped.append((lines, watcher.get_lines_skipped(session_id)))
+
+        watcher = FileWatcher(on_lines_callback=callback, skip_invisible=True)
+        watcher.add("session-001", file_path, start_position=0)
+
+        await watcher.process_initial("session-001")
+
+        assert skipped == [([], 2)]
+        assert watcher.get_lines_skipped("session-001") == 0
+        assert watcher.get_position("session-001") == file_path.stat().st_size
+
+
 class TestFileWatcherFileChanges:
     """Tests for file change detection and processing."""
 
@@ -238,6 +238,19 @@ class TestExtractSessionMetadata:
         assert summary == "Valid summary"
         assert line_count == 3
 
+    def test_nested_summary_type_ignored(self, tmp_path: Path) -> None:
+        """Only top-level summary lines are used."""
+        session_file = tmp_path / "session.jsonl"
+        lines = [
+            '{"type": "summary", "summary": "Real summary"}',
+            '{"type":"user","message":{"content":[{"type":"summary","summary":"x"}]}}',
+        ]
+        session_file.write_text("\n".join(lines) + "\n")
+
+        summary, line_count = extract_session_metadata(session_file)
+        assert summary == "Real summary"
+        assert line_count == 2
+
     def test_nonexistent_file(self, tmp_path: Path) -> None:
         """Handle nonexistent file gracefully."""
         session_file = tmp_path / "nonexistent.jsonl"
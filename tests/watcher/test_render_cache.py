@@ -22,6 +22,7 @@ from claude_session_player.watcher.render_cache import (
     CachedRender,
     RenderCache,
 )
+from claude_session_player.watcher.screen_renderer import IncrementalScreenRenderer
 
 
 # --- Helper functions ---
@@ -66,24 +67,24 @@ class TestCachedRender:
 
     def test_creation(self) -> None:
         """CachedRender stores all fields correctly."""
-        cached = CachedRender(
-            desktop="desktop content",
-            mobile="mobile content",
-            last_updated=123.456,
-        )
-        assert cached.desktop == "desktop content"
-        assert cached.mobile == "mobile content"
+        screen = IncrementalScreenRenderer()
+        cached = CachedRender(screen=screen, last_updated=123.456)
+        assert cached.screen is screen
         assert cached.last_updated == 123.456
+        assert cached.frames == {}
 
-    def test_immutable_fields(self) -> None:
-        """CachedRender fields can be reassigned (mutable dataclass)."""
-        cached = CachedRender(
-            desktop="old",
-            mobile="old",
-            last_updated=100.0,
-        )
-        cached.desktop = "new"
-        assert cached.desktop == "new"
+    def test_frame_rendered_once_per_version(self) -> None:
+        """frame() caches per size and drops frames of older versions."""
+        screen = IncrementalScreenRenderer()
+        cached = CachedRender(screen=screen, last_updated=0.0)
+
+        first = cached.frame(10, 30)
+        assert cached.frame(10, 30) is first
+        assert list(cached.frames) == [(10, 30)]
+
+        screen.apply([make_user_event("new")])
+        assert "new" in cached.frame(5, 20)
+        assert list(cached.frames) == [(5, 20)]
 
 
 # --- RenderCache creation tests ---
@@ -244,6 +245,207 @@ class TestRenderCacheRebuild:
 # --- RenderCache.get() tests ---
 
 
+class TestRenderCacheUpdate:
+    """Tests for incremental update() method."""
+
+    def test_update_uncached_session_returns_false(self) -> None:
+        """update() reports a session without render state."""
+        cache = RenderCache()
+
+        assert cache.update("session_1", make_events()) is False
+        assert not cache.contains("session_1")
+
+    def test_update_matches_rebuild(self) -> None:
+        """Applying events incrementally renders the same as a full rebuild."""
+        events = make_events(30)
+        events.append(
+            UpdateBlock(block_id="block_response_29", content=AssistantContent(text="final"))
+        )
+        incremental, full = RenderCache(), RenderCache()
+
+        incremental.rebuild("s", events[:10])
+        for start in range(10, len(events), 7):
+            assert incremental.update("s", events[start : start + 7]) is True
+        full.rebuild("s", events)
+
+        for preset in ("desktop", "mobile"):
+            assert incremental.get("s", preset) == full.get("s", preset)
+        assert "final" in incremental.get("s", "desktop")
+
+    def test_update_after_clear_all(self) -> None:
+        """A ClearAll applied incrementally empties the screen."""
+        cache = RenderCache()
+        cache.rebuild("s", make_events())
+
+        cache.update("s", [ClearAll(), make_user_event("again")])
+
+        desktop = cache.get("s", "desktop")
+        assert "again" in desktop
+        assert "response_0" not in desktop
+
+    def test_update_refreshes_timestamp(self) -> None:
+        """update() refreshes the last_updated timestamp."""
+        cache = RenderCache()
+        cache.rebuild("s", make_events())
+        before = cache.get_last_updated("s")
+
+        cache.update("s", [make_user_event("more")])
+
+        assert cache.get_last_updated("s") >= before
+
+
+class TestRenderCacheLazyFrames:
+    """Tests for on-demand rendering of presets and custom sizes."""
+
+    def test_rebuild_renders_nothing(self) -> None:
+        """rebuild() only builds state; frames are rendered on request."""
+        cache = RenderCache()
+        cache.rebuild("s", make_events())
+
+        assert cache._cache["s"].frames == {}
+
+    def test_only_requested_preset_rendered(self) -> None:
+        """Requesting one preset does not render the other."""
+        cache = RenderCache()
+        cache.rebuild("s", make_events())
+
+        cache.get("s", "mobile")
+
+        assert list(cache._cache["s"].frames) == [(25, 60)]
+
+    def test_custom_size(self) -> None:
+        """get_frame() renders and caches arbitrary sizes."""
+        cache = RenderCache()
+        cache.rebuild("s", make_events())
+
+        frame = cache.get_frame("s", 12, 44)
+
+        assert frame is not None
+        lines = frame.split("\n")
+        assert (len(lines), len(lines[0])) == (12, 44)
+        assert cache.get_frame("s", 12, 44) is frame
+        assert cache.get_frame("missing", 12, 44) is None
+
+    def test_update_drops_frames(self) -> None:
+        """Frames of the previous state are dropped and re-rendered on request."""
+        cache = RenderCache()
+        cache.rebuild("s", make_events())
+        cache.get("s", "desktop")
+        cache.get_frame("s", 12, 44)
+
+        cache.update("s", [make_user_event("later")])
+
+        assert cache._cache["s"].frames == {}
+        assert "later" in cache.get("s", "desktop")
+        assert list(cache._cache["s"].frames) == [(40, 80)]
+
+
+class TestRenderCacheBudget:
+    """Tests for the byte budget, LRU eviction and stats."""
+
+    def test_size_accounting(self) -> None:
+        """Sizes grow with content and rendered frames and shrink on ClearAll."""
+        cache = RenderCache()
+        cache.rebuild("s", make_events(5))
+        base = cache.stats()["session_bytes"]["s"]
+
+        cache.get("s", "desktop")
+        with_frame = cache.stats()["session_bytes"]["s"]
+        cache.update("s", [make_add_block_event("x" * 10_000)])
+        grown = cache.stats()["session_bytes"]["s"]
+        cache.update("s", [ClearAll()])
+        cleared = cache.stats()["session_bytes"]["s"]
+
+        assert base < with_frame
+        assert grown > base + 10_000
+        assert cleared < base
+
+    def test_running_total_matches_sessions(self) -> None:
+        """The maintained byte total equals the sum of the session sizes."""
+        cache = RenderCache()
+
+        def check() -> None:
+            stats = cache.stats()
+            assert stats["bytes"] == sum(stats["session_bytes"].values())
+
+        cache.rebuild("a", make_events(5))
+        cache.rebuild("b", make_events(3))
+        cache.get("a", "desktop")
+        cache.get_frame("b", 10, 30)
+        check()
+        cache.update("a", [make_add_block_event("more")])
+        cache.rebuild("b", make_events(8))
+        check()
+        cache.get("a", "mobile")
+        cache.evict("b")
+        check()
+        cache._cache["a"].last_updated = time.monotonic() - cache.ttl_seconds - 1
+        cache._evict_stale()
+        assert cache.stats()["bytes"] == 0
+        cache.rebuild("c", make_events(2))
+        cache.clear()
+        assert cache.stats()["bytes"] == 0
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Exceeding the budget evicts the least recently used sessions."""
+        cache = RenderCache()
+        for name in ("a", "b", "c"):
+            cache.rebuild(name, make_events(20))
+        cache.get("a", "mobile")  # a is now most recently used
+        stats = cache.stats()
+        cache.max_bytes = stats["bytes"] + stats["session_bytes"]["b"] // 2
+
+        cache.rebuild("d", make_events(20))
+
+        assert cache.contains("a")
+        assert not cache.contains("b")
+        assert cache.contains("c")
+        assert cache.contains("d")
+        assert cache.stats()["evictions"] == 1
+
+    def test_most_recent_session_kept_over_budget(self) -> None:
+        """A single session larger than the budget is still cached."""
+        cache = RenderCache(max_bytes=1)
+        cache.rebuild("a", make_events())
+        cache.rebuild("b", make_events())
+
+        assert not cache.contains("a")
+        assert cache.get("b", "desktop") is not None
+
+    def test_no_budget(self) -> None:
+        """max_bytes=None disables budget eviction."""
+        cache = RenderCache(max_bytes=None)
+        for i in range(5):
+            cache.rebuild(f"s{i}", make_events(50))
+
+        assert cache.session_count() == 5
+
+    def test_hit_miss_counters(self) -> None:
+        """Cached frames count as hits; renders and unknown sessions as misses."""
+        cache = RenderCache()
+        cache.rebuild("s", make_events())
+
+        cache.get("s", "desktop")
+        cache.get("s", "desktop")
+        cache.get("missing", "desktop")
+        cache.update("s", [make_user_event("more")])
+        cache.get("s", "desktop")
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 3)
+
+    def test_expirations_counted(self) -> None:
+        """TTL evictions are counted separately from budget evictions."""
+        cache = RenderCache(ttl_seconds=1.0)
+        cache.rebuild("s", make_events())
+        cache._cache["s"].last_updated = time.monotonic() - 2.0
+
+        cache._evict_stale()
+
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["evictions"] == 0
+
+
 class TestRenderCacheGet:
     """Tests for RenderCache.get() method."""
 
@@ -521,11 +723,7 @@ class TestRenderCacheTTLEviction:
         cache.rebuild("session_1", make_events())
 
         # Manually set timestamp to make entry stale
-        cache._cache["session_1"] = CachedRender(
-            desktop="old",
-            mobile="old",
-            last_updated=time.monotonic() - 2.0,  # 2 seconds ago (> 1s TTL)
-        )
+        cache._cache["session_1"].last_updated = time.monotonic() - 2.0  # 2 seconds ago (> 1s TTL)
 
         cache._evict_stale()
 
@@ -549,11 +747,7 @@ class TestRenderCacheTTLEviction:
 
         # Add stale entry
         cache.rebuild("stale", make_events())
-        cache._cache["stale"] = CachedRender(
-            desktop="old",
-            mobile="old",
-            last_updated=time.monotonic() - 2.0,
-        )
+        cache._cache["stale"].last_updated = time.monotonic() - 2.0
 
         cache._evict_stale()
 
@@ -570,11 +764,7 @@ class TestRenderCacheTTLEviction:
 
         # Add entry and make it stale
         cache.rebuild("session_1", make_events())
-        cache._cache["session_1"] = CachedRender(
-            desktop="old",
-            mobile="old",
-            last_updated=time.monotonic() - 1.0,  # Already stale
-        )
+        cache._cache["session_1"].last_updated = time.monotonic() - 1.0  # Already stale
 
         await cache.start()
 
@@ -11,6 +11,7 @@ from claude_session_player.events import (
     BlockType,
     ClearAll,
     DurationContent,
+    PatchBlock,
     Question,
     QuestionContent,
     QuestionOption,
@@ -23,6 +24,7 @@ from claude_session_player.events import (
 from claude_session_player.watcher.screen_renderer import (
     PRESET_DIMENSIONS,
     Dimensions,
+    IncrementalScreenRenderer,
     Preset,
     ScreenRenderer,
     render_events,
@@ -410,6 +412,39 @@ class TestEventProcessing:
         assert "* Bash(ls)" in result
         assert "  > file.txt" in result
 
+    def test_patch_block(self):
+        """Test PatchBlock event updates changed fields."""
+        events = [
+            AddBlock(
+                Block(
+                    id="1",
+                    type=BlockType.TOOL_CALL,
+                    content=ToolCallContent(tool_name="Bash", tool_use_id="tu_1", label="ls"),
+                )
+            ),
+            PatchBlock(block_id="1", changes={"result": "file.txt"}, base_version=0),
+        ]
+        result = render_events(events, rows=5, cols=40)
+
+        assert "* Bash(ls)" in result
+        assert "  > file.txt" in result
+
+    def test_stale_patch_block_ignored(self):
+        """Test PatchBlock against a different version is ignored."""
+        events = [
+            AddBlock(
+                Block(
+                    id="1",
+                    type=BlockType.TOOL_CALL,
+                    content=ToolCallContent(tool_name="Bash", tool_use_id="tu_1", label="ls"),
+                )
+            ),
+            PatchBlock(block_id="1", changes={"result": "stale"}, base_version=1),
+        ]
+        result = render_events(events, rows=5, cols=40)
+
+        assert "stale" not in result
+
     def test_clear_all(self):
         """Test ClearAll event clears all blocks."""
         events = [
@@ -661,3 +696,132 @@ class TestCharacterLimits:
 
         result = render_events(events, preset=Preset.MOBILE)
         assert len(result) <= 1600
+
+
+class TestViewportRendering:
+    """Test that only blocks inside the viewport are formatted."""
+
+    @staticmethod
+    def _session(count: int) -> list:
+        """Blocks of varying height, with shared and distinct request ids."""
+        events = []
+        for i in range(count):
+            if i % 3 == 0:
+                content = UserContent(text="\n".join(f"line {j}" for j in range(i % 4 + 1)))
+                request_id = None
+            elif i % 3 == 1:
+                content = AssistantContent(text=f"reply {i} " + "y" * (i % 90))
+                request_id = f"req-{i // 6}"
+            else:
+                content = ToolCallContent(
+                    tool_name="Bash",
+                    tool_use_id=f"t{i}",
+                    label="ls",
+                    result="\n".join(f"out {j}" for j in range(i % 7)),
+                )
+                request_id = f"req-{i // 6}"
+            events.append(
+                AddBlock(Block(id=str(i), type=BlockType.ASSISTANT, content=content, request_id=request_id))
+            )
+        events.append(
+            AddBlock(Block(id="empty", type=BlockType.SYSTEM, content=SystemContent(text="")))
+        )
+        return events
+
+    @staticmethod
+    def _full_render(events: list, rows: int, cols: int) -> str:
+        """Reference: format every block top-down, then take the last lines."""
+        renderer = ScreenRenderer()
+        lines: list[str] = []
+        prev_rid = None
+        for block in renderer._build_blocks(events):
+            formatted = renderer._format_block(block)
+            if not formatted:
+                continue
+            if lines and not (prev_rid and block.request_id and prev_rid == block.request_id):
+                lines.append("")
+            lines.extend(formatted.split("\n"))
+            prev_rid = block.request_id
+        viewport = [renderer._fit_line(line, cols - 2) for line in lines[-(rows - 2):]]
+        viewport += [""] * (rows - 2 - len(viewport))
+        return renderer._build_frame(viewport, Dimensions(rows=rows, cols=cols))
+
+    @pytest.mark.parametrize("count", [0, 1, 2, 5, 13, 60])
+    @pytest.mark.parametrize("rows,cols", [(3, 20), (5, 30), (25, 60), (40, 80)])
+    def test_matches_full_render(self, count, rows, cols):
+        """Bottom-up rendering matches formatting the whole session."""
+        events = self._session(count)
+        assert render_events(events, rows=rows, cols=cols) == self._full_render(events, rows, cols)
+
+    def test_formats_only_visible_blocks(self, monkeypatch):
+        """A frame of a long session formats only the blocks it shows."""
+        renderer = ScreenRenderer()
+        formatted = []
+        original = renderer._format_block
+
+        def counting(block):
+            formatted.append(block.id)
+            return original(block)
+
+        monkeypatch.setattr(renderer, "_format_block", counting)
+        events = [
+            AddBlock(Block(id=str(i), type=BlockType.USER, content=UserContent(text=f"msg {i}")))
+            for i in range(5000)
+        ]
+
+        result = renderer.render(events, rows=10, cols=40)
+
+        assert "msg 4999" in result
+        assert formatted == [str(i) for i in range(4999, 4994, -1)]
+
+
+class TestIncrementalScreenRenderer:
+    """Test applying events to a persistent screen state."""
+
+    def test_matches_render_after_each_batch(self):
+        """Frames after each batch match rendering the whole event list."""
+        events = TestViewportRendering._session(40)
+        events[20:20] = [
+            UpdateBlock(block_id="5", content=AssistantContent(text="updated\nreply")),
+            PatchBlock(block_id="5", changes={"text": "patched"}, base_version=1),
+            PatchBlock(block_id="5", changes={"text": "stale"}, base_version=0),
+            UpdateBlock(block_id="missing", content=AssistantContent(text="ignored")),
+        ]
+        events[30:30] = [ClearAll()]
+        screen = IncrementalScreenRenderer()
+
+        for start in range(0, len(events), 6):
+            screen.apply(events[start : start + 6])
+            seen = events[: start + 6]
+            for preset in Preset:
+                assert screen.render(preset=preset) == render_events(seen, preset=preset)
+        assert screen.version == len(events)
+
+    def test_only_changed_blocks_reformatted(self, monkeypatch):
+        """Cached lines are reused; only new or updated visible blocks are formatted."""
+        renderer = ScreenRenderer()
+        formatted = []
+        original = renderer._format_block
+
+        def counting(block):
+            formatted.append(block.id)
+            return original(block)
+
+        monkeypatch.setattr(renderer, "_format_block", counting)
+        screen = IncrementalScreenRenderer(renderer)
+        screen.apply(
+            [
+                AddBlock(Block(id=str(i), type=BlockType.USER, content=UserContent(text=f"m{i}")))
+                for i in range(3)
+            ]
+        )
+        screen.render(preset=Preset.DESKTOP)
+        screen.render(preset=Preset.MOBILE)
+        assert sorted(formatted) == ["0", "1", "2"]
+
+        formatted.clear()
+        screen.apply([UpdateBlock(block_id="1", content=UserContent(text="changed"))])
+        result = screen.render(rows=10, cols=30)
+
+        assert formatted == ["1"]
+        assert "changed" in result
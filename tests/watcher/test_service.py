@@ -157,6 +157,33 @@ class TestWatcherServiceCreation:
         assert service.event_buffer is event_buffer
         assert service.sse_manager is sse_manager
 
+    def test_event_log_disabled_by_default(
+        self, temp_config_path: Path, temp_state_dir: Path
+    ) -> None:
+        """The default event buffer keeps no disk event log."""
+        service = WatcherService(
+            config_path=temp_config_path,
+            state_dir=temp_state_dir,
+        )
+
+        assert service.event_buffer.log_dir is None
+
+    def test_event_log_settings(
+        self, temp_config_path: Path, temp_state_dir: Path, tmp_path: Path
+    ) -> None:
+        """Event log directory and retention are passed to the event buffer."""
+        service = WatcherService(
+            config_path=temp_config_path,
+            state_dir=temp_state_dir,
+            event_log_dir=tmp_path / "event_log",
+            event_log_max_bytes=1024,
+            event_log_max_age_seconds=None,
+        )
+
+        assert service.event_buffer.log_dir == tmp_path / "event_log"
+        assert service.event_buffer.log_max_bytes == 1024
+        assert service.event_buffer.log_max_age_seconds is None
+
     def test_default_host_and_port(
         self, temp_config_path: Path, temp_state_dir: Path
     ) -> None:
@@ -633,6 +660,37 @@ class TestWatcherServiceFileChange:
             await watcher_service.stop()
 
 
+class TestWatcherServiceSkippedLines:
+    """Tests for line accounting with lines the reader skips."""
+
+    async def test_skipped_lines_counted_and_position_saved(
+        self, watcher_service: WatcherService, session_file: Path
+    ) -> None:
+        """Invisible lines advance line_number and an all-invisible batch saves the position."""
+        from watchfiles import Change
+
+        try:
+            await watcher_service.start()
+            await watcher_service.watch("skip-test", session_file)
+            watcher = watcher_service.file_watcher
+            changed = {(Change.modified, str(session_file.resolve()))}
+
+            with session_file.open("a") as f:
+                f.write('{"type":"user","message":{"content":"hi"}}\n')
+            await watcher._handle_changes(changed)
+            line_number = watcher_service.state_manager.load("skip-test").line_number
+
+            with session_file.open("a") as f:
+                f.write('{"type":"summary","summary":"s"}\n' * 2)
+            await watcher._handle_changes(changed)
+
+            state = watcher_service.state_manager.load("skip-test")
+            assert state.file_position == session_file.stat().st_size
+            assert state.line_number == line_number + 2
+        finally:
+            await watcher_service.stop()
+
+
 # --- Tests for file deletion handling ---
 
 
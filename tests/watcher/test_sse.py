@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 from dataclasses import dataclass, field
 
 import pytest
@@ -13,6 +14,8 @@ from claude_session_player.events import (
     Block,
     BlockType,
     ClearAll,
+    PatchBlock,
+    ToolCallContent,
     UpdateBlock,
 )
 from claude_session_player.watcher.event_buffer import EventBufferManager
@@ -101,7 +104,7 @@ class TestFormatSseMessage:
 
         assert "id: evt_001\n" in text
         assert "event: add_block\n" in text
-        assert 'data: {"key": "value"}\n' in text
+        assert 'data: {"key":"value"}\n' in text
         assert text.endswith("\n\n")
 
     def test_message_without_id(self) -> None:
@@ -138,7 +141,13 @@ class TestFormatSseMessage:
         msg = format_sse_message(data={"nested": {"key": "value"}, "list": [1, 2]})
         text = msg.decode("utf-8")
 
-        assert 'data: {"nested": {"key": "value"}, "list": [1, 2]}' in text
+        assert 'data: {"nested":{"key":"value"},"list":[1,2]}' in text
+
+    def test_non_ascii_data_stays_on_one_line(self) -> None:
+        """Non-ASCII is sent as UTF-8 and newlines stay escaped."""
+        msg = format_sse_message(data={"text": "héllo\nwörld 😀"})
+
+        assert msg == 'data: {"text":"héllo\\nwörld 😀"}\n\n'.encode()
 
 
 class TestFormatKeepalive:
@@ -235,7 +244,7 @@ class TestSSEConnectionSendEvent:
         text = response.get_written_text()
         assert "id: evt_001" in text
         assert "event: add_block" in text
-        assert '"key": "value"' in text
+        assert '"key":"value"' in text
 
     async def test_send_multiple_events(self) -> None:
         """Multiple events are written separately."""
@@ -467,6 +476,25 @@ class TestSSEManagerConnectReplay:
 
         await manager.disconnect(conn)
 
+    async def test_connect_replays_from_event_log(self, tmp_path) -> None:
+        """connect() replays events older than the buffer from the event log."""
+        buffer = EventBufferManager(max_size_per_session=2, log_dir=tmp_path)
+        for i in range(1, 6):
+            buffer.add_event("sess_1", make_add_block_event(f"event{i}"))
+
+        manager = SSEManager(event_buffer=buffer)
+        response = MockStreamResponse()
+
+        conn = await manager.connect("sess_1", response, last_event_id="evt_001")
+
+        text = response.get_written_text()
+        assert "evt_001" not in text
+        for i in range(2, 6):
+            assert f"evt_00{i}" in text
+            assert f"event{i}" in text
+
+        await manager.disconnect(conn)
+
 
 class TestSSEManagerDisconnect:
     """Tests for SSEManager.disconnect method."""
@@ -615,6 +643,267 @@ class TestSSEManagerBroadcast:
         await manager.disconnect(conn)
 
 
+class TestSSEManagerDelta:
+    """Tests for patch_block events sent to delta clients."""
+
+    @staticmethod
+    def _tool_add() -> AddBlock:
+        return AddBlock(
+            block=Block(
+                id="tool_1",
+                type=BlockType.TOOL_CALL,
+                content=ToolCallContent(tool_name="Bash", tool_use_id="tu_1", label="make"),
+            )
+        )
+
+    @staticmethod
+    def _tool_update(progress: str) -> UpdateBlock:
+        return UpdateBlock(
+            block_id="tool_1",
+            content=ToolCallContent(
+                tool_name="Bash", tool_use_id="tu_1", label="make", progress_text=progress
+            ),
+        )
+
+    @staticmethod
+    def _events(response: MockStreamResponse) -> list[tuple[str, dict]]:
+        events = []
+        for message in response.get_written_text().split("\n\n"):
+            fields = dict(
+                line.split(": ", 1) for line in message.split("\n") if ": " in line
+            )
+            if "event" in fields:
+                events.append((fields["event"], json.loads(fields["data"])))
+        return events
+
+    async def test_delta_client_receives_patches(self) -> None:
+        """Delta clients get changed fields with the base version."""
+        manager = SSEManager(event_buffer=EventBufferManager())
+        response = MockStreamResponse()
+        conn = await manager.connect("sess_1", response, delta=True)
+
+        await manager.broadcast("sess_1", "evt_001", self._tool_add())
+        await manager.broadcast("sess_1", "evt_002", self._tool_update("step 1"))
+        await manager.broadcast("sess_1", "evt_003", self._tool_update("step 2"))
+
+        events = self._events(response)
+        assert [name for name, _ in events] == ["add_block", "patch_block", "patch_block"]
+        assert events[1][1] == {
+            "block_id": "tool_1",
+            "base_version": 0,
+            "changes": {"progress_text": "step 1"},
+        }
+        assert events[2][1]["base_version"] == 1
+
+        await manager.disconnect(conn)
+
+    async def test_full_updates_for_other_clients(self) -> None:
+        """Clients without delta support keep receiving update_block."""
+        manager = SSEManager(event_buffer=EventBufferManager())
+        delta_response, full_response = MockStreamResponse(), MockStreamResponse()
+        conn1 = await manager.connect("sess_1", delta_response, delta=True)
+        conn2 = await manager.connect("sess_1", full_response)
+
+        await manager.broadcast("sess_1", "evt_001", self._tool_add())
+        await manager.broadcast("sess_1", "evt_002", self._tool_update("step 1"))
+
+        assert [name for name, _ in self._events(full_response)] == [
+            "add_block",
+            "update_block",
+        ]
+        assert self._events(full_response)[1][1]["content"]["progress_text"] == "step 1"
+        assert self._events(delta_response)[1][0] == "patch_block"
+
+        await manager.disconnect(conn1)
+        await manager.disconnect(conn2)
+
+    async def test_unsynced_block_sent_in_full(self) -> None:
+        """Updates of blocks the delta client never saw added are sent in full."""
+        buffer = EventBufferManager()
+        manager = SSEManager(event_buffer=buffer)
+        first = MockStreamResponse()
+        conn1 = await manager.connect("sess_1", first)
+        await manager.broadcast("sess_1", "evt_001", self._tool_add())
+
+        late = MockStreamResponse()
+        conn2 = await manager.connect("sess_1", late, delta=True)
+        await manager.broadcast("sess_1", "evt_002", self._tool_update("step 1"))
+
+        assert [name for name, _ in self._events(late)] == ["update_block"]
+
+        await manager.disconnect(conn1)
+        await manager.disconnect(conn2)
+
+    async def test_clear_all_resets_sync(self) -> None:
+        """After ClearAll, updates of earlier blocks are sent in full."""
+        manager = SSEManager(event_buffer=EventBufferManager())
+        response = MockStreamResponse()
+        conn = await manager.connect("sess_1", response, delta=True)
+
+        await manager.broadcast("sess_1", "evt_001", self._tool_add())
+        await manager.broadcast("sess_1", "evt_002", ClearAll())
+        await manager.broadcast("sess_1", "evt_003", self._tool_update("step 1"))
+
+        assert self._events(response)[-1][0] == "update_block"
+
+        await manager.disconnect(conn)
+
+    async def test_delta_state_dropped_without_subscribers(self) -> None:
+        """Delta tracking is discarded when the last subscriber leaves."""
+        manager = SSEManager(event_buffer=EventBufferManager())
+        conn = await manager.connect("sess_1", MockStreamResponse(), delta=True)
+        await manager.broadcast("sess_1", "evt_001", self._tool_add())
+        assert "sess_1" in manager._encoders
+
+        await manager.disconnect(conn)
+
+        assert "sess_1" not in manager._encoders
+
+    def test_patch_block_data(self) -> None:
+        """PatchBlock maps to patch_block with its fields."""
+        event = PatchBlock(block_id="b1", changes={"text": "x"}, base_version=3)
+
+        assert _event_type_name(event) == "patch_block"
+        assert _event_to_data(event) == {
+            "block_id": "b1",
+            "base_version": 3,
+            "changes": {"text": "x"},
+        }
+
+
+class TestSSEManagerSnapshot:
+    """Tests for the snapshot event sent on connect."""
+
+    _events = staticmethod(TestSSEManagerDelta._events)
+    _tool_add = staticmethod(TestSSEManagerDelta._tool_add)
+    _tool_update = staticmethod(TestSSEManagerDelta._tool_update)
+
+    async def test_snapshot_replaces_replay(self) -> None:
+        """connect(snapshot=True) sends the folded blocks in one event."""
+        buffer = EventBufferManager(max_size_per_session=2, snapshot=True)
+        buffer.add_event("sess_1", make_add_block_event("first"))
+        buffer.add_event("sess_1", self._tool_add())
+        for i in range(5):
+            buffer.add_event("sess_1", self._tool_update(f"step {i}"))
+
+        manager = SSEManager(event_buffer=buffer)
+        response = MockStreamResponse()
+        conn = await manager.connect("sess_1", response, last_event_id="evt_001", snapshot=True)
+
+        assert "id: evt_007" in response.get_written_text()
+        events = self._events(response)
+        assert [name for name, _ in events] == ["snapshot"]
+        blocks = events[0][1]["blocks"]
+        assert [b["block_id"] for b in blocks] == ["block_first", "tool_1"]
+        assert blocks[0]["content"]["text"] == "first"
+        assert blocks[1]["content"]["progress_text"] == "step 4"
+        assert [b["version"] for b in blocks] == [0, 5]
+
+        await manager.disconnect(conn)
+
+    async def test_snapshot_after_clear_all(self) -> None:
+        """The snapshot holds only blocks added after the last ClearAll."""
+        buffer = EventBufferManager(snapshot=True)
+        buffer.add_event("sess_1", make_add_block_event("old"))
+        buffer.add_event("sess_1", ClearAll())
+        buffer.add_event("sess_1", make_add_block_event("new"))
+
+        manager = SSEManager(event_buffer=buffer)
+        response = MockStreamResponse()
+        conn = await manager.connect("sess_1", response, snapshot=True)
+
+        blocks = self._events(response)[0][1]["blocks"]
+        assert [b["block_id"] for b in blocks] == ["block_new"]
+
+        await manager.disconnect(conn)
+
+    async def test_empty_snapshot(self) -> None:
+        """A session without events gets an empty snapshot without an ID."""
+        manager = SSEManager(event_buffer=EventBufferManager(snapshot=True))
+        response = MockStreamResponse()
+        conn = await manager.connect("sess_1", response, snapshot=True)
+
+        assert "id:" not in response.get_written_text()
+        assert self._events(response) == [("snapshot", {"blocks": []})]
+
+        await manager.disconnect(conn)
+
+    async def test_delta_client_synced_by_snapshot(self) -> None:
+        """Delta clients get patches for snapshot blocks, based on their version."""
+        buffer = EventBufferManager(snapshot=True)
+        manager = SSEManager(event_buffer=buffer)
+        first = MockStreamResponse()
+        conn1 = await manager.connect("sess_1", first)
+        for event in (self._tool_add(), self._tool_update("step 1")):
+            await manager.broadcast("sess_1", buffer.add_event("sess_1", event), event)
+
+        late = MockStreamResponse()
+        conn2 = await manager.connect("sess_1", late, delta=True, snapshot=True)
+        event = self._tool_update("step 2")
+        await manager.broadcast("sess_1", buffer.add_event("sess_1", event), event)
+
+        events = self._events(late)
+        assert [name for name, _ in events] == ["snapshot", "patch_block"]
+        assert events[0][1]["blocks"][0]["version"] == 1
+        assert events[1][1]["base_version"] == 1
+
+        await manager.disconnect(conn1)
+        await manager.disconnect(conn2)
+
+    async def test_broadcast_during_snapshot_send_stays_synced(self) -> None:
+        """A block added while the snapshot is being sent is still patchable."""
+
+        @dataclass
+        class SlowFirstWrite(MockStreamResponse):
+            """Response whose first write waits until released."""
+
+            started: asyncio.Event = field(default_factory=asyncio.Event)
+            release: asyncio.Event = field(default_factory=asyncio.Event)
+
+            async def write(self, data: bytes) -> None:
+                if not self.started.is_set():
+                    self.started.set()
+                    await self.release.wait()
+                await super().write(data)
+
+        buffer = EventBufferManager(snapshot=True)
+        manager = SSEManager(event_buffer=buffer)
+        late = SlowFirstWrite()
+        connecting = asyncio.create_task(
+            manager.connect("sess_1", late, delta=True, snapshot=True)
+        )
+        await late.started.wait()
+        event = self._tool_add()
+        await manager.broadcast("sess_1", buffer.add_event("sess_1", event), event)
+        late.release.set()
+        conn = await connecting
+
+        event = self._tool_update("step 1")
+        await manager.broadcast("sess_1", buffer.add_event("sess_1", event), event)
+
+        names = [name for name, _ in self._events(late)]
+        assert sorted(names[:2]) == ["add_block", "snapshot"]
+        assert names[2:] == ["patch_block"]
+
+        await manager.disconnect(conn)
+
+    async def test_snapshot_without_snapshot_buffers(self) -> None:
+        """Without snapshot buffers the snapshot is folded from retained events."""
+        buffer = EventBufferManager()
+        buffer.add_event("sess_1", self._tool_add())
+        buffer.add_event("sess_1", self._tool_update("step 1"))
+
+        manager = SSEManager(event_buffer=buffer)
+        response = MockStreamResponse()
+        conn = await manager.connect("sess_1", response, snapshot=True)
+
+        blocks = self._events(response)[0][1]["blocks"]
+        assert blocks[0]["content"]["progress_text"] == "step 1"
+        assert blocks[0]["version"] == 1
+
+        await manager.disconnect(conn)
+
+
 class TestSSEManagerCloseSession:
     """Tests for SSEManager.close_session method."""
 
@@ -665,7 +954,7 @@ class TestSSEManagerCloseSession:
         await manager.close_session("sess_1", "manual_unwatch")
 
         text = response.get_written_text()
-        assert '"reason": "manual_unwatch"' in text
+        assert '"reason":"manual_unwatch"' in text
 
 
 class TestSSEManagerConnectionCounts:
@@ -62,6 +62,9 @@ class TestSessionState:
             "processing_context": {
                 "tool_use_id_to_block_id": {"tu_123": "block_456"},
                 "current_request_id": "req_789",
+                "tool_contents": {},
+                "question_contents": {},
+                "resolved_tool_use_ids": [],
             },
             "last_modified": "2024-01-15T10:30:00+00:00",
         }
@@ -736,3 +739,101 @@ class TestProcessingContextNestedSerialization:
 
         assert loaded is not None
         assert loaded.processing_context.current_request_id == "req_abc123"
+
+
+# ---------------------------------------------------------------------------
+# Binary state format tests
+# ---------------------------------------------------------------------------
+
+
+class TestBinaryStateFormat:
+    """Tests for StateManager with state_format="binary"."""
+
+    @pytest.fixture
+    def binary_manager(self, state_dir: Path) -> StateManager:
+        """Create a StateManager writing binary state files."""
+        return StateManager(state_dir, state_format="binary")
+
+    def test_save_writes_binary_file(
+        self, binary_manager: StateManager, state_dir: Path, sample_state: SessionState
+    ) -> None:
+        """Binary state is written to <id>.state, not <id>.json."""
+        binary_manager.save("session-001", sample_state)
+
+        assert (state_dir / "session-001.state").exists()
+        assert not (state_dir / "session-001.json").exists()
+        assert binary_manager.state_format == "binary"
+
+    def test_roundtrip_matches_dict_form(
+        self, binary_manager: StateManager, sample_state: SessionState
+    ) -> None:
+        """Loaded binary state equals the saved state in dict form."""
+        binary_manager.save("session-001", sample_state)
+        loaded = binary_manager.load("session-001")
+
+        assert loaded is not None
+        assert loaded.to_dict() == sample_state.to_dict()
+
+    def test_binary_smaller_than_json(
+        self,
+        binary_manager: StateManager,
+        state_manager: StateManager,
+        state_dir: Path,
+        sample_state: SessionState,
+    ) -> None:
+        """Binary state files are smaller than JSON ones."""
+        state_manager.save("session-json", sample_state)
+        binary_manager.save("session-bin", sample_state)
+
+        json_size = (state_dir / "session-json.json").stat().st_size
+        binary_size = (state_dir / "session-bin.state").stat().st_size
+        assert binary_size < json_size / 2
+
+    def test_corrupt_binary_returns_none(
+        self, binary_manager: StateManager, state_dir: Path
+    ) -> None:
+        """Corrupt binary state files load as None."""
+        state_dir.mkdir(parents=True)
+        (state_dir / "session-001.state").write_bytes(b"\xc5\x01\x08\x05")
+
+        assert binary_manager.load("session-001") is None
+
+    def test_migrates_json_state_on_save(
+        self,
+        binary_manager: StateManager,
+        state_manager: StateManager,
+        state_dir: Path,
+        sample_state: SessionState,
+    ) -> None:
+        """JSON state is loaded by a binary manager and replaced on save."""
+        state_manager.save("session-001", sample_state)
+        assert binary_manager.exists("session-001")
+
+        loaded = binary_manager.load("session-001")
+        assert loaded is not None
+        assert loaded.to_dict() == sample_state.to_dict()
+        assert (state_dir / "session-001.json").exists()
+
+        binary_manager.save("session-001", loaded)
+        assert (state_dir / "session-001.state").exists()
+        assert not (state_dir / "session-001.json").exists()
+
+    def test_delete_removes_both_formats(
+        self,
+        binary_manager: StateManager,
+        state_manager: StateManager,
+        state_dir: Path,
+        sample_state: SessionState,
+    ) -> None:
+        """delete() removes state in either format."""
+        state_manager.save("session-001", sample_state)
+        binary_manager.save("session-001", sample_state)
+
+        binary_manager.delete("session-001")
+
+        assert not binary_manager.exists("session-001")
+
+    def test_unknown_format_raises(self, state_dir: Path) -> None:
+        """Unknown state formats are rejected."""
+        with pytest.raises(ValueError, match="Unknown state format"):
+            StateManager(state_dir, state_format="yaml")
@@ -14,12 +14,7 @@ from claude_session_player.events import (
     UpdateBlock,
     UserContent,
 )
-from claude_session_player.processor import (
-    _clear_tool_content_cache,
-    _question_content_cache,
-    _tool_content_cache,
-    process_line,
-)
+from claude_session_player.processor import process_line
 from claude_session_player.watcher.transformer import transform
 
 
@@ -114,7 +109,7 @@ class TestTransformImmutability:
         assert new_ctx.current_request_id is None
 
     def test_nested_dict_not_shared(self, tool_use_line: dict) -> None:
-        """Deep copy ensures nested dicts are not shared."""
+        """The copy ensures nested dicts are not shared."""
         context = ProcessingContext(
             tool_use_id_to_block_id={"existing": "mapping"},
         )
@@ -125,6 +120,46 @@ class TestTransformImmutability:
         new_ctx.tool_use_id_to_block_id["new_key"] = "new_value"
         assert "new_key" not in context.tool_use_id_to_block_id
 
+    def test_original_tool_contents_unchanged_after_result(
+        self, tool_use_line: dict, tool_result_line: dict
+    ) -> None:
+        """Results replace tool contents in the copy only."""
+        _, context = transform([tool_use_line], ProcessingContext())
+        original_content = context.tool_contents["toolu_001"]
+
+        _, new_ctx = transform([tool_result_line], context)
+
+        assert context.tool_contents["toolu_001"] is original_content
+        assert original_content.result is None
+        assert new_ctx.tool_contents["toolu_001"].result is not None
+
+
+class TestTransformOwned:
+    """Tests for transform(owned=True)."""
+
+    def test_owned_context_updated_in_place(self, tool_use_line: dict) -> None:
+        """An owned context is mutated and returned as-is."""
+        context = ProcessingContext(current_request_id="old_request")
+
+        events, new_ctx = transform([tool_use_line], context, owned=True)
+
+        assert new_ctx is context
+        assert "toolu_001" in context.tool_use_id_to_block_id
+        assert context.current_request_id == "req_001"
+
+    def test_owned_matches_copying_transform(
+        self, tool_use_line: dict, tool_result_line: dict, compact_boundary_line: dict
+    ) -> None:
+        """Owned and copying transforms produce the same events and state."""
+        lines = [tool_use_line, tool_result_line, compact_boundary_line, tool_use_line]
+
+        copied_events, copied_ctx = transform(lines, ProcessingContext())
+        owned_events, owned_ctx = transform(lines, ProcessingContext(), owned=True)
+
+        assert [type(e) for e in owned_events] == [type(e) for e in copied_events]
+        assert owned_ctx.tool_use_id_to_block_id.keys() == copied_ctx.tool_use_id_to_block_id.keys()
+        assert owned_ctx.tool_contents.keys() == copied_ctx.tool_contents.keys()
+
 
 # ---------------------------------------------------------------------------
 # Event generation tests
@@ -397,9 +432,6 @@ class TestTransformParityWithProcessLine:
         # Using process_line directly
         direct_events = process_line(context2, user_input_line)
 
-        # Clean up module caches after direct process_line call
-        _clear_tool_content_cache()
-
         assert len(transform_events) == len(direct_events)
         # Compare event types and content (not block IDs which are random)
         for t_event, d_event in zip(transform_events, direct_events):
@@ -428,64 +460,60 @@ class TestTransformParityWithProcessLine:
         for line in lines:
             direct_events.extend(process_line(context2, line))
 
-        # Clean up module caches after direct process_line calls
-        _clear_tool_content_cache()
-
         assert len(transform_events) == len(direct_events)
         for t_event, d_event in zip(transform_events, direct_events):
             assert type(t_event) == type(d_event)
 
 
 # ---------------------------------------------------------------------------
-# Module cache isolation tests
+# Per-session tool state tests
 # ---------------------------------------------------------------------------
 
 
-class TestTransformCacheIsolation:
-    """Tests ensuring module-level caches are properly isolated."""
+class TestTransformToolState:
+    """Tests ensuring tool state travels with the context."""
 
-    def test_transform_does_not_pollute_module_caches(
-        self, tool_use_line: dict
+    def test_tool_state_carried_across_batches(
+        self, tool_use_line: dict, tool_result_line: dict
     ) -> None:
-        """transform() restores module caches after execution."""
-        # Set up some state in module caches
-        _tool_content_cache["pre_existing"] = ToolCallContent(
-            tool_name="PreExisting",
-            tool_use_id="pre_existing",
-            label="test",
-        )
+        """A result in a later batch updates the full tool call content."""
+        _, ctx1 = transform([tool_use_line], ProcessingContext())
+        events, ctx2 = transform([tool_result_line], ctx1)
 
-        context = ProcessingContext()
-        events, _ = transform([tool_use_line], context)
+        assert len(events) == 1
+        assert isinstance(events[0], UpdateBlock)
+        assert events[0].content.tool_name == "Bash"
+        assert events[0].content.label != ""
+        assert events[0].content.result == "file1.py\nfile2.py"
+        # The input context's tool state is untouched
+        assert ctx1.tool_contents["toolu_001"].result is None
+        assert ctx2.tool_contents["toolu_001"].result == "file1.py\nfile2.py"
+
+    def test_tool_state_survives_serialization(
+        self, tool_use_line: dict, tool_result_line: dict
+    ) -> None:
+        """Tool state persisted between batches yields the same update."""
+        _, ctx = transform([tool_use_line], ProcessingContext())
+        restored = ProcessingContext.from_dict(ctx.to_dict())
 
-        # Pre-existing cache entry should still be there
-        assert "pre_existing" in _tool_content_cache
-        # New entry from transform should NOT be there
-        assert "toolu_001" not in _tool_content_cache
+        events, _ = transform([tool_result_line], restored)
 
-    def test_transform_does_not_use_stale_cache(
-        self, tool_result_line: dict
+        assert isinstance(events[0], UpdateBlock)
+        assert events[0].content.tool_name == "Bash"
+
+    def test_transform_does_not_use_other_session_state(
+        self, tool_use_line: dict, tool_result_line: dict
     ) -> None:
-        """transform() doesn't use pre-existing cache entries."""
-        # Set up a cache entry that would match the tool_result
-        _tool_content_cache["toolu_001"] = ToolCallContent(
-            tool_name="Stale",
-            tool_use_id="toolu_001",
-            label="stale entry",
-        )
+        """Tool state of one session is invisible to another."""
+        transform([tool_use_line], ProcessingContext())
 
-        context = ProcessingContext()
-        # Process just the tool_result (no tool_use first)
-        events, _ = transform([tool_result_line], context)
+        events, _ = transform([tool_result_line], ProcessingContext())
 
         # Should be orphan result (SYSTEM block) not an update
         assert len(events) == 1
         assert isinstance(events[0], AddBlock)
         assert events[0].block.type == BlockType.SYSTEM
 
-        # Clean up
-        _tool_content_cache.clear()
-
     def test_concurrent_transforms_isolated(
         self, tool_use_line: dict, tool_use_read_line: dict
     ) -> None:
@@ -505,3 +533,27 @@ class TestTransformCacheIsolation:
 
         assert "toolu_003" in new_ctx2.tool_use_id_to_block_id
         assert "toolu_001" not in new_ctx2.tool_use_id_to_block_id
+
+
+class TestTransformCoalesce:
+    """Tests for coalescing progress updates in transform()."""
+
+    def test_coalesce_drops_superseded_progress(
+        self, tool_use_line: dict, bash_progress_line: dict
+    ) -> None:
+        """With coalesce=True only the last progress update is returned."""
+        lines = [tool_use_line, bash_progress_line, bash_progress_line, bash_progress_line]
+
+        events, _ = transform(lines, ProcessingContext(), coalesce=True)
+
+        assert [type(e) for e in events] == [AddBlock, UpdateBlock]
+
+    def test_coalesce_off_by_default(
+        self, tool_use_line: dict, bash_progress_line: dict
+    ) -> None:
+        """Without coalesce every progress update is returned."""
+        lines = [tool_use_line, bash_progress_line, bash_progress_line]
+
+        events, _ = transform(lines, ProcessingContext())
+
+        assert len(events) == 3